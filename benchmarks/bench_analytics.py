@@ -0,0 +1,67 @@
+"""Benchmark : agrégations vectorisées (numpy) vs boucles Python
+
+Usage : python -m benchmarks.bench_analytics [tailles...]
+"""
+import random
+import statistics
+import sys
+from datetime import datetime, timedelta
+from src.task_manager.task import Status
+from .common import make_manager, parse_sizes, timed
+
+
+def populate(manager, seed=3):
+    """Dates de création sur un an, projets et tâches terminées aléatoires"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for task in manager.tasks:
+        task.created_at = start + timedelta(seconds=rng.randrange(365 * 86400))
+        task.assign_to_project(f"projet-{rng.randrange(50)}")
+        if rng.random() < 0.4:
+            task.mark_completed()
+            task.completed_at = task.created_at + timedelta(seconds=rng.randrange(30 * 86400))
+
+
+def loop_analytics(tasks):
+    """Version d'origine : statistiques, taux de complétion par projet et délais en pur Python"""
+    by_project = {}
+    lead_times = []
+    for task in tasks:
+        total, done = by_project.get(task.project_id, (0, 0))
+        is_done = task.status == Status.DONE
+        by_project[task.project_id] = (total + 1, done + is_done)
+        if task.completed_at is not None:
+            lead_times.append((task.completed_at - task.created_at).total_seconds())
+    rates = {pid: done / total for pid, (total, done) in by_project.items()}
+    percentiles = statistics.quantiles(lead_times, n=100) if len(lead_times) > 1 else []
+    return rates, percentiles
+
+
+def vector_analytics(snapshot):
+    return snapshot.statistics(), snapshot.completion_rate(by='project'), snapshot.lead_time_percentiles()
+
+
+def run(n):
+    manager = make_manager(n)
+    populate(manager)
+    tasks = manager.tasks
+    loop = timed(lambda: (manager._compute_statistics(), loop_analytics(tasks)))
+    build = timed(manager.columnar_snapshot)
+    snapshot = manager.columnar_snapshot()
+    vector = timed(lambda: vector_analytics(snapshot), repeat=3)
+    print(f"n={n:>9}  boucles {loop * 1e3:9.1f} ms   instantané {build * 1e3:9.1f} ms   "
+          f"numpy {vector * 1e3:7.2f} ms  (x{loop / vector:,.0f} hors construction)")
+
+
+def main(argv=None):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy n'est pas installé : benchmark ignoré (pip install numpy)")
+        return
+    for n in parse_sizes(sys.argv[1:] if argv is None else argv):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
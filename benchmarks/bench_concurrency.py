@@ -0,0 +1,77 @@
+"""Benchmark : débit en lecture / écriture sous contention (ConcurrentTaskManager)
+
+Usage : python -m benchmarks.bench_concurrency [nombre_de_tâches]
+
+Sous le GIL les threads ne lisent pas plus vite qu'un seul : on mesure le
+coût du verrouillage et l'équité lecteurs / rédacteurs, pas une accélération.
+"""
+import random
+import sys
+import threading
+import time
+from src.task_manager.concurrency import ConcurrentTaskManager
+from src.task_manager.task import Priority
+from .common import make_manager
+
+DEFAULT_COUNT = 100_000
+DURATION = 1.0
+THREADS = (1, 2, 4, 8)
+WRITE_RATIOS = (0.05, 0.5)
+
+
+def populate(manager, source):
+    manager.load_many(task.to_dict() for task in source.tasks)
+
+
+def worker(manager, ids, write_ratio, seed, stop, counts):
+    rng = random.Random(seed)
+    priorities = list(Priority)
+    reads = writes = 0
+    while not stop.is_set():
+        if rng.random() < write_ratio:
+            task = manager.get_task(rng.choice(ids))
+            task.update_priority(rng.choice(priorities))
+            writes += 1
+        else:
+            if rng.random() < 0.5:
+                manager.get_task(rng.choice(ids))
+            else:
+                manager.get_statistics()
+            reads += 1
+    counts.append((reads, writes))
+
+
+def measure(manager, ids, threads, write_ratio):
+    stop = threading.Event()
+    counts = []
+    workers = [threading.Thread(target=worker, args=(manager, ids, write_ratio, seed, stop, counts))
+               for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(r for r, _ in counts) / DURATION, sum(w for _, w in counts) / DURATION
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    plain = make_manager(n)
+    concurrent = ConcurrentTaskManager("bench_tasks.json")
+    populate(concurrent, plain)
+    ids = [task.id for task in plain.tasks]
+    print(f"n={n}  (durée {DURATION:.0f} s par mesure)")
+    for write_ratio in WRITE_RATIOS:
+        reads, writes = measure(plain, ids, 1, write_ratio)
+        print(f"  écritures {write_ratio:4.0%}  TaskManager 1 thread     : "
+              f"{reads:>10,.0f} lectures/s {writes:>10,.0f} écritures/s")
+        for threads in THREADS:
+            reads, writes = measure(concurrent, ids, threads, write_ratio)
+            print(f"  écritures {write_ratio:4.0%}  Concurrent {threads} thread(s) : "
+                  f"{reads:>10,.0f} lectures/s {writes:>10,.0f} écritures/s")
+
+
+if __name__ == "__main__":
+    main()
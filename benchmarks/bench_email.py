@@ -0,0 +1,46 @@
+"""Benchmark : débit de send_reminders selon la concurrence
+
+Usage : python -m benchmarks.bench_email [nombre_de_messages] [latence_ms]
+Le transport factice simule la latence d'un serveur SMTP (aller-retour bloquant).
+"""
+import sys
+import time
+from src.task_manager.services import EmailService
+
+DEFAULT_COUNT = 10_000
+DEFAULT_LATENCY_MS = 2.0
+
+
+class SlowTransport:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def send(self, email, subject, body):
+        time.sleep(self.latency)
+
+
+def throughput(service, batch, concurrency):
+    start = time.perf_counter()
+    results = service.send_reminders(batch, concurrency=concurrency)
+    duration = time.perf_counter() - start
+    assert all(r.ok for r in results)
+    return len(batch) / duration, duration
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    latency = (float(argv[1]) if len(argv) > 1 else DEFAULT_LATENCY_MS) / 1000
+    service = EmailService(transport_factory=lambda: SlowTransport(latency))
+    batch = [(f"user{i}@mail.com", f"Tâche {i}", "2025-01-01") for i in range(n)]
+    print(f"{n} messages, latence simulée {latency * 1000:.1f} ms")
+    # L'envoi série (équivalent à l'ancien appel par message) est mesuré sur un échantillon
+    serial, _ = throughput(service, batch[:min(n, 500)], 1)
+    print(f"  concurrency=1   {serial:>9,.0f} msg/s   (10k messages ≈ {10_000 / serial:.1f} s)")
+    for concurrency in (10, 50, 100):
+        rate, duration = throughput(service, batch, concurrency)
+        print(f"  concurrency={concurrency:<3} {rate:>9,.0f} msg/s   {duration:.2f} s  (x{rate / serial:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark : export CSV en flux vs export d'origine (DictWriter + to_dict)
+
+Usage : python -m benchmarks.bench_export [tailles...]
+Les tâches sont produites par un générateur : seule la mémoire de l'export est mesurée.
+"""
+import csv
+import os
+import sys
+import tempfile
+import tracemalloc
+from src.task_manager.services import ReportService
+from src.task_manager.task import Task, Priority
+from .common import timed
+
+
+def generate_tasks(n):
+    priorities = list(Priority)
+    for i in range(n):
+        yield Task(f"Tâche {i}", f"Description {i}", priorities[i % 4])
+
+
+def legacy_export(tasks, filename):
+    """export_tasks_csv d'origine"""
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        fieldnames = ['id', 'title', 'description', 'priority', 'created_at', 'status', 'project_id', 'completed_at']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for task in tasks:
+            writer.writerow(task.to_dict())
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(n, tmp):
+    path = os.path.join(tmp, 'export.csv')
+    service = ReportService()
+    # Le coût de création des tâches est commun aux deux variantes
+    tasks = list(generate_tasks(n))
+    legacy = timed(lambda: legacy_export(tasks, path))
+    streaming = timed(lambda: service.export_tasks_csv(tasks, path))
+    gz = timed(lambda: service.export_tasks_csv(tasks, path + '.gz', compress=True))
+    peak = peak_memory(lambda: service.export_tasks_csv(generate_tasks(n), path))
+    print(f"n={n:>9}  origine {n / legacy:>10,.0f} lignes/s   flux {n / streaming:>10,.0f} lignes/s "
+          f"(x{legacy / streaming:.2f})   gzip {n / gz:>10,.0f} lignes/s   pic mémoire (générateur) {peak / 2**20:.1f} Mo")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = tuple(int(a) for a in argv) if argv else (100_000, 1_000_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            run(n, tmp)
+
+
+if __name__ == "__main__":
+    main()
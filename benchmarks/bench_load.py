@@ -0,0 +1,56 @@
+"""Benchmark : désérialisation en lot (Task.from_dicts) vs chargeur d'origine
+
+Usage : python -m benchmarks.bench_load [nombre_d_enregistrements]
+"""
+import json
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Task, Priority, Status
+from .common import timed
+from .datasets import generate_records, write_json
+
+DEFAULT_COUNT = 1_000_000
+
+
+def legacy_from_dict(data):
+    """Task.from_dict d'origine : passe par __init__ puis écrase les champs"""
+    task = Task(data.get('title'), data.get('description', ""), Priority[data.get('priority', 'MEDIUM')])
+    task.id = data.get('id', str(uuid.uuid4()))
+    task.created_at = datetime.fromisoformat(data['created_at']) if 'created_at' in data else datetime.now()
+    task.status = Status[data.get('status', 'TODO')]
+    task.project_id = data.get('project_id', None)
+    completed_at = data.get('completed_at')
+    if completed_at:
+        task.completed_at = datetime.fromisoformat(completed_at)
+    return task
+
+
+def write_records(path, n, seed=42):
+    write_json(path, generate_records(n, seed))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tasks.json')
+        write_records(path, n)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        legacy = timed(lambda: [legacy_from_dict(d) for d in data])
+        bulk = timed(lambda: Task.from_dicts(data))
+        trusted = timed(lambda: Task.from_dicts(data, trusted=True))
+        full = timed(lambda: TaskManager(path).load_from_file())
+        print(f"n={n}")
+        print(f"  from_dict en boucle (origine) : {legacy:7.2f} s  ({n / legacy:>10,.0f} tâches/s)")
+        print(f"  Task.from_dicts               : {bulk:7.2f} s  ({n / bulk:>10,.0f} tâches/s, x{legacy / bulk:.1f})")
+        print(f"  Task.from_dicts(trusted=True) : {trusted:7.2f} s  ({n / trusted:>10,.0f} tâches/s, x{legacy / trusted:.1f})")
+        print(f"  load_from_file complet        : {full:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
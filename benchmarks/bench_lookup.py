@@ -0,0 +1,54 @@
+"""Benchmark : recherche et suppression par id (index vs parcours linéaire)
+
+Usage : python -m benchmarks.bench_lookup [tailles...]
+"""
+import random
+import sys
+from .common import make_manager, parse_sizes, timed
+
+LOOKUPS = 1_000
+
+
+def linear_get(tasks, task_id):
+    """Ancienne implémentation de get_task (parcours de la liste)"""
+    for task in tasks:
+        if task.id == task_id:
+            return task
+    return None
+
+
+def linear_delete(tasks, task_id):
+    """Ancienne implémentation de delete_task (parcours + del)"""
+    for i, task in enumerate(tasks):
+        if task.id == task_id:
+            del tasks[i]
+            return True
+    return False
+
+
+def run(n):
+    manager = make_manager(n)
+    tasks = list(manager.tasks)
+    rng = random.Random(0)
+    ids = [tasks[rng.randrange(n)].id for _ in range(LOOKUPS)]
+    # Le parcours linéaire est mesuré sur un échantillon réduit pour rester raisonnable
+    sample = ids[:max(10, LOOKUPS * 10_000 // n)]
+
+    linear = timed(lambda: [linear_get(tasks, i) for i in sample]) / len(sample)
+    indexed = timed(lambda: [manager.get_task(i) for i in ids], repeat=3) / len(ids)
+
+    to_delete = list(dict.fromkeys(sample))
+    linear_del = timed(lambda: [linear_delete(tasks, i) for i in to_delete]) / len(to_delete)
+    indexed_del = timed(lambda: [manager.delete_task(i) for i in to_delete]) / len(to_delete)
+
+    print(f"n={n:>9}  get_task : linéaire {linear * 1e6:10.1f} µs  indexé {indexed * 1e6:6.2f} µs  (x{linear / indexed:,.0f})")
+    print(f"{'':11}  delete_task : linéaire {linear_del * 1e6:7.1f} µs  indexé {indexed_del * 1e6:6.2f} µs  (x{linear_del / indexed_del:,.0f})")
+
+
+def main(argv=None):
+    for n in parse_sizes(sys.argv[1:] if argv is None else argv):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
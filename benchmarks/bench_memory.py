@@ -0,0 +1,62 @@
+"""Benchmark mémoire (tracemalloc) : octets par tâche avant/après __slots__
+
+Usage : python -m benchmarks.bench_memory [nombre_de_tâches]
+"""
+import gc
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from src.task_manager.task import Task, Priority, Status
+
+DEFAULT_COUNT = 100_000
+
+
+class LegacyTask:
+    """Représentation d'origine : __dict__, id str et deux datetime"""
+    def __init__(self, title, description="", priority=Priority.MEDIUM):
+        self.id = str(uuid.uuid4())
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.created_at = datetime.now()
+        self.status = Status.TODO
+        self.project_id = None
+        self.completed_at = None
+
+    def mark_completed(self):
+        self.status = Status.DONE
+        self.completed_at = datetime.now()
+
+
+def bytes_per_task(factory, n):
+    # Les titres sont créés avant la mesure : seul le coût de la tâche est compté
+    titles = [f"Tâche {i}" for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [factory(title) for title in titles]
+    for task in tasks[::2]:
+        task.mark_completed()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La liste elle-même (8 octets par élément) est retirée
+    return (after - before - sys.getsizeof(tasks)) / n
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    legacy = bytes_per_task(LegacyTask, n)
+    print(f"{'avant (__dict__)':<24}{legacy:8.0f} o/tâche")
+    for id_format in ('str', 'int', 'bytes'):
+        Task.id_format = id_format
+        try:
+            size = bytes_per_task(Task, n)
+        finally:
+            Task.id_format = 'str'
+        print(f"{'__slots__, id ' + id_format:<24}{size:8.0f} o/tâche  ({size / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark : filtres chaînés + tri complet vs TaskManager.query() paginé
+
+Usage : python -m benchmarks.bench_query [tailles...]
+"""
+import sys
+from src.task_manager.query import Q
+from src.task_manager.task import Priority, Status
+from .common import parse_sizes, timed
+from .datasets import generate_manager
+
+PAGE = 50
+
+
+def naive_page(manager, number):
+    """Page `number` en filtrant toutes les tâches puis en triant le résultat"""
+    tasks = [t for t in manager.tasks if t.status != Status.DONE]
+    tasks = [t for t in tasks if t.priority in (Priority.HIGH, Priority.URGENT)]
+    tasks.sort(key=lambda t: (t.created_at, t.id))
+    return tasks[number * PAGE:(number + 1) * PAGE]
+
+
+def query_page(manager, number):
+    """Page `number` en suivant les curseurs de TaskManager.query()"""
+    query = manager.query(~Q.status(Status.DONE),
+                          priority=[Priority.HIGH, Priority.URGENT])
+    cursor = None
+    for _ in range(number):
+        cursor = query.page(PAGE, cursor).next_cursor
+    return query.page(PAGE, cursor).items
+
+
+def run(n):
+    manager = generate_manager(n)
+    assert [t.id for t in naive_page(manager, 2)] == [t.id for t in query_page(manager, 2)]
+    naive = timed(lambda: naive_page(manager, 2), repeat=3)
+    paged = timed(lambda: query_page(manager, 2), repeat=3)
+    print(f"n={n:>9}  page 3 : filtres + tri {naive * 1e3:9.1f} ms   "
+          f"query() {paged * 1e3:8.2f} ms  (x{naive / paged:,.0f})")
+
+
+def main(argv=None):
+    for n in parse_sizes(sys.argv[1:] if argv is None else argv):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark : latence de sauvegarde (directe, atomique, en arrière-plan)
+
+Usage : python -m benchmarks.bench_save [tailles...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from .common import make_manager, parse_sizes, timed
+
+BURST = 50
+
+
+def legacy_save(manager, path):
+    """save_to_file d'origine : écriture directe dans le fichier cible"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([task.to_dict() for task in manager.tasks], f, ensure_ascii=False, indent=2)
+
+
+def run(n, tmp):
+    manager = make_manager(n)
+    path = os.path.join(tmp, f"tasks_{n}.json")
+    manager.storage.path = path
+    legacy = timed(lambda: legacy_save(manager, path), repeat=3)
+    atomic = timed(lambda: manager.save_to_file(), repeat=3)
+
+    # Rafale de modifications, chacune suivie d'une demande de sauvegarde
+    manager.save_delay = 0.05
+    tasks = manager.tasks[:BURST]
+    start = time.perf_counter()
+    request_latencies = []
+    for task in tasks:
+        task.description += "!"
+        t0 = time.perf_counter()
+        manager.save_to_file(background=True)
+        request_latencies.append(time.perf_counter() - t0)
+    manager.wait_for_save()
+    total = time.perf_counter() - start
+    saver = manager._saver
+    manager.close()
+
+    print(f"n={n:>8}  directe {legacy * 1e3:8.1f} ms   atomique (fsync) {atomic * 1e3:8.1f} ms")
+    print(f"{'':10}  arrière-plan : demande max {max(request_latencies) * 1e6:6.1f} µs, "
+          f"{saver.requests} demandes -> {saver.writes} écritures, rafale persistée en {total * 1e3:.1f} ms")
+
+
+def main(argv=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in parse_sizes(sys.argv[1:] if argv is None else argv, default=(10_000, 100_000)):
+            run(n, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark : recherche plein texte (index inversé vs compréhension de liste)
+
+Usage : python -m benchmarks.bench_search [tailles...]
+"""
+import random
+import sys
+import time
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority
+from .common import parse_sizes, timed
+
+WORDS = ("préparer rapport réunion équipe client facture budget relecture maquette serveur "
+         "migration sauvegarde planning recrutement formation livraison audit contrat support "
+         "tableau indicateur campagne newsletter inventaire archive").split()
+SYLLABLES = "ba be bi bo ca ce ci co da de di do fa fe fi la le li lo ma me mi mo na ne ni no pa pe pi po ra re ri ro sa se si so ta te ti to".split()
+QUERIES = ("rapport", "prép rapp", "facture client", "migr serv", "équipe formation budget", "archive", "inventaire livraison")
+
+
+def make_vocabulary(rng, size=5000):
+    """Vocabulaire réaliste : quelques mots métier fréquents et beaucoup de mots rares"""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return WORDS + sorted(words)
+
+
+def build(n, seed=7, references=False):
+    """references=True ajoute au titre un code unique (ex: réf-3fa2c91b) :
+    le vocabulaire grandit alors avec n"""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    # Loi de Zipf : le k-ième mot est tiré avec un poids 1/k
+    weights = [1 / (k + 1) for k in range(len(vocabulary))]
+    manager = TaskManager("bench_tasks.json")
+    priorities = list(Priority)
+    manager.add_tasks(
+        (" ".join(rng.choices(vocabulary, weights, k=3)).capitalize()
+         + (f" réf-{rng.getrandbits(32):08x}" if references else ""),
+         " ".join(rng.choices(vocabulary, weights, k=8)), rng.choice(priorities))
+        for i in range(n)
+    )
+    return manager
+
+
+def build_time(manager):
+    start = time.perf_counter()
+    manager.search("x")
+    return time.perf_counter() - start
+
+
+def scan(tasks, query):
+    """Recherche d'origine : sous-chaîne dans le titre ou la description"""
+    words = query.lower().split()
+    return [t for t in tasks if all(w in t.title.lower() or w in t.description.lower() for w in words)]
+
+
+def run(n):
+    manager = build(n)
+    duration = build_time(manager)
+    unique = build_time(build(n, references=True))
+    tasks = manager.tasks
+    print(f"n={n:>9}  construction de l'index {duration:.2f} s   "
+          f"avec un code unique par titre {unique:.2f} s")
+    for query in QUERIES:
+        baseline = timed(lambda: scan(tasks, query))
+        indexed = timed(lambda: manager.search(query, limit=20), repeat=3)
+        print(f"  {query!r:<28} parcours {baseline * 1e3:9.1f} ms   index {indexed * 1e3:8.2f} ms  (x{baseline / indexed:,.0f})")
+
+
+def main(argv=None):
+    for n in parse_sizes(sys.argv[1:] if argv is None else argv, default=(100_000, 1_000_000)):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark : chargement parallèle de fragments (load_shards) selon le nombre de processus
+
+Usage : python -m benchmarks.bench_shards [nombre_total_de_tâches] [nombre_de_fragments] [workers_max]
+"""
+import os
+import sys
+import tempfile
+from src.task_manager.manager import TaskManager
+from .bench_load import write_records
+from .common import timed
+
+DEFAULT_COUNT = 400_000
+DEFAULT_SHARDS = 16
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    shards = int(argv[1]) if len(argv) > 1 else DEFAULT_SHARDS
+    max_workers = int(argv[2]) if len(argv) > 2 else max(1, os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(shards):
+            path = os.path.join(tmp, f"equipe_{i}.json")
+            write_records(path, n // shards, seed=i)
+            paths.append(path)
+        print(f"{n} tâches en {shards} fragments, {os.cpu_count()} cœurs")
+        baseline = None
+        workers = 1
+        while workers <= max_workers:
+            duration = timed(lambda: TaskManager().load_shards(paths, workers=workers))
+            baseline = baseline or duration
+            print(f"  workers={workers:<3} {duration:6.2f} s  (x{baseline / duration:.2f})")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
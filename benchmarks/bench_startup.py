@@ -0,0 +1,65 @@
+"""Benchmark : démarrage à froid, JSON complet vs instantané binaire (mmap)
+
+Usage : python -m benchmarks.bench_startup [nombre_d_enregistrements]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from src.task_manager.manager import TaskManager
+from src.task_manager.storage import BinarySnapshotStorage, json_to_snapshot
+from .bench_load import write_records
+from .common import timed
+
+DEFAULT_COUNT = 1_000_000
+
+
+def first_requests(manager, ids):
+    """Premières requêtes servies : lectures par id et tâches d'un projet (~1 %)"""
+    for task_id in ids:
+        manager.get_task(task_id)
+    return manager.get_tasks_by_project("p7")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else DEFAULT_COUNT
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'tasks.json')
+        snapshot_path = os.path.join(tmp, 'tasks.snap')
+        write_records(json_path, n)
+        start = time.perf_counter()
+        json_to_snapshot(json_path, snapshot_path)
+        convert = time.perf_counter() - start
+
+        def json_startup():
+            manager = TaskManager(json_path)
+            manager.load_from_file()
+            return manager
+
+        def snapshot_startup():
+            return TaskManager(storage=BinarySnapshotStorage(snapshot_path))
+
+        ids = [task.id for task in random.Random(1).sample(json_startup().tasks, 100)]
+        json_open = timed(json_startup)
+        snapshot_open = timed(snapshot_startup, repeat=3)
+        json_manager = json_startup()
+        snapshot_manager = snapshot_startup()
+        json_queries = timed(lambda: first_requests(json_manager, ids))
+        snapshot_queries = timed(lambda: first_requests(snapshot_manager, ids))
+        snapshot_stats = timed(snapshot_manager.get_statistics)
+        print(f"n={n}  (conversion JSON -> instantané : {convert:.2f} s, "
+              f"{os.path.getsize(json_path) / 2**20:.0f} Mo -> {os.path.getsize(snapshot_path) / 2**20:.0f} Mo)")
+        print(f"  ouverture JSON (load_from_file)   : {json_open:9.3f} s")
+        print(f"  ouverture instantané (mmap)       : {snapshot_open * 1e3:9.3f} ms  (x{json_open / snapshot_open:,.0f})")
+        print(f"  100 get_task + 1 projet  JSON     : {json_queries * 1e3:9.1f} ms")
+        print(f"  100 get_task + 1 projet  instant. : {snapshot_queries * 1e3:9.1f} ms")
+        print(f"  première réponse JSON             : {json_open + json_queries:9.3f} s")
+        print(f"  première réponse instantané       : {snapshot_open + snapshot_queries:9.3f} s")
+        print(f"  get_statistics instantané         : {snapshot_stats * 1e3:9.1f} ms")
+        snapshot_manager.close()
+
+
+if __name__ == "__main__":
+    main()
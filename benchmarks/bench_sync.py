@@ -0,0 +1,57 @@
+"""Benchmark : réplication par copie complète (JSON) vs journal de changements
+
+Usage : python -m benchmarks.bench_sync [tailles...]
+"""
+import os
+import random
+import sys
+import tempfile
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority
+from .common import make_manager, parse_sizes, timed
+
+CHANGES = 1000
+
+
+def mutate(manager, rng, count):
+    """count changements : priorités, projets et quelques suppressions"""
+    tasks = manager.tasks
+    for _ in range(count):
+        task = rng.choice(tasks)
+        if task.id not in manager:
+            continue
+        action = rng.random()
+        if action < 0.45:
+            task.update_priority(rng.choice(list(Priority)))
+        elif action < 0.9:
+            task.assign_to_project(f"projet-{rng.randrange(50)}")
+        else:
+            manager.delete_task(task.id)
+
+
+def run(n):
+    rng = random.Random(5)
+    primary = make_manager(n)
+    replica = TaskManager("bench_replica.json")
+    replica.sync_from(primary)
+    mutate(primary, rng, CHANGES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tasks.json')
+
+        def full_copy():
+            primary.save_to_file(path)
+            TaskManager(path).load_from_file()
+
+        full = timed(full_copy)
+    incremental = timed(lambda: replica.sync_from(primary))
+    print(f"n={n:>9}  {CHANGES} changements : copie complète {full:7.2f} s   "
+          f"journal {incremental * 1e3:8.1f} ms  (x{full / incremental:,.0f})")
+
+
+def main(argv=None):
+    for n in parse_sizes(sys.argv[1:] if argv is None else argv):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
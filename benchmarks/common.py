@@ -0,0 +1,32 @@
+"""Outils partagés par les benchmarks (génération de données, chronométrage)"""
+import random
+import time
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def make_manager(n, seed=42):
+    """Construit un TaskManager contenant n tâches synthétiques"""
+    rng = random.Random(seed)
+    priorities = list(Priority)
+    manager = TaskManager("bench_tasks.json")
+    for i in range(n):
+        manager.add_task(f"Tâche {i}", f"Description {i}", rng.choice(priorities))
+    return manager
+
+
+def timed(func, repeat=1):
+    """Retourne la meilleure durée (en secondes) sur `repeat` exécutions"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_sizes(argv, default=DEFAULT_SIZES):
+    """Lit les tailles passées en ligne de commande (ex: 10000 100000)"""
+    return tuple(int(arg) for arg in argv) if argv else default
@@ -0,0 +1,48 @@
+"""Générateurs de données synthétiques reproductibles (1k à 1M tâches)"""
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority, Status
+
+START = datetime(2024, 1, 1)
+PROJECTS = 100
+
+
+def generate_records(n, seed=42):
+    """n enregistrements au format Task.to_dict, identiques pour une même graine
+
+    Dates de création sur un an, priorités et statuts uniformes, 100 projets ;
+    les tâches DONE ont une date de fin.
+    """
+    rng = random.Random(seed)
+    priorities = [p.name for p in Priority]
+    statuses = [s.name for s in Status]
+    records = []
+    for i in range(n):
+        created = START + timedelta(seconds=rng.randrange(365 * 86400))
+        status = rng.choice(statuses)
+        records.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'title': f"Tâche {i}",
+            'description': f"Description {i}",
+            'priority': rng.choice(priorities),
+            'created_at': created.isoformat(),
+            'status': status,
+            'project_id': f"p{rng.randrange(PROJECTS)}",
+            'completed_at': (created + timedelta(hours=rng.randrange(1, 500))).isoformat() if status == 'DONE' else None
+        })
+    return records
+
+
+def write_json(path, records):
+    """Fichier au format de JsonStorage"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+
+def generate_manager(n, seed=42, storage_file="bench_tasks.json"):
+    manager = TaskManager(storage_file)
+    manager.load_many(generate_records(n, seed), trusted=True)
+    return manager
@@ -0,0 +1,122 @@
+"""Suite de benchmarks reproductible des opérations instrumentées
+
+Usage :
+    python -m benchmarks.suite [--sizes 1000 10000 ...] [--repeat 3]
+                               [--output résultats.json] [--baseline référence.json] [--tolerance 0.25]
+
+Chaque opération est mesurée par la couche d'instrumentation (metrics) sur
+des données synthétiques à graine fixe. Avec --baseline, les temps minimaux
+sont comparés à une exécution de référence ; le code de sortie vaut 1 si une
+opération ralentit au-delà de la tolérance.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from src.task_manager.manager import TaskManager
+from src.task_manager.metrics import metrics
+from src.task_manager.services import ReportService
+from .datasets import START, generate_records, write_json
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+OPERATIONS = (
+    'TaskManager.load_from_file',
+    'TaskManager.save_to_file',
+    'TaskManager.get_statistics',
+    'ReportService.generate_daily_report',
+    'ReportService.export_tasks_csv',
+)
+# Les opérations de l'ordre de la milliseconde sont répétées davantage
+FAST_REPEAT = 50
+
+
+def run_size(n, repeat=3, seed=42):
+    """Exécute chaque opération repeat fois sur n tâches ; retourne les latences par opération"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tasks.json')
+        write_json(path, generate_records(n, seed))
+        metrics.reset()
+        metrics.enable(OPERATIONS)
+        try:
+            manager = TaskManager(path)
+            for _ in range(repeat):
+                manager.load_from_file()
+            for _ in range(repeat):
+                manager.save_to_file(os.path.join(tmp, 'copie.json'))
+            reports = ReportService()
+            day = START.date()
+            for _ in range(repeat):
+                reports.export_tasks_csv(manager.tasks, io.StringIO())
+            for _ in range(repeat * FAST_REPEAT):
+                manager.get_statistics()
+                reports.generate_daily_report(manager, day)
+        finally:
+            metrics.disable()
+        latencies = metrics.to_dict()['latencies']
+    return {operation: {key: latencies[operation][key] for key in ('min', 'mean', 'max', 'count')}
+            for operation in OPERATIONS}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=3, seed=42):
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': {str(n): run_size(n, repeat, seed) for n in sizes}
+    }
+
+
+def compare(current, baseline, tolerance=0.25):
+    """Lignes (taille, opération, référence, actuel, rapport, régression) des mesures communes"""
+    rows = []
+    for size, operations in current['results'].items():
+        reference = baseline['results'].get(size, {})
+        for operation, timing in operations.items():
+            if operation not in reference:
+                continue
+            before, after = reference[operation]['min'], timing['min']
+            ratio = after / before if before else float('inf')
+            rows.append((size, operation, before, after, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de task_manager")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="fichier JSON des résultats")
+    parser.add_argument('--baseline', help="résultats de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="ralentissement toléré (0.25 = +25 %%)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = run_suite(args.sizes, args.repeat, args.seed)
+    for size, operations in results['results'].items():
+        print(f"n={int(size):>9}")
+        for operation, timing in operations.items():
+            print(f"  {operation:<38} min {timing['min'] * 1e3:10.2f} ms   moyenne {timing['mean'] * 1e3:10.2f} ms")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Résultats écrits dans {args.output}")
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.tolerance)
+    print(f"Comparaison avec {args.baseline} ({baseline.get('created_at')}, tolérance +{args.tolerance:.0%})")
+    for size, operation, before, after, ratio, regression in rows:
+        flag = "RÉGRESSION" if regression else ""
+        print(f"  n={int(size):>9} {operation:<38} {before * 1e3:10.2f} ms -> {after * 1e3:10.2f} ms  x{ratio:5.2f} {flag}")
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from .task import Priority, Status, Task, epoch_key, to_epoch
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle
+    np = None
+
+PRIORITIES = list(Priority)
+STATUSES = list(Status)
+PRIORITY_CODES = {p: code for code, p in enumerate(PRIORITIES)}
+STATUS_CODES = {s: code for code, s in enumerate(STATUSES)}
+# completed_at absent
+MISSING = -(2 ** 63)
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy est requis pour le mode analytique (pip install numpy).")
+
+def _day_bounds(day):
+    """Bornes [début, fin) d'un jour en microsecondes depuis EPOCH"""
+    if isinstance(day, datetime):
+        day = day.date()
+    start = datetime(day.year, day.month, day.day)
+    return _micros(to_epoch(start)), _micros(to_epoch(start + timedelta(days=1)))
+
+def _micros(seconds) -> int:
+    return int(round(seconds * 1_000_000))
+
+class ColumnarSnapshot:
+    """Instantané en colonnes NumPy des tâches, pour les agrégations massives
+
+    priority / status : codes int8 (ordre des énumérations) ; created_at /
+    completed_at : int64 en microsecondes depuis EPOCH (MISSING si absent) ;
+    project : code int32 renvoyant à self.projects (project_id interné).
+    L'instantané ne suit pas les modifications ultérieures des tâches.
+    """
+    def __init__(self, priority, status, created_at, completed_at, project, projects: List[Optional[str]]):
+        self.priority = priority
+        self.status = status
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.project = project
+        self.projects = projects
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]):
+        _require_numpy()
+        tasks = list(tasks)
+        n = len(tasks)
+        project_codes: Dict[Optional[str], int] = {}
+        priority = np.fromiter((PRIORITY_CODES[t._priority] for t in tasks), dtype=np.int8, count=n)
+        status = np.fromiter((STATUS_CODES[t._status] for t in tasks), dtype=np.int8, count=n)
+        project = np.fromiter((project_codes.setdefault(t._project_id, len(project_codes)) for t in tasks),
+                              dtype=np.int32, count=n)
+        created = np.fromiter((epoch_key(t._created_at) for t in tasks), dtype=np.float64, count=n)
+        completed = np.fromiter(
+            (np.nan if t._completed_at is None else epoch_key(t._completed_at) for t in tasks),
+            dtype=np.float64, count=n
+        )
+        created_at = np.rint(created * 1_000_000).astype(np.int64)
+        completed_at = np.full(n, MISSING, dtype=np.int64)
+        done = ~np.isnan(completed)
+        completed_at[done] = np.rint(completed[done] * 1_000_000).astype(np.int64)
+        return cls(priority, status, created_at, completed_at, project, list(project_codes))
+
+    def __len__(self):
+        return len(self.status)
+
+    def _counts(self, codes, members, mask=None):
+        values = codes if mask is None else codes[mask]
+        counts = np.bincount(values, minlength=len(members))
+        return {member.name: int(count) for member, count in zip(members, counts)}
+
+    def counts_by_status(self, mask=None) -> Dict[str, int]:
+        return self._counts(self.status, STATUSES, mask)
+
+    def counts_by_priority(self, mask=None) -> Dict[str, int]:
+        return self._counts(self.priority, PRIORITIES, mask)
+
+    def statistics(self):
+        """Mêmes clés que TaskManager.get_statistics"""
+        by_status = self.counts_by_status()
+        projects = np.bincount(self.project, minlength=len(self.projects))
+        return {
+            'total_tasks': len(self),
+            'completed_tasks': by_status[Status.DONE.name],
+            'tasks_by_priority': self.counts_by_priority(),
+            'tasks_by_status': by_status,
+            'tasks_by_project': {pid: int(count) for pid, count in zip(self.projects, projects)
+                                 if pid is not None and count}
+        }
+
+    def daily_report(self, day):
+        """Même format que ReportService.generate_daily_report, par masque vectoriel"""
+        start, end = _day_bounds(day)
+        mask = (self.created_at >= start) & (self.created_at < end)
+        by_status = self.counts_by_status(mask)
+        return {
+            'date': str(day.date() if isinstance(day, datetime) else day),
+            'total_tasks': int(mask.sum()),
+            'completed_tasks': by_status[Status.DONE.name],
+            'tasks_by_priority': self.counts_by_priority(mask),
+            'tasks_by_status': by_status
+        }
+
+    def completion_rate(self, by=None):
+        """Part des tâches DONE, globale ou par 'priority' / 'project'"""
+        done = self.status == STATUS_CODES[Status.DONE]
+        if by is None:
+            return float(done.mean()) if len(self) else 0.0
+        if by == 'priority':
+            codes, labels = self.priority, [p.name for p in PRIORITIES]
+        elif by == 'project':
+            codes, labels = self.project, self.projects
+        else:
+            raise ValueError(f"Regroupement inconnu : {by}")
+        totals = np.bincount(codes, minlength=len(labels))
+        completed = np.bincount(codes, weights=done.astype(np.float64), minlength=len(labels))
+        return {label: float(c / t) for label, c, t in zip(labels, completed, totals) if t}
+
+    def lead_times(self):
+        """Durées completed_at - created_at (secondes) des tâches terminées"""
+        done = self.completed_at != MISSING
+        return (self.completed_at[done] - self.created_at[done]) / 1_000_000
+
+    def lead_time_percentiles(self, percentiles=(50, 90, 99)) -> Dict[float, Optional[float]]:
+        lead_times = self.lead_times()
+        if not len(lead_times):
+            return {q: None for q in percentiles}
+        values = np.percentile(lead_times, percentiles)
+        return {q: float(v) for q, v in zip(percentiles, values)}
@@ -0,0 +1,245 @@
+import functools
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+from .manager import TaskList, TaskManager
+from .project import ProjectRegistry
+from .search import SearchIndex
+from .storage import BackgroundSaver
+from .journal import ChangeJournal
+from .task import Task
+from .time_index import TimeIndex
+from .work_queue import ReadyQueue
+
+class _Guard:
+    """Gestionnaire de contexte réutilisable autour d'une paire acquire/release"""
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+class ReadWriteLock:
+    """Verrou lecteurs/rédacteur : lectures simultanées, écritures exclusives
+
+    Politique équitable par phases : un nouveau lecteur attend si un
+    rédacteur écrit ou patiente, mais à la fin de chaque écriture tous les
+    lecteurs en attente sont admis d'un bloc avant le rédacteur suivant.
+    Ni les lectures ni les écritures ne sont affamées : un lecteur attend
+    au plus l'écriture en cours et une autre. Le rédacteur peut reprendre
+    le verrou (réentrant) et lire ; une lecture imbriquée dans une lecture
+    n'attend pas. Passer d'une lecture à une écriture dans un même thread
+    est refusé.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        # Incrémenté à chaque fin d'écriture, qui admet les lecteurs en attente
+        self._phase = 0
+        # Profondeur des lectures en cours du thread courant
+        self._local = threading.local()
+        self._read_guard = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def reading(self) -> _Guard:
+        return self._read_guard
+
+    def writing(self) -> _Guard:
+        return self._write_guard
+
+    def acquire_read(self):
+        if self._writer == threading.get_ident():
+            return
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if not depth:
+            with self._cond:
+                if self._writer is None and not self._waiting_writers:
+                    self._readers += 1
+                else:
+                    phase = self._phase
+                    self._waiting_readers += 1
+                    while self._phase == phase and (self._writer is not None or self._waiting_writers):
+                        self._cond.wait()
+                    if self._phase == phase:
+                        # Plus aucun rédacteur : entrée sans attendre la fin d'une écriture
+                        self._waiting_readers -= 1
+                        self._readers += 1
+                    # Sinon release_write nous a déjà comptés parmi les lecteurs
+        local.depth = depth + 1
+
+    def release_read(self):
+        if self._writer == threading.get_ident():
+            return
+        local = self._local
+        local.depth -= 1
+        if not local.depth:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("Écriture impossible pendant une lecture du même thread.")
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+
+    def release_write(self):
+        if self._writer_depth:
+            self._writer_depth -= 1
+            return
+        with self._cond:
+            self._writer = None
+            # Les lecteurs en attente passent avant le prochain rédacteur
+            self._readers += self._waiting_readers
+            self._waiting_readers = 0
+            self._phase += 1
+            self._cond.notify_all()
+
+def _reader(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.reading():
+            return method(self, *args, **kwargs)
+    return locked
+
+def _writer(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.writing():
+            return method(self, *args, **kwargs)
+    return locked
+
+class ConcurrentTaskManager(TaskManager):
+    """TaskManager partageable entre threads (ex: serveur web multi-thread)
+
+    Les lectures (get_*, statistiques, recherche...) s'exécutent en parallèle,
+    les écritures (ajouts, suppressions, modifications des tâches via leurs
+    setters) une à une. Les sauvegardes copient l'état des tâches sous le
+    verrou de lecture puis sérialisent cette copie sans bloquer les écritures,
+    sauf avec un stockage qui ne le permet pas (supports_background faux,
+    ex: JsonLinesStorage) : la sauvegarde se fait alors sous le verrou d'écriture.
+    Réservé aux stockages complets (non paresseux).
+    """
+    def __init__(self, storage_file="tasks.json", storage=None):
+        super().__init__(storage_file, storage)
+        if self._lazy:
+            raise TypeError("Mode concurrent impossible avec un stockage paresseux.")
+        self._lock = ReadWriteLock()
+        # Écritures de fichiers une à une ; numéro de la dernière copie écrite par chemin
+        self._save_lock = threading.Lock()
+        self._copies = itertools.count()
+        self._saved: Dict[str, int] = {}
+
+    @property
+    def tasks(self) -> List[Task]:
+        with self._lock.reading():
+            return TaskList(self._tasks.values())
+
+    @tasks.setter
+    def tasks(self, tasks):
+        with self._lock.writing():
+            self._reset(tasks)
+
+    def _snapshot(self) -> Tuple[int, List[Task]]:
+        """(numéro, copies détachées des tâches), pris d'un bloc sous le verrou de lecture"""
+        with self._lock.reading():
+            number = next(self._copies)
+            states = [task.__getstate__() for task in self._tasks.values()]
+        return number, [Task._from_state(state) for state in states]
+
+    def _tasks_to_save(self):
+        return self._snapshot()[1]
+
+    def _save_tasks(self, filename=None):
+        if not self.storage.supports_background:
+            # Stockage écrit aussi à chaque modification (ex: JsonLinesStorage,
+            # dont save() ferme et remplace le fichier d'ajouts) : sauvegarde
+            # exclusive, les écritures attendent
+            with self._lock.writing():
+                self.storage.save(list(self._tasks.values()), filename)
+            return
+        number, tasks = self._snapshot()
+        path = filename or self.storage.path
+        with self._save_lock:
+            # Une copie plus récente a déjà été écrite à cet endroit
+            if self._saved.get(path, -1) > number:
+                return
+            self.storage.save(tasks, filename)
+            self._saved[path] = number
+
+    def _save_snapshot(self):
+        self._save_tasks()
+
+    def _ensure(self, attr, factory):
+        # Les index et files annexes s'abonnent au gestionnaire : création
+        # unique sous le verrou d'écriture, puis utilisation en lecture
+        value = getattr(self, attr)
+        if value is None:
+            with self._lock.writing():
+                value = getattr(self, attr)
+                if value is None:
+                    value = factory(self)
+                    setattr(self, attr, value)
+        return value
+
+    @property
+    def projects(self) -> ProjectRegistry:
+        return self._ensure('_projects', ProjectRegistry)
+
+    @property
+    def ready_queue(self) -> ReadyQueue:
+        return self._ensure('_ready_queue', ReadyQueue)
+
+    @property
+    def journal(self) -> ChangeJournal:
+        return self._ensure('_journal', ChangeJournal)
+
+    def search(self, *args, **kwargs):
+        self._ensure('_search_index', SearchIndex)
+        with self._lock.reading():
+            return super().search(*args, **kwargs)
+
+    def get_tasks_between(self, *args, **kwargs):
+        self._ensure('_time_index', TimeIndex)
+        with self._lock.reading():
+            return super().get_tasks_between(*args, **kwargs)
+
+    def save_to_file(self, filename=None, background=False):
+        # Création unique du thread de sauvegarde, la suite est celle de TaskManager
+        if background and self._saver is None and filename is None and self.storage.supports_background:
+            with self._lock.writing():
+                if self._saver is None:
+                    self._saver = BackgroundSaver(self._save_snapshot, self.save_delay)
+        super().save_to_file(filename, background)
+
+# Lectures simultanées / écritures exclusives sur les méthodes héritées
+for _name in ('__len__', '__contains__', 'get_task', 'get_tasks_by_status', 'get_tasks_by_priority',
+              'get_tasks_by_project', 'get_statistics', 'check_consistency', 'columnar_snapshot',
+              'changes_since', '_replica_state'):
+    setattr(ConcurrentTaskManager, _name, _reader(getattr(TaskManager, _name)))
+for _name in ('add_task', 'add_tasks', 'delete_task', 'delete_tasks', 'update_tasks', 'load_many',
+              'load_from_file', 'load_shards', 'apply_changes', 'sync_from', 'subscribe', 'unsubscribe',
+              'peek_next', 'pop_next'):
+    setattr(ConcurrentTaskManager, _name, _writer(getattr(TaskManager, _name)))
@@ -0,0 +1,96 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, NamedTuple, Optional
+from .task import Task, Priority, Status, from_epoch
+
+class Change(NamedTuple):
+    """Entrée du journal ; les valeurs sont sérialisables en JSON
+
+    op vaut 'add' (value : dict to_dict de la tâche), 'delete' ou 'update'
+    (field modifié et sa nouvelle valeur).
+    """
+    seq: int
+    op: str
+    task_id: str
+    field: Optional[str] = None
+    value: Any = None
+
+def encode_value(field, value):
+    """Valeur interne d'un champ -> valeur JSON (nom d'énumération, date ISO)"""
+    if isinstance(value, Enum):
+        return value.name
+    if field in ('created_at', 'completed_at') and value is not None:
+        return from_epoch(value).isoformat()
+    return value
+
+def decode_value(field, value):
+    """Inverse de encode_value, sous la forme attendue par les setters de Task"""
+    if value is None:
+        return None
+    if field == 'priority':
+        return Priority[value]
+    if field == 'status':
+        return Status[value]
+    if field in ('created_at', 'completed_at'):
+        return datetime.fromisoformat(value)
+    return value
+
+class ChangeJournal:
+    """Journal ordonné des changements d'un gestionnaire (réplication incrémentale)
+
+    Chaque ajout, suppression ou modification de champ reçoit un numéro de
+    séquence croissant. Les entrées gardent les valeurs internes et ne sont
+    sérialisées qu'à la lecture (changes_since). Au-delà de max_entries, un
+    point de contrôle oublie les plus anciennes : un réplica trop en retard
+    doit alors repartir d'une copie complète.
+    """
+    def __init__(self, manager, max_entries=100_000):
+        self.max_entries = max_entries
+        # Dernier numéro attribué ; le journal démarre sur l'état courant
+        self.seq = 0
+        # Changements antérieurs ou égaux oubliés
+        self.checkpoint_seq = 0
+        # (op, task_id, field, valeur interne) ; l'entrée i a le numéro checkpoint_seq + 1 + i
+        self._entries: List[tuple] = []
+        manager.subscribe(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _record(self, op, task_id, field=None, value=None):
+        self.seq += 1
+        self._entries.append((op, task_id, field, value))
+        if len(self._entries) > self.max_entries:
+            # Tronque de moitié : coût amorti constant par changement
+            self.checkpoint(self.seq - self.max_entries // 2)
+
+    def task_added(self, task: Task):
+        # État interne (tuple) : copie bon marché, convertie en dict à la lecture
+        self._record('add', task.id, None, task.__getstate__())
+
+    def task_removed(self, task: Task):
+        self._record('delete', task.id)
+
+    def task_changed(self, task: Task, field, old, new):
+        self._record('update', task.id, field, new)
+
+    def checkpoint(self, seq=None) -> int:
+        """Oublie les changements jusqu'à seq (par défaut tous) ; retourne le point de contrôle"""
+        seq = self.seq if seq is None else min(seq, self.seq)
+        if seq > self.checkpoint_seq:
+            del self._entries[:seq - self.checkpoint_seq]
+            self.checkpoint_seq = seq
+        return self.checkpoint_seq
+
+    def changes_since(self, seq) -> List[Change]:
+        """Changements de numéro > seq, en O(nombre de changements)"""
+        if seq < self.checkpoint_seq or seq > self.seq:
+            raise ValueError(f"Séquence {seq} hors du journal ({self.checkpoint_seq} à {self.seq}).")
+        changes = []
+        for number, (op, task_id, field, value) in enumerate(self._entries[seq - self.checkpoint_seq:], seq + 1):
+            if op == 'add':
+                value = Task._from_state(value).to_dict()
+            elif op == 'update':
+                value = encode_value(field, value)
+            changes.append(Change(number, op, task_id, field, value))
+        return changes
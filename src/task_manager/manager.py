@@ -1,69 +1,631 @@
-import json
-from typing import List, Optional
-from .task import Task, Priority, Status
+import hashlib
+import re
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from .task import Task, Priority, Status, epoch_key
+from .analytics import ColumnarSnapshot
+from .journal import Change, ChangeJournal, decode_value
+from .metrics import instrumented
+from .query import Predicate, Query
+from .project import ProjectRegistry
+from .search import SearchIndex
+from .storage import BackgroundSaver, JsonStorage
+from .time_index import TIME_FIELDS, TimeIndex, as_key
+from .work_queue import ReadyQueue, ready_key
 import os
 
+# Champs de Task disposant d'un index secondaire
+INDEXED_FIELDS = ('status', 'priority', 'project_id')
+
+# Valeur par défaut distinguant « non fourni » de None (ex: project_id=None)
+_UNSET = object()
+
+class BatchResult(NamedTuple):
+    """Résultat d'une opération en lot pour un élément"""
+    task_id: Optional[str]
+    ok: bool
+    error: Optional[str] = None
+
+class TaskList(list):
+    """Copie des tâches d'un gestionnaire (manager.tasks), en lecture seule
+
+    La modifier n'aurait aucun effet sur le gestionnaire : toute tentative
+    lève TypeError. list(manager.tasks) donne une copie modifiable.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("manager.tasks est en lecture seule : utiliser add_task / delete_task.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+def _load_shard(path) -> List[Task]:
+    # Exécuté dans un processus du pool : lecture JSON + désérialisation
+    return JsonStorage(path).load()
+
+def _save_shard(path, tasks):
+    JsonStorage(path).save(tasks)
+    return path
+
+def _map(func, workers, *iterables):
+    """map() séquentiel (workers <= 1) ou sur un pool de processus"""
+    if workers is not None and workers <= 1:
+        return list(map(func, *iterables))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *iterables))
+
 class TaskManager:
     """Gestionnaire principal des tâches"""
-    def __init__(self, storage_file="tasks.json"):
-        self.storage_file = storage_file
-        self.tasks: List[Task] = []
+    # Verrou lecteurs/rédacteur, voir ConcurrentTaskManager (concurrency.py)
+    _lock = None
+
+    def __init__(self, storage_file="tasks.json", storage=None):
+        # Moteur de stockage (JSON par défaut, voir storage.py)
+        self.storage = storage if storage is not None else JsonStorage(storage_file)
+        self.storage_file = self.storage.path
+        # Stockage paresseux (ex: SQLite) : les tâches restent dans le stockage,
+        # _tasks n'est qu'un cache des tâches déjà chargées
+        self._lazy = self.storage.lazy
+        # Index id -> tâche ; le dict conserve l'ordre d'insertion
+        self._tasks: Dict[str, Task] = self._new_task_map()
+        # Index secondaires : champ -> valeur -> {id: tâche}
+        self._indexes: Dict[str, Dict[Any, Dict[str, Task]]] = self._new_indexes()
+        # Observateurs (task_added / task_removed / task_changed), voir subscribe()
+        self._listeners: List[Any] = []
+        # Registre des projets, créé au premier accès à self.projects
+        self._projects = None
+        # File des tâches TODO par priorité, créée au premier peek_next/pop_next
+        self._ready_queue = None
+        # Index plein texte, construit à la première recherche
+        self._search_index = None
+        # Index triés created_at / completed_at, construits à la première requête
+        self._time_index = None
+        # Journal des changements, démarré au premier accès à self.journal
+        self._journal = None
+        # Réplica : numéro du dernier changement appliqué (None : jamais synchronisé)
+        self.applied_seq: Optional[int] = None
+        # Changements accumulés pendant une opération en lot : (tâches, ids supprimés)
+        self._batched = None
+        # Créé au premier save_to_file(background=True)
+        self._saver: Optional[BackgroundSaver] = None
+        self.save_delay = 0.05
+
+    def _new_task_map(self):
+        return weakref.WeakValueDictionary() if self._lazy else {}
+
+    def _new_indexes(self):
+        # En mode paresseux les requêtes sont confiées au stockage
+        return {} if self._lazy else {field: {} for field in INDEXED_FIELDS}
+
+    @property
+    def tasks(self) -> List[Task]:
+        """Copie ordonnée (ordre d'insertion) et en lecture seule des tâches gérées"""
+        return TaskList(self._iter_tasks())
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Task]):
+        if self._lazy:
+            tasks = list(tasks)
+            self.storage.save(tasks)
+        self._reset(tasks)
+
+    def _iter_tasks(self) -> Iterator[Task]:
+        if self._lazy:
+            return self._materialize(self.storage.find())
+        return iter(self._tasks.values())
+
+    def _materialize(self, records) -> Iterator[Task]:
+        """Transforme des enregistrements du stockage en tâches (cache d'identité)"""
+        for record in records:
+            task = self._tasks.get(record['id'])
+            if task is None:
+                task = Task.from_dict(record)
+                self._attach(task)
+            yield task
+
+    def _reset(self, tasks: Iterable[Task]):
+        for task in self._tasks.values():
+            task._manager = None
+            for listener in self._listeners:
+                listener.task_removed(task)
+        self._tasks = self._new_task_map()
+        self._indexes = self._new_indexes()
+        for task in tasks:
+            self._attach(task)
+
+    def _attach(self, task: Task):
+        if task._manager is not None and task._manager is not self:
+            raise ValueError("La tâche appartient déjà à un autre gestionnaire.")
+        previous = self._tasks.get(task.id)
+        if previous is not None:
+            self._detach(previous)
+        task._manager = self
+        self._tasks[task.id] = task
+        for field, index in self._indexes.items():
+            index.setdefault(getattr(task, field), {})[task.id] = task
+        for listener in self._listeners:
+            listener.task_added(task)
+
+    def _detach(self, task: Task):
+        task._manager = None
+        del self._tasks[task.id]
+        for field, index in self._indexes.items():
+            self._unindex(index, getattr(task, field), task.id)
+        for listener in self._listeners:
+            listener.task_removed(task)
+
+    @staticmethod
+    def _unindex(index, value, task_id):
+        bucket = index[value]
+        del bucket[task_id]
+        if not bucket:
+            del index[value]
+
+    def _task_changed(self, task: Task, field, old, new):
+        """Appelé par une tâche gérée lorsqu'un de ses champs change
+
+        old et new sont les valeurs internes (horodatages en secondes, cf. to_epoch).
+        """
+        index = self._indexes.get(field)
+        if index is not None:
+            self._unindex(index, old, task.id)
+            index.setdefault(new, {})[task.id] = task
+        for listener in self._listeners:
+            listener.task_changed(task, field, old, new)
+        self._persist(updated=(task,))
+
+    @property
+    def projects(self):
+        """Registre des projets (ProjectRegistry) de ce gestionnaire"""
+        if self._projects is None:
+            self._projects = ProjectRegistry(self)
+        return self._projects
+
+    @property
+    def ready_queue(self) -> ReadyQueue:
+        if self._ready_queue is None:
+            self._ready_queue = ReadyQueue(self)
+        return self._ready_queue
+
+    def peek_next(self) -> Optional[Task]:
+        """Tâche TODO la plus prioritaire (puis la plus ancienne), sans la retirer"""
+        if self._lazy:
+            # Pas de file tenue à jour : parcours des tâches TODO du stockage
+            return min(self._lookup('status', Status.TODO), key=ready_key, default=None)
+        return self.ready_queue.peek()
+
+    def pop_next(self) -> Optional[Task]:
+        """Retire la prochaine tâche TODO et la passe au statut IN_PROGRESS"""
+        if self._lazy:
+            task = self.peek_next()
+            if task is not None:
+                task.status = Status.IN_PROGRESS
+            return task
+        return self.ready_queue.pop()
+
+    def search(self, query, status: Optional[Status] = None, priority: Optional[Priority] = None,
+               limit=20) -> List[Task]:
+        """Recherche plein texte (titre, description), insensible aux accents
+
+        Chaque mot de la requête peut être un début de mot ; les résultats
+        sont classés par pertinence. Avec un stockage paresseux, l'index est
+        reconstruit par un parcours à chaque recherche.
+        """
+        if self._lazy:
+            return SearchIndex(self, follow=False).search(query, status, priority, limit)
+        if self._search_index is None:
+            self._search_index = SearchIndex(self)
+        return self._search_index.search(query, status, priority, limit)
+
+    def get_tasks_between(self, field, start=None, end=None) -> List[Task]:
+        """Tâches dont field ('created_at' ou 'completed_at') est dans [start, end)
+
+        start et end sont des datetime ou des date (minuit) ; None ne borne pas.
+        Résultat trié chronologiquement, obtenu par dichotomie (par un
+        parcours filtré avec un stockage paresseux, qui n'a pas d'index trié).
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Champ de date inconnu : {field}")
+        if self._lazy:
+            return self._scan_between(field, as_key(start), as_key(end))
+        if self._time_index is None:
+            self._time_index = TimeIndex(self)
+        task_ids = self._time_index.indexes[field].between(as_key(start), as_key(end))
+        return [self._tasks[task_id] for task_id in task_ids]
+
+    def _scan_between(self, field, start, end) -> List[Task]:
+        attr = '_' + field
+        matches = []
+        for task in self._iter_tasks():
+            key = epoch_key(getattr(task, attr))
+            if key is not None and (start is None or key >= start) and (end is None or key < end):
+                matches.append((key, task.id, task))
+        matches.sort(key=lambda match: match[:2])
+        return [task for _, _, task in matches]
+
+    def subscribe(self, listener):
+        """Abonne un observateur aux ajouts, suppressions et modifications de tâches
+
+        L'observateur fournit task_added(task), task_removed(task) et
+        task_changed(task, field, old, new). Il ne reçoit pas les tâches déjà
+        présentes : à lui de les prendre en compte (ex: via self.tasks).
+        TypeError avec un stockage paresseux (voir Storage).
+        """
+        if self._lazy:
+            raise TypeError("Abonnement impossible avec un stockage paresseux : "
+                            "utiliser un stockage complet (ex: JsonStorage).")
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _persist(self, updated=(), deleted_ids=()):
+        if self._batched is not None:
+            batch_updated, batch_deleted = self._batched
+            for task in updated:
+                batch_updated[task.id] = task
+            for task_id in deleted_ids:
+                batch_updated.pop(task_id, None)
+                batch_deleted.append(task_id)
+            return
+        self.storage.append(updated, deleted_ids)
+        if not self._lazy and self.storage.needs_compaction(len(self._tasks)):
+            self.storage.save(self._tasks.values())
+
+    @contextmanager
+    def _batch(self):
+        """Regroupe les écritures vers le stockage en un seul appel"""
+        if self._batched is not None:
+            yield
+            return
+        self._batched = ({}, [])
+        try:
+            yield
+        finally:
+            updated, deleted_ids = self._batched
+            self._batched = None
+            self._persist(list(updated.values()), deleted_ids)
+
+    def _count(self, field, value) -> int:
+        return len(self._indexes[field].get(value, ()))
+
+    def _lookup(self, field, value) -> List[Task]:
+        if self._lazy:
+            return list(self._materialize(self.storage.find(field, value)))
+        return list(self._indexes[field].get(value, {}).values())
+
+    def __len__(self):
+        return self.storage.count() if self._lazy else len(self._tasks)
+
+    def __contains__(self, task_id):
+        return self.get_task(task_id) is not None
+
+    @property
+    def journal(self) -> ChangeJournal:
+        """Journal des changements, qui part de l'état au premier accès"""
+        if self._journal is None:
+            self._journal = ChangeJournal(self)
+        return self._journal
+
+    def changes_since(self, seq) -> List[Change]:
+        """Changements postérieurs à seq (ValueError s'ils ont été oubliés)"""
+        return self.journal.changes_since(seq)
+
+    def apply_changes(self, changes: Iterable[Change]) -> Optional[int]:
+        """Rejoue sur ce réplica des changements issus de changes_since()
+
+        Les numéros doivent se suivre à partir de applied_seq + 1.
+        Retourne le nouveau applied_seq.
+        """
+        with self._batch():
+            for change in changes:
+                if self.applied_seq is not None and change.seq != self.applied_seq + 1:
+                    raise ValueError(f"Changement {change.seq} reçu, {self.applied_seq + 1} attendu.")
+                if change.op == 'add':
+                    task, = Task.from_dicts((change.value,), trusted=True)
+                    self._attach(task)
+                    self._persist(updated=(task,))
+                elif change.op == 'delete':
+                    self.delete_task(change.task_id)
+                else:
+                    task = self.get_task(change.task_id)
+                    if task is None:
+                        raise ValueError(f"Tâche inexistante : {change.task_id}")
+                    setattr(task, change.field, decode_value(change.field, change.value))
+                self.applied_seq = change.seq
+        return self.applied_seq
+
+    def sync_from(self, source: 'TaskManager') -> int:
+        """Met ce réplica à jour depuis source, par ses seuls changements si possible
+
+        Copie complète à la première synchronisation ou si le journal de la
+        source a oublié les changements manquants (point de contrôle).
+        """
+        # Lectures de la source par ses méthodes publiques : un
+        # ConcurrentTaskManager les prend sous son verrou de lecture
+        source.journal
+        if self.applied_seq is not None:
+            try:
+                changes = source.changes_since(self.applied_seq)
+            except ValueError:
+                pass
+            else:
+                return self.apply_changes(changes)
+        records, seq = source._replica_state()
+        self.tasks = Task.from_dicts(records, trusted=True)
+        self.applied_seq = seq
+        return self.applied_seq
+
+    def _replica_state(self):
+        """(tâches au format to_dict, numéro du journal correspondant), d'un bloc"""
+        return [task.to_dict() for task in self._iter_tasks()], self.journal.seq
 
     def add_task(self, title, description="", priority=Priority.MEDIUM):
         task = Task(title, description, priority)
-        self.tasks.append(task)
+        self._attach(task)
+        self._persist(updated=(task,))
         return task.id
 
+    def add_tasks(self, items: Iterable) -> List[BatchResult]:
+        """Ajoute des tâches en lot
+
+        Chaque élément est un titre, un tuple (titre, description, priorité)
+        ou un dict {'title', 'description', 'priority'}.
+        """
+        results = []
+        with self._batch():
+            for item in items:
+                try:
+                    if isinstance(item, str):
+                        task = Task(item)
+                    elif isinstance(item, dict):
+                        task = Task(item.get('title'), item.get('description', ""), item.get('priority', Priority.MEDIUM))
+                    else:
+                        task = Task(*item)
+                except (TypeError, ValueError) as e:
+                    results.append(BatchResult(None, False, str(e)))
+                    continue
+                self._attach(task)
+                self._persist(updated=(task,))
+                results.append(BatchResult(task.id, True))
+        return results
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> List[BatchResult]:
+        results = []
+        with self._batch():
+            for task_id in task_ids:
+                if self.delete_task(task_id):
+                    results.append(BatchResult(task_id, True))
+                else:
+                    results.append(BatchResult(task_id, False, "Tâche inexistante"))
+        return results
+
+    def update_tasks(self, task_ids: Iterable[str], status=None, priority=None, project_id=_UNSET) -> List[BatchResult]:
+        """Applique les mêmes changements de statut/priorité/projet à plusieurs tâches"""
+        if status is not None and not isinstance(status, Status):
+            raise ValueError("Le statut doit être une instance de Status.")
+        if priority is not None and not isinstance(priority, Priority):
+            raise ValueError("La priorité doit être une instance de Priority.")
+        results = []
+        with self._batch():
+            for task_id in task_ids:
+                task = self.get_task(task_id)
+                if task is None:
+                    results.append(BatchResult(task_id, False, "Tâche inexistante"))
+                    continue
+                if priority is not None:
+                    task.update_priority(priority)
+                if project_id is not _UNSET:
+                    task.assign_to_project(project_id)
+                if status is Status.DONE and task.status is not Status.DONE:
+                    task.mark_completed()
+                elif status is not None:
+                    task.status = status
+                results.append(BatchResult(task_id, True))
+        return results
+
+    def load_many(self, records: Iterable[dict], trusted=False) -> List[str]:
+        """Ajoute en lot des tâches au format to_dict (voir Task.from_dicts)"""
+        tasks = Task.from_dicts(records, trusted)
+        for task in tasks:
+            self._attach(task)
+        self._persist(updated=tasks)
+        return [task.id for task in tasks]
+
     def get_task(self, task_id) -> Optional[Task]:
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        task = self._tasks.get(task_id)
+        if task is None and self._lazy:
+            record = self.storage.get(task_id)
+            if record is not None:
+                task, = self._materialize((record,))
+        return task
 
     def get_tasks_by_status(self, status: Status) -> List[Task]:
-        return [task for task in self.tasks if task.status == status]
+        return self._lookup('status', status)
 
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
-        return [task for task in self.tasks if task.priority == priority]
+        return self._lookup('priority', priority)
+
+    def get_tasks_by_project(self, project_id) -> List[Task]:
+        return self._lookup('project_id', project_id)
+
+    def query(self, *predicates: Predicate, order_by='created_at', **filters) -> Query:
+        """Requête combinant des prédicats (Q.status, Q.priority...) et des filtres nommés
+
+        Filtres : status, priority, project_id (valeur ou liste de valeurs),
+        created_after / completed_after (inclus), created_before /
+        completed_before (exclus). order_by : 'created_at', 'completed_at',
+        'priority', 'status' ou 'title', préfixé de '-' pour l'ordre décroissant.
+        Exemple : manager.query(~Q.status(Status.DONE), priority=[Priority.HIGH, Priority.URGENT],
+        project_id="P", created_after=d).page(20, cursor)
+        """
+        return Query(self, order_by=order_by).filter(*predicates, **filters)
 
     def delete_task(self, task_id) -> bool:
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                del self.tasks[i]
-                return True
-        return False
-
-    def save_to_file(self, filename=None):
-        fname = filename or self.storage_file
+        task = self.get_task(task_id)
+        if task is None:
+            return False
+        self._detach(task)
+        self._persist(deleted_ids=(task_id,))
+        return True
+
+    @instrumented()
+    def save_to_file(self, filename=None, background=False):
+        """Sauvegarde atomique ; background=True la confie à un thread de travail"""
+        if background:
+            if filename is not None or not self.storage.supports_background:
+                raise ValueError("Sauvegarde en arrière-plan impossible avec ce stockage ou ce fichier.")
+            if self._saver is None:
+                self._saver = BackgroundSaver(self._save_snapshot, self.save_delay)
+            self._saver.request()
+            return
         try:
-            with open(fname, 'w', encoding='utf-8') as f:
-                json.dump([task.to_dict() for task in self.tasks], f, ensure_ascii=False, indent=2)
+            if self._lazy and filename is None:
+                self.storage.flush()
+            else:
+                self._save_tasks(filename)
         except Exception as e:
             raise IOError(f"Erreur lors de la sauvegarde des tâches : {e}")
 
+    def _tasks_to_save(self) -> Iterable[Task]:
+        return self._iter_tasks()
+
+    def _save_tasks(self, filename=None):
+        self.storage.save(self._tasks_to_save(), filename)
+
+    def _save_snapshot(self):
+        # Copie des états (rapide) puis sérialisation sur ce thread de travail.
+        # Sans verrou, une tâche modifiée pendant la copie par un autre thread
+        # peut être saisie entre deux champs (ex: completed_at sans le statut
+        # DONE de mark_completed) : ConcurrentTaskManager copie sous verrou.
+        states = [task.__getstate__() for task in list(self._tasks.values())]
+        self.storage.save([Task._from_state(state) for state in states])
+
+    def wait_for_save(self, timeout=None):
+        """Attend la fin des sauvegardes en arrière-plan et remonte leur erreur"""
+        if self._saver is None:
+            return
+        if not self._saver.wait(timeout):
+            raise TimeoutError("Sauvegarde en arrière-plan non terminée")
+        if self._saver.last_error is not None:
+            raise IOError(f"Erreur lors de la sauvegarde des tâches : {self._saver.last_error}")
+
+    def close(self):
+        """Termine les sauvegardes en cours et ferme le stockage"""
+        if self._saver is not None:
+            self._saver.close()
+            self._saver = None
+        self.storage.close()
+
+    @instrumented()
     def load_from_file(self, filename=None):
-        fname = filename or self.storage_file
+        fname = filename or self.storage.path
         if not os.path.exists(fname):
-            self.tasks = []
+            self._reset([])
             return
         try:
-            with open(fname, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.tasks = [Task.from_dict(item) for item in data]
+            self._reset(self.storage.load(fname))
         except FileNotFoundError:
-            self.tasks = []
+            self._reset([])
+        except Exception as e:
+            raise IOError(f"Erreur lors du chargement des tâches : {e}")
+
+    def load_shards(self, paths: Iterable[str], workers=None):
+        """Charge plusieurs fichiers JSON en parallèle (un processus par fichier)
+
+        workers=None utilise tous les cœurs, workers=1 charge sans pool.
+        Les tâches remplacent le contenu courant ; en cas d'id en double,
+        le dernier fichier l'emporte.
+        """
+        if self._lazy:
+            raise TypeError("Chargement par fragments impossible avec un stockage paresseux.")
+        paths = list(paths)
+        try:
+            shards = _map(_load_shard, workers, paths)
         except Exception as e:
             raise IOError(f"Erreur lors du chargement des tâches : {e}")
+        self._reset(task for shard in shards for task in shard)
+
+    def save_shards(self, directory, workers=None) -> Dict[Optional[str], str]:
+        """Sauvegarde un fichier JSON par projet, en parallèle
+
+        Retourne le chemin écrit pour chaque project_id (None : sans projet).
+        """
+        shards: Dict[Optional[str], List[Task]] = {}
+        for task in self._tasks_to_save():
+            shards.setdefault(task.project_id, []).append(task)
+        paths = {project_id: os.path.join(directory, self._shard_name(project_id)) for project_id in shards}
+        if len(set(paths.values())) != len(paths):
+            raise ValueError("Deux projets produisent le même nom de fragment.")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            _map(_save_shard, workers, list(paths.values()), list(shards.values()))
+        except Exception as e:
+            raise IOError(f"Erreur lors de la sauvegarde des tâches : {e}")
+        return paths
 
+    @staticmethod
+    def _shard_name(project_id):
+        # Le suffixe (empreinte de repr) distingue les ids que le nettoyage
+        # confond : 'a/b' et 'a_b', None et '_sans_projet'
+        prefix = "_sans_projet" if project_id is None else re.sub(r'[^\w.-]', '_', str(project_id))
+        digest = hashlib.sha1(repr(project_id).encode('utf-8')).hexdigest()[:10]
+        return f"{prefix}-{digest}.json"
+
+    @instrumented()
     def get_statistics(self):
+        if self._lazy:
+            return self.storage.statistics()
+        # Les tailles des index secondaires servent de compteurs tenus à jour
+        # à chaque ajout, suppression ou changement : aucun parcours des tâches
+        stats = {
+            'total_tasks': len(self._tasks),
+            'completed_tasks': self._count('status', Status.DONE),
+            'tasks_by_priority': {p.name: self._count('priority', p) for p in Priority},
+            'tasks_by_status': {s.name: self._count('status', s) for s in Status},
+            'tasks_by_project': {pid: len(bucket) for pid, bucket in self._indexes['project_id'].items() if pid is not None}
+        }
+        return stats
+
+    def columnar_snapshot(self) -> ColumnarSnapshot:
+        """Copie en colonnes NumPy des tâches pour les agrégations vectorisées (numpy requis)"""
+        return ColumnarSnapshot.from_tasks(self._iter_tasks())
+
+    def _compute_statistics(self):
+        """Recalcule les statistiques en parcourant toutes les tâches"""
         stats = {
-            'total_tasks': len(self.tasks),
-            'completed_tasks': len([t for t in self.tasks if t.status == Status.DONE]),
-            'tasks_by_priority': {},
-            'tasks_by_status': {}
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'tasks_by_priority': {p.name: 0 for p in Priority},
+            'tasks_by_status': {s.name: 0 for s in Status},
+            'tasks_by_project': {}
         }
-        for priority in Priority:
-            stats['tasks_by_priority'][priority.name] = len([t for t in self.tasks if t.priority == priority])
-        for status in Status:
-            stats['tasks_by_status'][status.name] = len([t for t in self.tasks if t.status == status])
+        for task in self._iter_tasks():
+            stats['total_tasks'] += 1
+            stats['tasks_by_priority'][task.priority.name] += 1
+            stats['tasks_by_status'][task.status.name] += 1
+            if task.status == Status.DONE:
+                stats['completed_tasks'] += 1
+            if task.project_id is not None:
+                stats['tasks_by_project'][task.project_id] = stats['tasks_by_project'].get(task.project_id, 0) + 1
         return stats
+
+    def check_consistency(self):
+        """Vérifie index et compteurs contre un recalcul complet (tests, débogage)"""
+        errors = []
+        for field, index in self._indexes.items():
+            indexed = sum(len(bucket) for bucket in index.values())
+            if indexed != len(self._tasks):
+                errors.append(f"index '{field}' : {indexed} entrées pour {len(self._tasks)} tâches")
+            for value, bucket in index.items():
+                for task_id, task in bucket.items():
+                    if self._tasks.get(task_id) is not task or getattr(task, field) != value:
+                        errors.append(f"index '{field}' : tâche {task_id} mal classée sous {value!r}")
+        expected = self._compute_statistics()
+        actual = self.get_statistics()
+        if actual != expected:
+            errors.append(f"statistiques incohérentes : {actual} != {expected}")
+        if errors:
+            raise RuntimeError("Incohérence du gestionnaire : " + "; ".join(errors))
+        return True
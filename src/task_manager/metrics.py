@@ -0,0 +1,142 @@
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bornes supérieures des classes de latence : 1 µs à ~19 h, facteur 2
+BUCKET_BOUNDS: List[float] = [1e-6 * 2 ** k for k in range(37)]
+
+class LatencyHistogram:
+    """Histogramme de latences à classes logarithmiques (précision relative ~2x)"""
+    def __init__(self):
+        # Une classe par borne, plus une pour les valeurs au-delà
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds):
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q) -> Optional[float]:
+        """Estimation du q-ième centile : borne supérieure de sa classe (bornée par max)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for position, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                bound = BUCKET_BOUNDS[position] if position < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            # Classes non vides, indexées par leur borne supérieure (secondes)
+            'buckets': {(f"{BUCKET_BOUNDS[i]:.6g}" if i < len(BUCKET_BOUNDS) else "inf"): count
+                        for i, count in enumerate(self.buckets) if count}
+        }
+
+class Metrics:
+    """Latences et compteurs des opérations instrumentées (désactivé par défaut)
+
+    enable() active toutes les opérations, enable(['TaskManager.save_to_file'])
+    seulement celles nommées. Désactivé, une opération instrumentée ne coûte
+    qu'un test.
+    """
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        # Toutes les opérations, ou seulement celles de _operations
+        self._all = False
+        self._operations: frozenset = frozenset()
+        self._lock = threading.Lock()
+
+    def enable(self, operations: Optional[Iterable[str]] = None):
+        if operations is None:
+            self._all = True
+        else:
+            self._operations = self._operations | frozenset(operations)
+
+    def disable(self):
+        self._all = False
+        self._operations = frozenset()
+
+    def is_enabled(self, operation) -> bool:
+        return self._all or operation in self._operations
+
+    def record(self, operation, seconds, error=False):
+        with self._lock:
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.record(seconds)
+            self._increment(operation + '.calls', 1)
+            if error:
+                self._increment(operation + '.errors', 1)
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self._increment(counter, amount)
+
+    def _increment(self, counter, amount):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'latencies': {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+# Registre global utilisé par les opérations instrumentées
+metrics = Metrics()
+
+def instrumented(operation=None):
+    """Mesure la durée de chaque appel de la fonction décorée quand metrics l'active
+
+    Le nom par défaut est le nom qualifié (ex: 'TaskManager.save_to_file').
+    """
+    def decorate(func):
+        name = operation or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (metrics._all or name in metrics._operations):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                metrics.record(name, time.perf_counter() - start, error=True)
+                raise
+            metrics.record(name, time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorate
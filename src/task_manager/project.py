@@ -0,0 +1,157 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from .task import Status, Task
+import uuid
+
+class Project:
+    """Un projet regroupant des tâches"""
+    def __init__(self, name, description=""):
+        if not name or not isinstance(name, str):
+            raise ValueError("Le nom du projet ne peut pas être vide.")
+        self.id = str(uuid.uuid4())
+        self.name = name
+        self.description = description
+        self.created_at = datetime.now()
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        project = cls(data.get('name'), data.get('description', ""))
+        project.id = data.get('id', project.id)
+        if data.get('created_at'):
+            project.created_at = datetime.fromisoformat(data['created_at'])
+        return project
+
+class ProjectRegistry:
+    """Projets d'un TaskManager
+
+    Les tâches d'un projet sont lues dans la partition par project_id du
+    gestionnaire (O(k) pour k tâches) ; le registre tient en plus, par
+    projet, un compteur par statut mis à jour à chaque notification, d'où
+    des comptes et une progression en O(1).
+
+    Le registre n'est pas sauvegardé : tout project_id porté par une tâche
+    (ex: après load_from_file) y figure, recréé avec l'id pour nom. Avec un
+    stockage paresseux (sans abonnement), ces projets, les comptes et la
+    progression sont obtenus par requête au stockage.
+    """
+    def __init__(self, manager):
+        self._manager = manager
+        self._projects: Dict[str, Project] = {}
+        # project_id -> statut -> nombre de tâches
+        self._status_counts: Dict[str, Dict[Status, int]] = {}
+        if manager._lazy:
+            return
+        for task in manager.tasks:
+            self.task_added(task)
+        manager.subscribe(self)
+
+    def _discover(self, project_id):
+        if project_id is not None and project_id not in self._projects:
+            project = Project(str(project_id))
+            project.id = project_id
+            self._projects[project_id] = project
+
+    def _refresh(self):
+        # Stockage paresseux : projets des tâches, lus dans le stockage
+        if self._manager._lazy:
+            for project_id in self._manager.get_statistics()['tasks_by_project']:
+                self._discover(project_id)
+
+    def create(self, name, description="") -> Project:
+        return self.add(Project(name, description))
+
+    def add(self, project: Project) -> Project:
+        self._projects[project.id] = project
+        return project
+
+    def get(self, project_id) -> Optional[Project]:
+        self._refresh()
+        return self._projects.get(project_id)
+
+    def __iter__(self) -> Iterator[Project]:
+        self._refresh()
+        return iter(list(self._projects.values()))
+
+    def __len__(self):
+        self._refresh()
+        return len(self._projects)
+
+    def __contains__(self, project_id):
+        self._refresh()
+        return project_id in self._projects
+
+    def delete(self, project_id, delete_tasks=False) -> bool:
+        """Supprime le projet ; ses tâches sont supprimées ou désassignées"""
+        self._refresh()
+        if self._projects.pop(project_id, None) is None:
+            return False
+        task_ids = [task.id for task in self.tasks(project_id)]
+        if delete_tasks:
+            self._manager.delete_tasks(task_ids)
+        else:
+            self._manager.update_tasks(task_ids, project_id=None)
+        return True
+
+    def count(self, project_id) -> int:
+        if self._manager._lazy:
+            return len(self.tasks(project_id))
+        return self._manager._count('project_id', project_id)
+
+    def tasks(self, project_id) -> List[Task]:
+        return self._manager.get_tasks_by_project(project_id)
+
+    def reassign(self, task_ids, project_id):
+        """Déplace des tâches vers un autre projet (None : aucun projet)"""
+        if project_id is not None and project_id not in self:
+            raise ValueError("Projet inexistant.")
+        return self._manager.update_tasks(task_ids, project_id=project_id)
+
+    def progress(self, project_id):
+        if self._manager._lazy:
+            counts = Counter(task.status for task in self.tasks(project_id))
+        else:
+            counts = self._status_counts.get(project_id, {})
+        total = sum(counts.values())
+        completed = counts.get(Status.DONE, 0)
+        return {
+            'project_id': project_id,
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'completion_rate': completed / total if total else 0.0,
+            'tasks_by_status': {s.name: counts.get(s, 0) for s in Status}
+        }
+
+    def _adjust(self, project_id, status, delta):
+        if project_id is None:
+            return
+        counts = self._status_counts.setdefault(project_id, {})
+        counts[status] = counts.get(status, 0) + delta
+        if not counts[status]:
+            del counts[status]
+            if not counts:
+                del self._status_counts[project_id]
+
+    def task_added(self, task):
+        self._discover(task.project_id)
+        self._adjust(task.project_id, task.status, 1)
+
+    def task_removed(self, task):
+        self._adjust(task.project_id, task.status, -1)
+
+    def task_changed(self, task, field, old, new):
+        if field == 'status':
+            self._adjust(task.project_id, old, -1)
+            self._adjust(task.project_id, new, 1)
+        elif field == 'project_id':
+            self._discover(new)
+            self._adjust(old, task.status, -1)
+            self._adjust(new, task.status, 1)
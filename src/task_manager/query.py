@@ -0,0 +1,469 @@
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from contextlib import nullcontext
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+from .task import Priority, Status, Task, epoch_key
+from .time_index import TIME_FIELDS, SortedTimeIndex, TimeIndex, as_key
+from .work_queue import PRIORITY_RANK
+
+# Domaines finis : la négation d'un filtre devient le filtre complémentaire
+DOMAINS = {'status': tuple(Status), 'priority': tuple(Priority)}
+STATUS_RANK = {status: rank for rank, status in enumerate(Status)}
+
+class AccessPath(NamedTuple):
+    """Chemin d'accès aux candidats d'un prédicat
+
+    cost : nombre de candidats (exact, lu sur les index) ; ids() : leurs
+    identifiants.
+    """
+    cost: int
+    ids: Callable[[], Iterable[str]]
+    description: str
+
+class Predicate:
+    """Condition sur une tâche, composable avec &, | et ~"""
+    def compile(self) -> Callable[[Task], bool]:
+        raise NotImplementedError
+
+    def access_path(self, manager) -> Optional[AccessPath]:
+        """Chemin d'accès plus sélectif qu'un parcours complet, s'il existe"""
+        return None
+
+    def conjuncts(self) -> List['Predicate']:
+        return [self]
+
+    def __and__(self, other):
+        return And(self.conjuncts() + other.conjuncts())
+
+    def __or__(self, other):
+        return Or([self, other])
+
+    def __invert__(self):
+        return Not(self)
+
+class In(Predicate):
+    """Champ indexé (status, priority, project_id) parmi des valeurs"""
+    def __init__(self, field, values):
+        self.field = field
+        self.values = frozenset(values)
+
+    def compile(self):
+        getter = attrgetter('_' + self.field)
+        values = self.values
+        return lambda task: getter(task) in values
+
+    def access_path(self, manager):
+        index = manager._indexes.get(self.field)
+        if index is None:
+            return None
+        buckets = [index[value] for value in self.values if value in index]
+        names = ", ".join(sorted(getattr(value, 'name', str(value)) for value in self.values))
+        return AccessPath(sum(len(bucket) for bucket in buckets), lambda: chain.from_iterable(buckets),
+                          f"index {self.field} in ({names})")
+
+class Between(Predicate):
+    """Date (created_at ou completed_at) dans [start, end)"""
+    def __init__(self, field, start=None, end=None):
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Champ de date inconnu : {field}")
+        self.field = field
+        self.start = as_key(start)
+        self.end = as_key(end)
+
+    def compile(self):
+        getter = attrgetter('_' + self.field)
+        start, end = self.start, self.end
+
+        def matches(task):
+            key = epoch_key(getter(task))
+            return key is not None and (start is None or key >= start) and (end is None or key < end)
+        return matches
+
+    def access_path(self, manager):
+        if manager._lazy:
+            return None
+        index = _time_index(manager, self.field)
+        return AccessPath(index.count_between(self.start, self.end),
+                          lambda: index.between(self.start, self.end),
+                          f"index trié {self.field}")
+
+class Where(Predicate):
+    """Condition arbitraire (fonction tâche -> bool), évaluée sur chaque candidat"""
+    def __init__(self, func):
+        self.func = func
+
+    def compile(self):
+        return self.func
+
+class And(Predicate):
+    def __init__(self, children):
+        self.children = list(children)
+
+    def conjuncts(self):
+        return list(self.children)
+
+    def compile(self):
+        tests = [child.compile() for child in self.children]
+        if len(tests) == 1:
+            return tests[0]
+
+        def matches(task):
+            for test in tests:
+                if not test(task):
+                    return False
+            return True
+        return matches
+
+    def access_path(self, manager):
+        # Le conjoint le plus sélectif fournit les candidats, les autres filtrent
+        paths = [path for path in (child.access_path(manager) for child in self.children) if path is not None]
+        return min(paths, key=attrgetter('cost'), default=None)
+
+class Or(Predicate):
+    def __init__(self, children):
+        self.children = list(children)
+
+    def compile(self):
+        tests = [child.compile() for child in self.children]
+
+        def matches(task):
+            for test in tests:
+                if test(task):
+                    return True
+            return False
+        return matches
+
+    def access_path(self, manager):
+        # Union des chemins, seulement si chaque branche en a un
+        paths = [child.access_path(manager) for child in self.children]
+        if any(path is None for path in paths):
+            return None
+        return AccessPath(sum(path.cost for path in paths),
+                          lambda: dict.fromkeys(chain.from_iterable(path.ids() for path in paths)),
+                          " | ".join(path.description for path in paths))
+
+class Not(Predicate):
+    def __init__(self, child):
+        self.child = child
+
+    def compile(self):
+        test = self.child.compile()
+        return lambda task: not test(task)
+
+    def access_path(self, manager):
+        child = self.child
+        if isinstance(child, In) and child.field in DOMAINS:
+            return In(child.field, set(DOMAINS[child.field]) - child.values).access_path(manager)
+        return None
+
+class Q:
+    """Constructeurs de prédicats : Q.priority(Priority.HIGH, Priority.URGENT) & ~Q.status(Status.DONE)"""
+    @staticmethod
+    def status(*statuses) -> Predicate:
+        return In('status', statuses)
+
+    @staticmethod
+    def priority(*priorities) -> Predicate:
+        return In('priority', priorities)
+
+    @staticmethod
+    def project(*project_ids) -> Predicate:
+        return In('project_id', project_ids)
+
+    @staticmethod
+    def created(start=None, end=None) -> Predicate:
+        return Between('created_at', start, end)
+
+    @staticmethod
+    def completed(start=None, end=None) -> Predicate:
+        return Between('completed_at', start, end)
+
+    @staticmethod
+    def where(func) -> Predicate:
+        return Where(func)
+
+def _time_index(manager, field) -> SortedTimeIndex:
+    if manager._time_index is None:
+        manager._time_index = TimeIndex(manager)
+    return manager._time_index.indexes[field]
+
+def _as_values(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return value
+    return (value,)
+
+# Filtres nommés de TaskManager.query() ; *_after inclus, *_before exclu
+FILTERS = {
+    'status': lambda value: Q.status(*_as_values(value)),
+    'priority': lambda value: Q.priority(*_as_values(value)),
+    'project_id': lambda value: Q.project(*_as_values(value)),
+    'created_after': lambda value: Q.created(start=value),
+    'created_before': lambda value: Q.created(end=value),
+    'completed_after': lambda value: Q.completed(start=value),
+    'completed_before': lambda value: Q.completed(end=value),
+}
+
+def _time_key(field):
+    getter = attrgetter('_' + field)
+    if field == 'created_at':
+        return lambda task: epoch_key(getter(task))
+
+    def key(task):
+        value = epoch_key(getter(task))
+        # Tâches non terminées en dernier
+        return (1, 0.0) if value is None else (0, value)
+    return key
+
+# Clés de tri (hors id, ajouté pour un ordre total)
+SORT_KEYS = {
+    'created_at': _time_key('created_at'),
+    'completed_at': _time_key('completed_at'),
+    'priority': lambda task: PRIORITY_RANK[task._priority],
+    'status': lambda task: STATUS_RANK[task._status],
+    'title': attrgetter('_title'),
+}
+
+class Page(NamedTuple):
+    items: List[Task]
+    # Curseur de la page suivante (None : dernière page)
+    next_cursor: Optional[str]
+
+def _freeze(value):
+    return tuple(_freeze(item) for item in value) if isinstance(value, list) else value
+
+class Query:
+    """Requête paresseuse sur les tâches d'un gestionnaire
+
+    Les conditions sont combinées en un prédicat compilé ; à l'exécution, le
+    chemin d'accès le plus sélectif (index status/priority/project_id, plage
+    de l'index trié des dates, sinon parcours complet) fournit les candidats.
+    Une page seule est extraite par heapq (top-k) ou, pour un tri par date,
+    en suivant l'index trié jusqu'à la page remplie. La pagination utilise
+    des curseurs (dernière clé de tri renvoyée), stables entre les appels.
+    """
+    def __init__(self, manager, predicate: Optional[Predicate] = None, order_by='created_at'):
+        field = order_by.lstrip('-')
+        if field not in SORT_KEYS:
+            raise ValueError(f"Tri impossible sur : {order_by}")
+        self._manager = manager
+        self._predicate = predicate
+        self._order_by = order_by
+        self._field = field
+        self._descending = order_by.startswith('-')
+        self._key = SORT_KEYS[field]
+
+    def filter(self, *predicates: Predicate, **filters) -> 'Query':
+        conditions = list(predicates)
+        for name, value in filters.items():
+            if name not in FILTERS:
+                raise ValueError(f"Filtre inconnu : {name}")
+            conditions.append(FILTERS[name](value))
+        if self._predicate is not None:
+            conditions.insert(0, self._predicate)
+        if not conditions:
+            return self
+        predicate = conditions[0]
+        for condition in conditions[1:]:
+            predicate = predicate & condition
+        return Query(self._manager, predicate, self._order_by)
+
+    def order_by(self, order_by) -> 'Query':
+        return Query(self._manager, self._predicate, order_by)
+
+    def _locked(self):
+        manager = self._manager
+        if not manager._lazy and manager._time_index is None:
+            # L'index trié s'abonne au gestionnaire (écriture) : créé avant la lecture
+            ensure = getattr(manager, '_ensure', None)
+            if ensure is not None:
+                ensure('_time_index', TimeIndex)
+            else:
+                manager._time_index = TimeIndex(manager)
+        lock = manager._lock
+        return lock.reading() if lock is not None else nullcontext()
+
+    def _sort_key(self, task):
+        return (self._key(task), task.id)
+
+    # --- Curseurs -----------------------------------------------------------
+
+    def _encode_cursor(self, task) -> str:
+        data = json.dumps([self._order_by, self._sort_key(task)], ensure_ascii=False)
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+    def _decode_cursor(self, cursor):
+        try:
+            order_by, key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError("Curseur invalide")
+        if order_by != self._order_by:
+            raise ValueError(f"Curseur obtenu avec un autre tri ({order_by})")
+        return _freeze(key)
+
+    # --- Plan d'exécution ---------------------------------------------------
+
+    def _plan(self, limit=None):
+        """('stream', plage) pour un parcours ordonné de l'index trié, sinon ('candidates', chemin)"""
+        manager = self._manager
+        total = len(manager)
+        path = self._predicate.access_path(manager) if self._predicate is not None else None
+        if path is None:
+            path = AccessPath(total, lambda: list(manager._tasks), "parcours complet")
+        if manager._lazy or self._field not in TIME_FIELDS:
+            return 'candidates', path
+        # Plage de l'index trié sur le champ de tri : conjoint Between, ou index
+        # complet de created_at (toutes les tâches y figurent)
+        time_range = None
+        conjuncts = self._predicate.conjuncts() if self._predicate is not None else []
+        for condition in conjuncts:
+            if isinstance(condition, Between) and condition.field == self._field:
+                time_range = (condition.field, condition.start, condition.end)
+                break
+        if time_range is None and self._field == 'created_at':
+            time_range = ('created_at', None, None)
+        if time_range is None:
+            return 'candidates', path
+        span = _time_index(manager, self._field).count_between(time_range[1], time_range[2])
+        # Entrées à lire avant de remplir la page, à sélectivité uniforme
+        needed = span if limit is None else min(span, limit * span / max(path.cost, 1))
+        if needed <= path.cost:
+            return 'stream', time_range
+        return 'candidates', path
+
+    def explain(self, limit=None) -> str:
+        """Description du plan choisi (débogage, tests)"""
+        with self._locked():
+            strategy, detail = self._plan(limit)
+        if strategy == 'stream':
+            return f"parcours ordonné de l'index trié {detail[0]}"
+        return f"{detail.description} ({detail.cost} candidats)"
+
+    # --- Exécution ------------------------------------------------------------
+
+    def _stream(self, time_range, after) -> Iterator[Task]:
+        """Tâches de la plage, dans l'ordre de tri, après la clé after"""
+        field, start, end = time_range
+        index = _time_index(self._manager, field)
+        keys, ids = index._keys, index._ids
+        low = 0 if start is None else bisect_left(keys, start)
+        high = len(keys) if end is None else bisect_left(keys, end)
+        if after is not None:
+            key, last_id = after
+            if field == 'completed_at':
+                key = key[1]
+            if self._descending:
+                position = bisect_right(keys, key, low, high)
+                while position > low and keys[position - 1] == key and ids[position - 1] >= last_id:
+                    position -= 1
+                high = position
+            else:
+                position = bisect_left(keys, key, low, high)
+                while position < high and keys[position] == key and ids[position] <= last_id:
+                    position += 1
+                low = position
+        positions = range(high - 1, low - 1, -1) if self._descending else range(low, high)
+        tasks = self._manager._tasks
+        test = self._predicate.compile() if self._predicate is not None else None
+        for position in positions:
+            if position >= len(ids):
+                # Index raccourci pendant l'itération
+                continue
+            task = tasks.get(ids[position])
+            if task is not None and (test is None or test(task)):
+                yield task
+
+    def _candidates(self, path, after) -> Iterator[Task]:
+        tasks = self._manager._tasks if not self._manager._lazy else None
+        test = self._predicate.compile() if self._predicate is not None else None
+        if tasks is None:
+            source = self._manager._iter_tasks()
+        else:
+            source = (tasks[task_id] for task_id in path.ids())
+        sort_key = self._sort_key
+        for task in source:
+            if test is not None and not test(task):
+                continue
+            if after is not None:
+                key = sort_key(task)
+                if (key <= after) if not self._descending else (key >= after):
+                    continue
+            yield task
+
+    def _select(self, limit, after) -> List[Task]:
+        """Au plus limit tâches (toutes si None) suivant after, dans l'ordre de tri"""
+        strategy, detail = self._plan(limit)
+        if strategy == 'stream':
+            stream = self._stream(detail, after)
+            if limit is None:
+                return list(stream)
+            return [task for task, _ in zip(stream, range(limit))]
+        candidates = self._candidates(detail, after)
+        if limit is None:
+            return sorted(candidates, key=self._sort_key, reverse=self._descending)
+        select = heapq.nlargest if self._descending else heapq.nsmallest
+        return select(limit, candidates, key=self._sort_key)
+
+    def page(self, limit=20, cursor: Optional[str] = None) -> Page:
+        """Page de limit tâches suivant le curseur (None : première page)"""
+        if limit <= 0:
+            raise ValueError("La taille de page doit être positive.")
+        after = self._decode_cursor(cursor) if cursor is not None else None
+        with self._locked():
+            # Une tâche de plus indique s'il reste une page
+            items = self._select(limit + 1, after)
+            next_cursor = self._encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return Page(items[:limit], next_cursor)
+
+    def pages(self, limit=20) -> Iterator[Page]:
+        cursor = None
+        while True:
+            page = self.page(limit, cursor)
+            yield page
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def __iter__(self) -> Iterator[Task]:
+        """Itération paresseuse dans l'ordre de tri
+
+        Un parcours ordonné de l'index trié s'arrête dès que l'appelant cesse
+        de consommer. Avec un gestionnaire concurrent, les tâches sont lues par
+        pages (de taille croissante) sous le verrou de lecture.
+        """
+        if self._manager._lock is not None:
+            return self._iter_pages()
+        with self._locked():
+            strategy, detail = self._plan()
+        if strategy == 'stream':
+            return self._stream(detail, None)
+        return iter(self._select(None, None))
+
+    def _iter_pages(self) -> Iterator[Task]:
+        limit, cursor = 100, None
+        while True:
+            page = self.page(limit, cursor)
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+            limit = min(limit * 2, 10_000)
+
+    def first(self) -> Optional[Task]:
+        items = self.page(1).items
+        return items[0] if items else None
+
+    def count(self) -> int:
+        if self._predicate is None:
+            return len(self._manager)
+        with self._locked():
+            strategy, detail = self._plan()
+            if strategy == 'stream':
+                return sum(1 for _ in self._stream(detail, None))
+            return sum(1 for _ in self._candidates(detail, None))
+
+    def all(self) -> List[Task]:
+        return list(self)
@@ -0,0 +1,141 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .task import Priority, Status, Task
+
+_WORD = re.compile(r'\w+')
+
+# Mots vides français ignorés à l'indexation comme à la recherche
+STOP_WORDS = frozenset((
+    'a', 'au', 'aux', 'avec', 'ce', 'ces', 'dans', 'de', 'des', 'du', 'en', 'et', 'il', 'la',
+    'le', 'les', 'leur', 'l', 'd', 'ne', 'ou', 'par', 'pas', 'pour', 'qu', 'que', 'qui', 'sa',
+    'se', 'ses', 'son', 'sur', 'un', 'une', 'y'
+))
+
+# Une occurrence dans le titre compte plus qu'une occurrence dans la description
+TITLE_WEIGHT = 3
+
+def normalize(text) -> str:
+    """Minuscules sans accents : « Préparer » -> « preparer »"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize(text) -> List[str]:
+    return [word for word in _WORD.findall(normalize(text or "")) if word not in STOP_WORDS]
+
+class SearchIndex:
+    """Index inversé sur le titre et la description des tâches d'un gestionnaire
+
+    Chaque terme de la requête est traité comme un préfixe (recherche dans
+    le vocabulaire trié par dichotomie) ; une tâche doit correspondre à
+    tous les termes. Le score somme, pour chaque mot trouvé, son poids
+    (titre/description) multiplié par son idf, les mots complets comptant
+    double par rapport aux simples préfixes.
+
+    follow=False construit un index ponctuel, non tenu à jour (stockage
+    paresseux, sans abonnement possible).
+    """
+    def __init__(self, manager, follow=True):
+        self._manager = manager
+        # mot -> {id: poids}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # id -> mots indexés (pour la désindexation)
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+        for task in manager.tasks:
+            self._index(task, keep_sorted=False)
+        # Tri unique en O(V log V) : insort par nouveau mot serait quadratique
+        # quand les titres portent des mots uniques (numéros, codes)
+        self._vocabulary: List[str] = sorted(self._postings)
+        if follow:
+            manager.subscribe(self)
+
+    def _index(self, task: Task, keep_sorted=True):
+        weights = Counter(tokenize(task.description))
+        for word in tokenize(task.title):
+            weights[word] += TITLE_WEIGHT
+        task_id = task.id
+        for word, weight in weights.items():
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                if keep_sorted:
+                    insort(self._vocabulary, word)
+            posting[task_id] = weight
+        self._documents[task_id] = tuple(weights)
+
+    def _unindex(self, task_id):
+        for word in self._documents.pop(task_id, ()):
+            posting = self._postings[word]
+            del posting[task_id]
+            if not posting:
+                del self._postings[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+
+    def task_added(self, task):
+        self._index(task)
+
+    def task_removed(self, task):
+        self._unindex(task.id)
+
+    def task_changed(self, task, field, old, new):
+        if field in ('title', 'description'):
+            self._unindex(task.id)
+            self._index(task)
+
+    def _expand(self, term) -> List[str]:
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + '\U0010ffff', start)
+        return self._vocabulary[start:end]
+
+    def _factors(self, term) -> List[Tuple[Dict[str, int], float]]:
+        """(postings, facteur) de chaque mot commençant par term"""
+        total = len(self._documents) or 1
+        factors = []
+        for word in self._expand(term):
+            posting = self._postings[word]
+            factors.append((posting, math.log(1 + total / len(posting)) * (2.0 if word == term else 1.0)))
+        return factors
+
+    def search(self, query, status: Optional[Status] = None, priority: Optional[Priority] = None,
+               limit=20) -> List[Task]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        # Le terme le moins fréquent fournit les candidats, les autres ne sont
+        # consultés que pour ces candidats
+        per_term = sorted((self._factors(term) for term in terms),
+                          key=lambda factors: sum(len(posting) for posting, _ in factors))
+        scores: Dict[str, float] = {}
+        for posting, factor in per_term[0]:
+            for task_id, weight in posting.items():
+                scores[task_id] = scores.get(task_id, 0.0) + weight * factor
+        for factors in per_term[1:]:
+            narrowed = {}
+            for task_id, score in scores.items():
+                extra = 0.0
+                for posting, factor in factors:
+                    weight = posting.get(task_id)
+                    if weight:
+                        extra += weight * factor
+                if extra:
+                    narrowed[task_id] = score + extra
+            scores = narrowed
+            if not scores:
+                return []
+        get_task = self._manager.get_task
+
+        def matches():
+            for task_id, score in scores.items():
+                task = get_task(task_id)
+                if status is not None and task.status != status:
+                    continue
+                if priority is not None and task.priority != priority:
+                    continue
+                yield score, task_id, task
+
+        best = heapq.nlargest(limit, matches(), key=lambda match: (match[0], match[1]))
+        return [task for _, _, task in best]
@@ -1,55 +1,316 @@
+import asyncio
 import smtplib
-from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from email.message import EmailMessage
+from itertools import islice
+from typing import Any, Dict, List, NamedTuple, Optional
 import csv
+import gzip
+import io
+from .metrics import instrumented
+from .task import FIELDS, Priority, Status, Task, from_epoch
+
+def _is_valid_email(email):
+    return isinstance(email, str) and '@' in email
+
+class SendResult(NamedTuple):
+    """Résultat de l'envoi d'un message d'un lot"""
+    email: Any
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+
+class SmtpTransport:
+    """Connexion SMTP (smtplib) ouverte au premier envoi puis réutilisée"""
+    def __init__(self, smtp_server, port, sender="noreply@task-manager.local",
+                 username=None, password=None, use_tls=True, timeout=30):
+        self.smtp_server = smtp_server
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp = None
+
+    def send(self, email, subject, body):
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.smtp_server, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = email
+        message['Subject'] = subject
+        message.set_content(body)
+        try:
+            self._smtp.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Connexion perdue : la prochaine tentative en rouvrira une
+            self._smtp = None
+            raise
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
 
 class EmailService:
     """Service d'envoi d'emails (à mocker dans les tests)"""
-    def __init__(self, smtp_server="smtp.gmail.com", port=587):
+    def __init__(self, smtp_server="smtp.gmail.com", port=587, transport_factory=None):
         self.smtp_server = smtp_server
         self.port = port
+        # Fabrique de transports pour les envois en lot (un transport par worker)
+        self.transport_factory = transport_factory or (lambda: SmtpTransport(self.smtp_server, self.port))
 
     def send_task_reminder(self, email, task_title, due_date):
-        if not isinstance(email, str) or '@' not in email:
+        if not _is_valid_email(email):
             raise ValueError("Email invalide")
         # Simulation d'envoi (pas de vrai SMTP ici)
         print(f"[SIMULATION] Rappel envoyé à {email} pour la tâche '{task_title}' avant le {due_date}")
         return True
 
     def send_completion_notification(self, email, task_title):
-        if not isinstance(email, str) or '@' not in email:
+        if not _is_valid_email(email):
             raise ValueError("Email invalide")
         print(f"[SIMULATION] Notification de complétion envoyée à {email} pour la tâche '{task_title}'")
         return True
 
+    def send_reminders(self, batch, concurrency=10, retries=3, backoff=0.1) -> List[SendResult]:
+        """Envoie un lot de rappels (email, titre, échéance) ; voir send_reminders_async"""
+        return asyncio.run(self.send_reminders_async(batch, concurrency, retries, backoff))
+
+    async def send_reminders_async(self, batch, concurrency=10, retries=3, backoff=0.1) -> List[SendResult]:
+        """Envoie un lot de rappels avec au plus `concurrency` envois simultanés
+
+        Chaque worker garde son propre transport (une connexion réutilisée).
+        Un envoi en échec est retenté jusqu'à `retries` fois avec un délai
+        exponentiel (backoff, 2*backoff, ...). Retourne un SendResult par
+        élément, dans l'ordre du lot.
+        """
+        messages = [
+            (email, f"Rappel : {title}", f"La tâche '{title}' est à terminer avant le {due_date}.")
+            for email, title, due_date in batch
+        ]
+        return await self._send_batch(messages, concurrency, retries, backoff)
+
+    async def _send_batch(self, messages, concurrency, retries, backoff):
+        results: List[Optional[SendResult]] = [None] * len(messages)
+        queue: asyncio.Queue = asyncio.Queue()
+        valid: Dict[Any, bool] = {}
+        for index, message in enumerate(messages):
+            email = message[0]
+            if email not in valid:
+                valid[email] = _is_valid_email(email)
+            if valid[email]:
+                queue.put_nowait((index, message))
+            else:
+                results[index] = SendResult(email, False, 0, "Email invalide")
+        workers = max(1, min(concurrency, queue.qsize()))
+        # Les transports bloquants (smtplib) tournent sur un thread par worker
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            await asyncio.gather(*(
+                self._send_worker(queue, results, executor, retries, backoff) for _ in range(workers)
+            ))
+        finally:
+            executor.shutdown(wait=False)
+        return results
+
+    async def _send_worker(self, queue, results, executor, retries, backoff):
+        loop = asyncio.get_running_loop()
+        transport = self.transport_factory()
+        is_async = asyncio.iscoroutinefunction(transport.send)
+        try:
+            while not queue.empty():
+                index, (email, subject, body) = queue.get_nowait()
+                attempts = 0
+                while True:
+                    attempts += 1
+                    try:
+                        if is_async:
+                            await transport.send(email, subject, body)
+                        else:
+                            await loop.run_in_executor(executor, transport.send, email, subject, body)
+                        results[index] = SendResult(email, True, attempts)
+                        break
+                    except Exception as e:
+                        if attempts > retries:
+                            results[index] = SendResult(email, False, attempts, str(e))
+                            break
+                        await asyncio.sleep(backoff * 2 ** (attempts - 1))
+        finally:
+            close = getattr(transport, 'close', None)
+            if close is not None:
+                if asyncio.iscoroutinefunction(close):
+                    await close()
+                else:
+                    await loop.run_in_executor(executor, close)
+
+class DailyReportEngine:
+    """Agrégats par jour de création, mis à jour de façon incrémentale
+
+    S'abonne à un TaskManager (task_added / task_removed / task_changed) :
+    un rapport journalier coûte O(1) et un rapport sur une période
+    O(nombre de jours), sans reparcourir les tâches.
+    """
+    def __init__(self, tasks=()):
+        # jour -> agrégats ; _days garde les jours présents triés
+        self._aggregates: Dict[date, dict] = {}
+        self._days: List[date] = []
+        for task in tasks:
+            self.task_added(task)
+
+    @staticmethod
+    def _empty():
+        return {
+            'total_tasks': 0,
+            'tasks_by_priority': {p.name: 0 for p in Priority},
+            'tasks_by_status': {s.name: 0 for s in Status}
+        }
+
+    def _bucket(self, day):
+        bucket = self._aggregates.get(day)
+        if bucket is None:
+            bucket = self._aggregates[day] = self._empty()
+            insort(self._days, day)
+        return bucket
+
+    def _apply(self, day, priority, status, delta):
+        bucket = self._bucket(day)
+        bucket['total_tasks'] += delta
+        bucket['tasks_by_priority'][priority.name] += delta
+        bucket['tasks_by_status'][status.name] += delta
+        if bucket['total_tasks'] == 0:
+            del self._aggregates[day]
+            del self._days[bisect_left(self._days, day)]
+
+    def task_added(self, task):
+        self._apply(task.created_at.date(), task.priority, task.status, 1)
+
+    def task_removed(self, task):
+        self._apply(task.created_at.date(), task.priority, task.status, -1)
+
+    def task_changed(self, task, field, old, new):
+        if field == 'created_at':
+            self._apply(from_epoch(old).date(), task.priority, task.status, -1)
+            self._apply(from_epoch(new).date(), task.priority, task.status, 1)
+        elif field in ('priority', 'status'):
+            counts = self._bucket(task.created_at.date())['tasks_by_' + field]
+            counts[old.name] -= 1
+            counts[new.name] += 1
+
+    @staticmethod
+    def _report(aggregate):
+        return {
+            'total_tasks': aggregate['total_tasks'],
+            'completed_tasks': aggregate['tasks_by_status'][Status.DONE.name],
+            'tasks_by_priority': dict(aggregate['tasks_by_priority']),
+            'tasks_by_status': dict(aggregate['tasks_by_status'])
+        }
+
+    def report(self, day):
+        report = {'date': str(day)}
+        report.update(self._report(self._aggregates.get(day) or self._empty()))
+        return report
+
+    def range_report(self, start, end):
+        """Cumul des jours start..end inclus, avec le total de chaque jour"""
+        total = self._empty()
+        days = {}
+        for day in self._days[bisect_left(self._days, start):bisect_right(self._days, end)]:
+            aggregate = self._aggregates[day]
+            days[str(day)] = aggregate['total_tasks']
+            total['total_tasks'] += aggregate['total_tasks']
+            for key in ('tasks_by_priority', 'tasks_by_status'):
+                for name, count in aggregate[key].items():
+                    total[key][name] += count
+        report = {'start': str(start), 'end': str(end)}
+        report.update(self._report(total))
+        report['days'] = days
+        return report
+
 class ReportService:
     """Service de génération de rapports"""
-    def generate_daily_report(self, tasks, date=None):
+    def __init__(self, manager=None):
+        # Avec un gestionnaire, les rapports sont servis par un moteur incrémental
+        self.engine: Optional[DailyReportEngine] = None
+        if manager is not None:
+            self.engine = DailyReportEngine(manager.tasks)
+            manager.subscribe(self.engine)
+
+    @staticmethod
+    def _as_date(value):
+        return value.date() if isinstance(value, datetime) else value
+
+    def _engine_for(self, tasks):
+        if tasks is not None:
+            return DailyReportEngine(tasks)
+        if self.engine is None:
+            raise ValueError("Aucune tâche fournie et aucun gestionnaire associé.")
+        return self.engine
+
+    @instrumented()
+    def generate_daily_report(self, tasks=None, date=None):
         if date is None:
             date = datetime.now().date()
         else:
-            date = date.date() if isinstance(date, datetime) else date
-        tasks_today = [t for t in tasks if t.created_at.date() == date]
-        report = {
-            'date': str(date),
-            'total_tasks': len(tasks_today),
-            'completed_tasks': len([t for t in tasks_today if t.status.name == 'DONE']),
-            'tasks_by_priority': {},
-            'tasks_by_status': {}
-        }
-        from src.task_manager.task import Priority, Status
-        for priority in Priority:
-            report['tasks_by_priority'][priority.name] = len([t for t in tasks_today if t.priority == priority])
-        for status in Status:
-            report['tasks_by_status'][status.name] = len([t for t in tasks_today if t.status == status])
-        return report
+            date = self._as_date(date)
+        if tasks is None:
+            return self._engine_for(None).report(date)
+        get_tasks_between = getattr(tasks, 'get_tasks_between', None)
+        if get_tasks_between is not None:
+            # Gestionnaire : index trié sur created_at, sans filtrage complet
+            tasks_today = get_tasks_between('created_at', date, date + timedelta(days=1))
+        else:
+            # Une seule passe, limitée aux tâches du jour
+            tasks_today = (t for t in tasks if t.created_at.date() == date)
+        return DailyReportEngine(tasks_today).report(date)
+
+    def generate_range_report(self, start, end, tasks=None):
+        return self._engine_for(tasks).range_report(self._as_date(start), self._as_date(end))
 
-    def export_tasks_csv(self, tasks, filename):
+    @instrumented()
+    def export_tasks_csv(self, tasks, filename, compress=False, chunk_size=10_000):
+        """Exporte en CSV un itérable (ou générateur) de tâches, en flux
+
+        filename est un nom de fichier ou un flux ouvert (texte, ou binaire
+        si compress=True pour une sortie gzip). Les lignes sont écrites par
+        paquets de chunk_size : la mémoire utilisée ne dépend pas du nombre
+        de tâches. Retourne le nombre de lignes exportées.
+        """
         try:
+            if hasattr(filename, 'write'):
+                if compress:
+                    with gzip.GzipFile(fileobj=filename, mode='wb') as gz:
+                        with io.TextIOWrapper(gz, encoding='utf-8', newline='') as stream:
+                            return self._write_csv(tasks, stream, chunk_size)
+                return self._write_csv(tasks, filename, chunk_size)
+            if compress:
+                with gzip.open(filename, 'wt', newline='', encoding='utf-8') as csvfile:
+                    return self._write_csv(tasks, csvfile, chunk_size)
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['id', 'title', 'description', 'priority', 'created_at', 'status', 'project_id', 'completed_at']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for task in tasks:
-                    writer.writerow(task.to_dict())
+                return self._write_csv(tasks, csvfile, chunk_size)
         except Exception as e:
             raise IOError(f"Erreur lors de l'export CSV : {e}")
+
+    @staticmethod
+    def _write_csv(tasks, stream, chunk_size):
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        rows = map(Task.to_row, tasks)
+        count = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return count
+            writer.writerows(chunk)
+            count += len(chunk)
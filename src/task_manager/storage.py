@@ -0,0 +1,782 @@
+import json
+import math
+import mmap
+import os
+import sqlite3
+import stat
+import struct
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .task import Task, Priority, Status, from_epoch
+
+# Masque de création des fichiers (lu une fois : os.umask le modifie)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path, encoding='utf-8', mode='w'):
+    """Écrit dans un fichier temporaire, fsync puis le renomme sur path
+
+    Un arrêt brutal en cours d'écriture laisse l'ancien fichier intact.
+    Chaque écriture a son propre fichier temporaire : deux sauvegardes
+    simultanées (ex: arrière-plan et save_to_file) ne se mélangent pas,
+    la dernière renommée l'emporte. mode='wb' pour une écriture binaire.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp crée le fichier en 0600 : on garde les droits du fichier
+        # remplacé, ou ceux d'un nouveau fichier s'il n'existe pas encore
+        try:
+            mode_bits = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode_bits = 0o666 & ~_UMASK
+        os.chmod(tmp, mode_bits)
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory):
+    # Rend le renommage durable (POSIX uniquement)
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Storage:
+    """Interface commune des moteurs de stockage de TaskManager
+
+    Un stockage « complet » (lazy = False) rend toutes ses tâches au
+    chargement et TaskManager les garde en mémoire. Un stockage paresseux
+    (lazy = True) répond lui-même aux requêtes via get/find/count/statistics
+    et TaskManager ne charge que les tâches demandées.
+
+    Les tâches d'un stockage paresseux ne sont pas toutes en mémoire : on
+    ne peut pas s'abonner à leurs changements (TaskManager.subscribe lève
+    TypeError), donc pas de ReportService(manager), de journal des
+    changements ni de ConcurrentTaskManager ; load_shards est refusé de
+    même. Recherche, file de travail, plages de dates et projets sont
+    servis par un parcours du stockage.
+    """
+    lazy = False
+    # Sauvegarde complète possible depuis un autre thread (BackgroundSaver)
+    supports_background = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, path=None) -> Iterable[Task]:
+        raise NotImplementedError
+
+    def save(self, tasks: Iterable[Task], path=None):
+        raise NotImplementedError
+
+    def append(self, tasks: Iterable[Task] = (), deleted_ids: Iterable[str] = ()):
+        """Écriture incrémentale des changements (ignorée par défaut)"""
+
+    def needs_compaction(self, live_count) -> bool:
+        return False
+
+    def flush(self):
+        """Force l'écriture des changements en attente"""
+
+    def close(self):
+        self.flush()
+
+
+class JsonStorage(Storage):
+    """Fichier JSON unique réécrit (atomiquement) à chaque sauvegarde"""
+    supports_background = True
+
+    def load(self, path=None) -> List[Task]:
+        with open(path or self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return Task.from_dicts(data)
+
+    def save(self, tasks: Iterable[Task], path=None):
+        with atomic_write(path or self.path) as f:
+            json.dump([task.to_dict() for task in tasks], f, ensure_ascii=False, indent=2)
+
+
+class JsonLinesStorage(Storage):
+    """Stockage JSON Lines en ajout seul
+
+    Chaque création ou modification ajoute une ligne contenant la tâche
+    complète, chaque suppression une ligne {"id": ..., "deleted": true}.
+    Au chargement la dernière ligne d'un id l'emporte. Le fichier est
+    compacté (réécrit avec les seules tâches vivantes) quand il contient
+    trop de lignes obsolètes.
+    """
+    def __init__(self, path="tasks.jsonl", compact_ratio=2.0, min_records=1000):
+        super().__init__(path)
+        self.compact_ratio = compact_ratio
+        self.min_records = min_records
+        self._records = 0
+        self._handle = None
+
+    def load(self, path=None) -> List[Task]:
+        """Rejoue le fichier ; une dernière ligne coupée (arrêt brutal) est ignorée
+
+        Sur le fichier du stockage, la ligne coupée est tronquée pour que
+        les ajouts suivants commencent sur une ligne neuve.
+        """
+        fname = path or self.path
+        tasks: Dict[str, Task] = {}
+        records = 0
+        # Fin du dernier enregistrement lisible, dernière ligne lue
+        valid_end = 0
+        line = b'\n'
+        torn = False
+        with open(fname, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Seule une ligne finale sans fin de ligne peut être coupée
+                        if line.endswith(b'\n'):
+                            raise
+                        torn = True
+                        break
+                    records += 1
+                    if record.get('deleted'):
+                        tasks.pop(record['id'], None)
+                    else:
+                        task = Task.from_dict(record)
+                        tasks[task.id] = task
+                valid_end += len(line)
+        if fname == self.path:
+            self._records = records
+            self._repair(valid_end, torn, line.endswith(b'\n'))
+        return list(tasks.values())
+
+    def _repair(self, valid_end, torn, terminated):
+        if torn:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+        elif not terminated:
+            with open(self.path, 'ab') as f:
+                f.write(b'\n')
+
+    def save(self, tasks: Iterable[Task], path=None):
+        """Réécrit le fichier avec l'état courant (compactage)"""
+        fname = path or self.path
+        if fname == self.path:
+            self.close()
+        records = 0
+        with atomic_write(fname) as f:
+            for task in tasks:
+                f.write(self._encode(task.to_dict()))
+                records += 1
+        if fname == self.path:
+            self._records = records
+
+    def append(self, tasks: Iterable[Task] = (), deleted_ids: Iterable[str] = ()):
+        """Ajoute en fin de fichier les tâches créées/modifiées et les suppressions"""
+        lines = [self._encode(task.to_dict()) for task in tasks]
+        lines.extend(self._encode({'id': task_id, 'deleted': True}) for task_id in deleted_ids)
+        if not lines:
+            return
+        if self._handle is None:
+            self._handle = open(self.path, 'a', encoding='utf-8')
+        self._handle.write(''.join(lines))
+        self._handle.flush()
+        self._records += len(lines)
+
+    def needs_compaction(self, live_count) -> bool:
+        return self._records > max(self.min_records, self.compact_ratio * live_count)
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.flush()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    @staticmethod
+    def _encode(record) -> str:
+        return json.dumps(record, ensure_ascii=False) + '\n'
+
+
+class BackgroundSaver:
+    """Exécute des sauvegardes sur un thread de travail
+
+    request() ne fait que signaler qu'une sauvegarde est due : les demandes
+    reçues pendant l'attente (delay) ou pendant une écriture sont regroupées
+    en une seule écriture suivante.
+    """
+    def __init__(self, save, delay=0.0):
+        self._save = save
+        self.delay = delay
+        self.requests = 0
+        self.writes = 0
+        self.last_error: Optional[BaseException] = None
+        self._pending = False
+        self._writing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="task-manager-save", daemon=True)
+        self._thread.start()
+
+    def request(self):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BackgroundSaver fermé")
+            self.requests += 1
+            self._pending = True
+            self._cond.notify_all()
+
+    def wait(self, timeout=None) -> bool:
+        """Attend que toutes les demandes aient été écrites"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+            if self.delay:
+                # Laisse les demandes d'une même rafale s'accumuler
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, self.delay)
+            with self._cond:
+                self._pending = False
+                self._writing = True
+            try:
+                self._save()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self.writes += 1
+                    self._writing = False
+                    self._cond.notify_all()
+
+
+class SqliteStorage(Storage):
+    """Stockage SQLite (module sqlite3) avec requêtes indexées
+
+    En mode paresseux (par défaut) les tâches ne sont lues qu'à la demande.
+    Les écritures sont regroupées et validées par lots dans une transaction
+    (mode WAL), au plus tard avant chaque lecture.
+    """
+    COLUMNS = ('id', 'title', 'description', 'priority', 'created_at', 'status', 'project_id', 'completed_at')
+
+    def __init__(self, path="tasks.db", lazy=True, batch_size=500):
+        super().__init__(path)
+        self.lazy = lazy
+        self.batch_size = batch_size
+        # id -> tâche à écrire, ou None pour une suppression
+        self._pending: Dict[str, Optional[Task]] = {}
+        self._conn = self._connect(path)
+
+    def _connect(self, path):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, "
+                "priority TEXT NOT NULL, created_at TEXT NOT NULL, status TEXT NOT NULL, "
+                "project_id TEXT, completed_at TEXT)"
+            )
+            for column in ('status', 'priority', 'project_id'):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_tasks_{column} ON tasks({column})")
+        return conn
+
+    def load(self, path=None) -> List[Task]:
+        if path and path != self.path:
+            self.close()
+            self.path = path
+            self._conn = self._connect(path)
+        if self.lazy:
+            return []
+        return Task.from_dicts(self.find(), trusted=True)
+
+    def save(self, tasks: Iterable[Task], path=None):
+        """Remplace le contenu de la base par les tâches données"""
+        if path and path != self.path:
+            target = SqliteStorage(path, lazy=self.lazy, batch_size=self.batch_size)
+            try:
+                target.save(tasks)
+            finally:
+                target.close()
+            return
+        self._pending.clear()
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany(self._upsert_sql(), (self._row(task) for task in tasks))
+
+    def append(self, tasks: Iterable[Task] = (), deleted_ids: Iterable[str] = ()):
+        for task in tasks:
+            self._pending[task.id] = task
+        for task_id in deleted_ids:
+            self._pending[task_id] = None
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        with self._conn:
+            self._conn.executemany(
+                self._upsert_sql(),
+                (self._row(task) for task in pending.values() if task is not None)
+            )
+            self._conn.executemany(
+                "DELETE FROM tasks WHERE id = ?",
+                ((task_id,) for task_id, task in pending.items() if task is None)
+            )
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def get(self, task_id) -> Optional[Dict[str, Any]]:
+        self.flush()
+        row = self._conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def find(self, field=None, value=None) -> Iterator[Dict[str, Any]]:
+        """Enregistrements (ordre d'insertion), filtrés sur un champ indexé"""
+        self.flush()
+        if field is None:
+            cursor = self._conn.execute("SELECT * FROM tasks ORDER BY rowid")
+        elif field not in ('status', 'priority', 'project_id'):
+            raise ValueError(f"Champ non indexé : {field}")
+        elif value is None:
+            cursor = self._conn.execute(f"SELECT * FROM tasks WHERE {field} IS NULL ORDER BY rowid")
+        else:
+            value = value.name if isinstance(value, (Priority, Status)) else value
+            cursor = self._conn.execute(f"SELECT * FROM tasks WHERE {field} = ? ORDER BY rowid", (value,))
+        return (dict(row) for row in cursor)
+
+    def count(self) -> int:
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def statistics(self):
+        self.flush()
+        stats = {
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'tasks_by_priority': {p.name: 0 for p in Priority},
+            'tasks_by_status': {s.name: 0 for s in Status},
+            'tasks_by_project': {}
+        }
+        for status, count in self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            stats['tasks_by_status'][status] = count
+            stats['total_tasks'] += count
+        stats['completed_tasks'] = stats['tasks_by_status'][Status.DONE.name]
+        for priority, count in self._conn.execute("SELECT priority, COUNT(*) FROM tasks GROUP BY priority"):
+            stats['tasks_by_priority'][priority] = count
+        for project_id, count in self._conn.execute(
+                "SELECT project_id, COUNT(*) FROM tasks WHERE project_id IS NOT NULL GROUP BY project_id"):
+            stats['tasks_by_project'][project_id] = count
+        return stats
+
+    def _upsert_sql(self):
+        columns = ', '.join(self.COLUMNS)
+        updates = ', '.join(f"{c} = excluded.{c}" for c in self.COLUMNS[1:])
+        return (f"INSERT INTO tasks ({columns}) VALUES ({', '.join('?' * len(self.COLUMNS))}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}")
+
+    def _row(self, task: Task):
+        record = task.to_dict()
+        return tuple(record[c] for c in self.COLUMNS)
+
+
+# Format de BinarySnapshotStorage (entiers little-endian) :
+#   en-tête | projets (position, longueur) | enregistrements | index des ids triés | table des chaînes
+SNAPSHOT_MAGIC = b'TASKSNP1'
+# magic, nb d'enregistrements, nb de projets, positions des enregistrements, de l'index et des chaînes
+_HEADER = struct.Struct('<8sIIQQQ')
+# id, titre, description (position, longueur dans la table des chaînes), code projet,
+# priorité, statut, drapeaux, created_at, completed_at (secondes depuis EPOCH, NaN si absent)
+_RECORD = struct.Struct('<IIIIIIIBBBxdd')
+_STRING = struct.Struct('<II')
+_INDEX_ENTRY = struct.Struct('<I')
+# Colonnes lues sans décoder tout l'enregistrement (filtres, statistiques)
+_COLUMNS = {
+    'project_id': struct.Struct('<24xI20x'),
+    'priority': struct.Struct('<28xB19x'),
+    'status': struct.Struct('<29xB18x'),
+}
+_STATS_COLUMNS = struct.Struct('<24xIBB18x')
+# Longueur d'une chaîne None, code projet None
+_NONE = 0xFFFFFFFF
+# Drapeaux : horodatage avec fuseau (stocké en secondes depuis l'epoch UTC)
+_AWARE_CREATED = 1
+_AWARE_COMPLETED = 2
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_PRIORITIES = list(Priority)
+_STATUSES = list(Status)
+_PRIORITY_CODES = {p: code for code, p in enumerate(_PRIORITIES)}
+_STATUS_CODES = {s: code for code, s in enumerate(_STATUSES)}
+
+
+def _task_row(task: Task):
+    return (task.id, task._title, task._description, task._priority, task._status,
+            task._project_id, task._created_at, task._completed_at)
+
+
+def _to_seconds(value):
+    """Horodatage interne -> (secondes, avec fuseau)"""
+    if value is None:
+        return math.nan, False
+    if isinstance(value, float):
+        return value, False
+    return (value - _UTC_EPOCH).total_seconds(), True
+
+
+def _from_seconds(seconds, aware):
+    if math.isnan(seconds):
+        return None
+    return _UTC_EPOCH + timedelta(0, seconds) if aware else seconds
+
+
+def _write_snapshot(path, rows):
+    """Écrit atomiquement un instantané à partir de lignes _task_row"""
+    strings = bytearray()
+    interned: Dict[str, tuple] = {}
+
+    def intern(text):
+        if text is None:
+            return 0, _NONE
+        entry = interned.get(text)
+        if entry is None:
+            data = text.encode('utf-8')
+            entry = interned[text] = (len(strings), len(data))
+            strings.extend(data)
+        return entry
+
+    projects: Dict[str, int] = {}
+    ids = []
+    records = bytearray()
+    for task_id, title, description, priority, status, project_id, created_at, completed_at in rows:
+        created, created_aware = _to_seconds(created_at)
+        completed, completed_aware = _to_seconds(completed_at)
+        if project_id is None:
+            project = _NONE
+        else:
+            project = projects.setdefault(project_id, len(projects))
+        ids.append(task_id)
+        records += _RECORD.pack(
+            *intern(task_id), *intern(title), *intern(description), project,
+            _PRIORITY_CODES[priority], _STATUS_CODES[status],
+            _AWARE_CREATED * created_aware | _AWARE_COMPLETED * completed_aware,
+            created, completed
+        )
+    project_table = b''.join(_STRING.pack(*intern(project_id)) for project_id in projects)
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    records_offset = _HEADER.size + len(project_table)
+    index_offset = records_offset + len(records)
+    strings_offset = index_offset + _INDEX_ENTRY.size * len(ids)
+    with atomic_write(path, mode='wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(ids), len(projects), records_offset, index_offset, strings_offset))
+        f.write(project_table)
+        f.write(records)
+        f.write(struct.pack(f'<{len(order)}I', *order))
+        f.write(strings)
+
+
+class BinarySnapshotStorage(Storage):
+    """Instantané binaire projeté en mémoire (mmap), lu à la demande
+
+    Enregistrements de taille fixe, chaînes regroupées dans une table et
+    index des ids triés : l'ouverture ne lit que l'en-tête, get() est une
+    recherche dichotomique et les filtres ne lisent que la colonne utile.
+    Seuls les enregistrements demandés deviennent des tâches.
+
+    Les modifications sont gardées en mémoire et l'instantané n'est
+    réécrit qu'à flush()/close() (ou save_to_file()). Les horodatages avec
+    fuseau sont relus en UTC.
+    """
+    lazy = True
+
+    def __init__(self, path="tasks.snap"):
+        super().__init__(path)
+        self._file = None
+        self._mm = None
+        self._count = 0
+        self._projects: List[str] = []
+        self._project_codes: Dict[str, int] = {}
+        # Changements non écrits : index d'enregistrement -> tâche (None : supprimée)
+        self._modified: Dict[int, Optional[Task]] = {}
+        # Tâches absentes de l'instantané, dans l'ordre d'ajout
+        self._added: Dict[str, Task] = {}
+        self._open()
+
+    def _open(self):
+        self._unmap()
+        self._modified = {}
+        self._added = {}
+        self._count = 0
+        self._projects = []
+        self._project_codes = {}
+        if not os.path.exists(self.path):
+            return
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, self._count, project_count, self._records_offset,
+             self._index_offset, self._strings_offset) = _HEADER.unpack_from(self._mm)
+        except (ValueError, struct.error):
+            magic = None
+        if magic != SNAPSHOT_MAGIC:
+            self._unmap()
+            raise ValueError(f"Fichier d'instantané invalide : {self.path}")
+        self._projects = [self._string(*_STRING.unpack_from(self._mm, _HEADER.size + _STRING.size * code))
+                          for code in range(project_count)]
+        self._project_codes = {project_id: code for code, project_id in enumerate(self._projects)}
+
+    def _unmap(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _string(self, offset, length):
+        if length == _NONE:
+            return None
+        start = self._strings_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _record_id(self, index):
+        return self._string(*_STRING.unpack_from(self._mm, self._records_offset + _RECORD.size * index))
+
+    def _index_of(self, task_id) -> Optional[int]:
+        """Position de l'enregistrement task_id (dichotomie sur l'index trié)"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            index, = _INDEX_ENTRY.unpack_from(self._mm, self._index_offset + _INDEX_ENTRY.size * middle)
+            if self._record_id(index) < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            index, = _INDEX_ENTRY.unpack_from(self._mm, self._index_offset + _INDEX_ENTRY.size * low)
+            if self._record_id(index) == task_id:
+                return index
+        return None
+
+    def _row(self, index):
+        """Enregistrement -> ligne _task_row"""
+        (id_offset, id_length, title_offset, title_length, description_offset, description_length,
+         project, priority, status, flags, created, completed) = _RECORD.unpack_from(
+            self._mm, self._records_offset + _RECORD.size * index)
+        return (
+            self._string(id_offset, id_length),
+            self._string(title_offset, title_length),
+            self._string(description_offset, description_length),
+            _PRIORITIES[priority],
+            _STATUSES[status],
+            None if project == _NONE else self._projects[project],
+            _from_seconds(created, flags & _AWARE_CREATED),
+            _from_seconds(completed, flags & _AWARE_COMPLETED)
+        )
+
+    def _record(self, index) -> Dict[str, Any]:
+        """Enregistrement -> dict au format Task.to_dict"""
+        task_id, title, description, priority, status, project_id, created_at, completed_at = self._row(index)
+        return {
+            'id': task_id,
+            'title': title,
+            'description': description,
+            'priority': priority.name,
+            'created_at': from_epoch(created_at).isoformat(),
+            'status': status.name,
+            'project_id': project_id,
+            'completed_at': from_epoch(completed_at).isoformat() if completed_at is not None else None
+        }
+
+    def _records(self) -> bytes:
+        if self._mm is None:
+            return b''
+        return self._mm[self._records_offset:self._index_offset]
+
+    def _rows(self) -> Iterator[tuple]:
+        """État courant (instantané + changements), dans l'ordre d'insertion"""
+        modified = self._modified
+        for index in range(self._count):
+            if index in modified:
+                task = modified[index]
+                if task is not None:
+                    yield _task_row(task)
+            else:
+                yield self._row(index)
+        for task in list(self._added.values()):
+            yield _task_row(task)
+
+    def load(self, path=None) -> List[Task]:
+        """(Ré)ouvre l'instantané ; les changements non écrits sont abandonnés"""
+        self.path = path or self.path
+        self._open()
+        return []
+
+    def save(self, tasks: Iterable[Task], path=None):
+        target = path or self.path
+        _write_snapshot(target, (_task_row(task) for task in tasks))
+        if target == self.path:
+            self._open()
+
+    def append(self, tasks: Iterable[Task] = (), deleted_ids: Iterable[str] = ()):
+        for task in tasks:
+            index = None if task.id in self._added else self._index_of(task.id)
+            if index is None:
+                self._added[task.id] = task
+            else:
+                self._modified[index] = task
+        for task_id in deleted_ids:
+            if self._added.pop(task_id, None) is None:
+                index = self._index_of(task_id)
+                if index is not None:
+                    self._modified[index] = None
+
+    def flush(self):
+        """Réécrit l'instantané s'il y a des changements en attente"""
+        if not self._modified and not self._added:
+            return
+        _write_snapshot(self.path, self._rows())
+        self._open()
+
+    def close(self):
+        self.flush()
+        self._unmap()
+
+    def get(self, task_id) -> Optional[Dict[str, Any]]:
+        task = self._added.get(task_id)
+        if task is not None:
+            return task.to_dict()
+        index = self._index_of(task_id)
+        if index is None:
+            return None
+        if index in self._modified:
+            task = self._modified[index]
+            return task.to_dict() if task is not None else None
+        return self._record(index)
+
+    def find(self, field=None, value=None) -> Iterator[Dict[str, Any]]:
+        """Enregistrements (ordre d'insertion), filtrés sur un champ indexé"""
+        if field is None:
+            indices = range(self._count)
+        elif field not in _COLUMNS:
+            raise ValueError(f"Champ non indexé : {field}")
+        else:
+            indices = self._scan(field, value)
+            if self._modified:
+                indices = sorted(set(indices).union(self._modified))
+        return self._find(indices, field, value)
+
+    def _scan(self, field, value) -> List[int]:
+        """Positions des enregistrements dont la colonne field vaut value"""
+        if field == 'status':
+            code = _STATUS_CODES.get(value)
+        elif field == 'priority':
+            code = _PRIORITY_CODES.get(value)
+        else:
+            code = _NONE if value is None else self._project_codes.get(value)
+        if code is None:
+            return []
+        return [index for index, (column,) in enumerate(_COLUMNS[field].iter_unpack(self._records()))
+                if column == code]
+
+    def _find(self, indices, field, value):
+        modified = self._modified
+        for index in indices:
+            if index not in modified:
+                yield self._record(index)
+                continue
+            task = modified[index]
+            if task is not None and (field is None or getattr(task, field) == value):
+                yield task.to_dict()
+        for task in list(self._added.values()):
+            if field is None or getattr(task, field) == value:
+                yield task.to_dict()
+
+    def count(self) -> int:
+        deleted = sum(1 for task in self._modified.values() if task is None)
+        return self._count - deleted + len(self._added)
+
+    def statistics(self):
+        stats = {
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'tasks_by_priority': {p.name: 0 for p in Priority},
+            'tasks_by_status': {s.name: 0 for s in Status},
+            'tasks_by_project': {}
+        }
+
+        def add(project_id, priority, status, count):
+            stats['total_tasks'] += count
+            stats['tasks_by_priority'][priority.name] += count
+            stats['tasks_by_status'][status.name] += count
+            if project_id is not None:
+                stats['tasks_by_project'][project_id] = stats['tasks_by_project'].get(project_id, 0) + count
+
+        # Comptage des triplets (projet, priorité, statut) sans décoder les enregistrements
+        counts = Counter(_STATS_COLUMNS.iter_unpack(self._records()))
+        for index in self._modified:
+            counts[_STATS_COLUMNS.unpack_from(self._mm, self._records_offset + _RECORD.size * index)] -= 1
+        for (project, priority, status), count in counts.items():
+            if count:
+                add(None if project == _NONE else self._projects[project],
+                    _PRIORITIES[priority], _STATUSES[status], count)
+        for task in [*self._modified.values(), *self._added.values()]:
+            if task is not None:
+                add(task._project_id, task._priority, task._status, 1)
+        stats['completed_tasks'] = stats['tasks_by_status'][Status.DONE.name]
+        return stats
+
+
+def json_to_snapshot(json_path, snapshot_path) -> int:
+    """Convertit un fichier JSON (JsonStorage) en instantané binaire ; retourne le nombre de tâches"""
+    tasks = JsonStorage(json_path).load()
+    _write_snapshot(snapshot_path, (_task_row(task) for task in tasks))
+    return len(tasks)
+
+
+def snapshot_to_json(snapshot_path, json_path) -> int:
+    """Convertit un instantané binaire en fichier JSON (JsonStorage)"""
+    storage = BinarySnapshotStorage(snapshot_path)
+    try:
+        records = list(storage.find())
+    finally:
+        storage.close()
+    with atomic_write(json_path) as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    return len(records)
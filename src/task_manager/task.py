@@ -1,5 +1,7 @@
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 from enum import Enum
+from operator import attrgetter
 import time
 import uuid
 
@@ -15,25 +17,158 @@ class Status(Enum):
     DONE = 'DONE'
     CANCELLED = 'CANCELLED'
 
+# Les horodatages naïfs sont stockés en secondes depuis cette origine
+# (sans conversion de fuseau, l'aller-retour est exact à la microseconde)
+EPOCH = datetime(1970, 1, 1)
+
+def to_epoch(value):
+    """datetime -> secondes depuis EPOCH (les datetimes avec fuseau sont gardés tels quels)"""
+    if value is None or isinstance(value, float) or value.tzinfo is not None:
+        return value
+    return (value - EPOCH).total_seconds()
+
+def from_epoch(value):
+    """Inverse de to_epoch"""
+    if type(value) is float:
+        return EPOCH + timedelta(0, value)
+    return value
+
+def epoch_key(value):
+    """Clé de tri numérique d'un horodatage interne (float ou datetime avec fuseau)"""
+    if value is None or isinstance(value, float):
+        return value
+    return to_epoch(value.astimezone().replace(tzinfo=None))
+
+def _tracked(field):
+    """Propriété dont les modifications sont signalées au gestionnaire propriétaire"""
+    def setter(self, value):
+        self._set_field(field, value)
+    return property(attrgetter('_' + field), setter)
+
+def _timestamp(field):
+    """Propriété datetime stockée en secondes (to_epoch), convertie à la lecture"""
+    attr = '_' + field
+    def getter(self):
+        return from_epoch(getattr(self, attr))
+    def setter(self, value):
+        self._set_field(field, to_epoch(value))
+    return property(getter, setter)
+
+# Champs sérialisés, dans l'ordre de to_dict / to_row
+FIELDS = ('id', 'title', 'description', 'priority', 'created_at', 'status', 'project_id', 'completed_at')
+
 class Task:
     """Une tâche avec toutes ses propriétés"""
+    __slots__ = ('_manager', '_id', '_title', '_description', '_priority', '_created_at',
+                 '_status', '_project_id', '_completed_at', '__weakref__')
+
+    # Représentation interne des identifiants uuid : 'str', 'int' (128 bits) ou 'bytes'
+    id_format = 'str'
+
     def __init__(self, title, description="", priority=Priority.MEDIUM):
         if not title or not isinstance(title, str):
             raise ValueError("Le titre de la tâche ne peut pas être vide.")
         if not isinstance(priority, Priority):
             raise ValueError("La priorité doit être une instance de Priority.")
-        self.id = str(uuid.uuid4())
-        self.title = title
-        self.description = description
-        self.priority = priority
-        self.created_at = datetime.now()
-        self.status = Status.TODO
-        self.project_id = None
-        self.completed_at = None
+        # Gestionnaire propriétaire, prévenu de chaque modification
+        self._manager = None
+        self._id = self._encode_id(uuid.uuid4())
+        self._title = title
+        self._description = description
+        self._priority = priority
+        self._created_at = to_epoch(datetime.now())
+        self._status = Status.TODO
+        self._project_id = None
+        self._completed_at = None
+
+    title = _tracked('title')
+    description = _tracked('description')
+    priority = _tracked('priority')
+    created_at = _timestamp('created_at')
+    status = _tracked('status')
+    project_id = _tracked('project_id')
+    completed_at = _timestamp('completed_at')
+
+    @classmethod
+    def _encode_id(cls, value):
+        if isinstance(value, str):
+            if cls.id_format == 'str':
+                return value
+            try:
+                parsed = uuid.UUID(value)
+            except ValueError:
+                return value
+            # Seule la forme canonique est compactée : l'id relu doit être identique
+            if str(parsed) != value:
+                return value
+            value = parsed
+        elif cls.id_format == 'str':
+            return str(value)
+        return value.int if cls.id_format == 'int' else value.bytes
+
+    @property
+    def id(self):
+        value = self._id
+        if isinstance(value, str):
+            return value
+        if isinstance(value, int):
+            return str(uuid.UUID(int=value))
+        return str(uuid.UUID(bytes=value))
+
+    @id.setter
+    def id(self, value):
+        # L'id est la clé de la tâche dans son gestionnaire (index, stockage)
+        if self._manager is not None:
+            raise ValueError("Impossible de changer l'id d'une tâche gérée par un gestionnaire.")
+        self._id = self._encode_id(value)
+
+    # Sérialisation pickle (pools de processus) : le gestionnaire n'est pas transmis
+    def __getstate__(self):
+        return (self._id, self._title, self._description, self._priority, self._created_at,
+                self._status, self._project_id, self._completed_at)
+
+    def __setstate__(self, state):
+        (self._id, self._title, self._description, self._priority, self._created_at,
+         self._status, self._project_id, self._completed_at) = state
+        self._manager = None
+
+    @classmethod
+    def _from_state(cls, state):
+        """Tâche détachée reconstruite depuis __getstate__ (copie, journal)"""
+        task = cls.__new__(cls)
+        task.__setstate__(state)
+        return task
+
+    def _write_lock(self):
+        """Verrou d'écriture du gestionnaire concurrent propriétaire, sinon sans effet"""
+        manager = self._manager
+        if manager is not None and manager._lock is not None:
+            return manager._lock.writing()
+        return nullcontext()
+
+    def _set_field(self, field, value):
+        manager = self._manager
+        if manager is not None and manager._lock is not None:
+            with manager._lock.writing():
+                self._store_field(field, value)
+        else:
+            self._store_field(field, value)
+
+    def _store_field(self, field, value):
+        old = getattr(self, '_' + field)
+        if old == value:
+            return
+        setattr(self, '_' + field, value)
+        if self._manager is not None:
+            self._manager._task_changed(self, field, old, value)
 
     def mark_completed(self):
-        self.status = Status.DONE
-        self.completed_at = datetime.now()
+        # La date d'abord : le changement de statut notifié voit la tâche complète.
+        # Les deux changements sont écrits en un seul enregistrement.
+        manager = self._manager
+        with self._write_lock(), (manager._batch() if manager is not None else nullcontext()):
+            self.completed_at = datetime.now()
+            self.status = Status.DONE
 
     def update_priority(self, new_priority):
         if not isinstance(new_priority, Priority):
@@ -43,6 +178,20 @@ class Task:
     def assign_to_project(self, project_id):
         self.project_id = project_id
 
+    def to_row(self):
+        """Valeurs dans l'ordre de FIELDS (export tabulaire, sans dict intermédiaire)"""
+        completed_at = self._completed_at
+        return (
+            self.id,
+            self._title,
+            self._description,
+            self._priority.name,
+            from_epoch(self._created_at).isoformat(),
+            self._status.name,
+            self._project_id,
+            from_epoch(completed_at).isoformat() if completed_at is not None else None
+        )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -57,15 +206,42 @@ class Task:
 
     @classmethod
     def from_dict(cls, data):
-        title = data.get('title')
-        description = data.get('description', "")
-        priority = Priority[data.get('priority', 'MEDIUM')]
-        task = cls(title, description, priority)
-        task.id = data.get('id', str(uuid.uuid4()))
-        task.created_at = datetime.fromisoformat(data['created_at']) if 'created_at' in data else datetime.now()
-        task.status = Status[data.get('status', 'TODO')]
-        task.project_id = data.get('project_id', None)
-        completed_at = data.get('completed_at')
-        if completed_at:
-            task.completed_at = datetime.fromisoformat(completed_at)
-        return task
+        return cls.from_dicts((data,))[0]
+
+    @classmethod
+    def from_dicts(cls, records, trusted=False):
+        """Désérialisation en lot d'enregistrements to_dict
+
+        Contourne __init__ (pas d'uuid ni de datetime.now() jetés) ; les
+        titres sont validés en une passe après construction, sauf si
+        trusted est vrai (données déjà validées, ex: notre propre fichier).
+        """
+        new = cls.__new__
+        priorities = Priority.__members__
+        statuses = Status.__members__
+        parse = datetime.fromisoformat
+        encode_id = None if cls.id_format == 'str' else cls._encode_id
+        tasks = []
+        append = tasks.append
+        for data in records:
+            task = new(cls)
+            task._manager = None
+            task_id = data.get('id')
+            if task_id is None:
+                task_id = str(uuid.uuid4())
+            task._id = task_id if encode_id is None else encode_id(task_id)
+            task._title = data.get('title')
+            task._description = data.get('description', "")
+            task._priority = priorities[data.get('priority', 'MEDIUM')]
+            created_at = data.get('created_at')
+            task._created_at = to_epoch(parse(created_at) if created_at else datetime.now())
+            task._status = statuses[data.get('status', 'TODO')]
+            task._project_id = data.get('project_id')
+            completed_at = data.get('completed_at')
+            task._completed_at = to_epoch(parse(completed_at)) if completed_at else None
+            append(task)
+        if not trusted:
+            for index, task in enumerate(tasks):
+                if not task._title or not isinstance(task._title, str):
+                    raise ValueError(f"Le titre de la tâche ne peut pas être vide (enregistrement {index}).")
+        return tasks
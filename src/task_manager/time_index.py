@@ -0,0 +1,93 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Tuple
+from .task import Task, epoch_key, to_epoch
+
+TIME_FIELDS = ('created_at', 'completed_at')
+
+class SortedTimeIndex:
+    """Horodatages triés (listes parallèles clés / ids) d'un champ de date
+
+    Les entrées de même clé sont rangées par id : l'ordre (clé, id) est
+    total, ce qui permet de reprendre un parcours après une entrée (curseur).
+    """
+    def __init__(self):
+        self._keys: List[float] = []
+        self._ids: List[str] = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, task_id):
+        if key is None:
+            return
+        # Cas courant : horodatage le plus récent, ajout en fin de liste
+        if not self._keys or (key, task_id) >= (self._keys[-1], self._ids[-1]):
+            self._keys.append(key)
+            self._ids.append(task_id)
+            return
+        position = bisect_right(self._keys, key)
+        while position and self._keys[position - 1] == key and self._ids[position - 1] > task_id:
+            position -= 1
+        self._keys.insert(position, key)
+        self._ids.insert(position, task_id)
+
+    def remove(self, key, task_id):
+        if key is None:
+            return
+        position = bisect_left(self._keys, key)
+        while self._ids[position] != task_id:
+            position += 1
+        del self._keys[position]
+        del self._ids[position]
+
+    def between(self, start=None, end=None) -> List[str]:
+        """Ids dont la clé est dans [start, end), par ordre chronologique"""
+        lo = 0 if start is None else bisect_left(self._keys, start)
+        hi = len(self._keys) if end is None else bisect_left(self._keys, end)
+        return self._ids[lo:hi]
+
+    def count_between(self, start=None, end=None) -> int:
+        lo = 0 if start is None else bisect_left(self._keys, start)
+        hi = len(self._keys) if end is None else bisect_left(self._keys, end)
+        return max(0, hi - lo)
+
+def as_key(value):
+    """datetime, date ou None -> clé de SortedTimeIndex"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return epoch_key(to_epoch(value))
+
+class TimeIndex:
+    """Index triés sur created_at et completed_at des tâches d'un gestionnaire"""
+    def __init__(self, manager):
+        self.indexes: Dict[str, SortedTimeIndex] = {field: SortedTimeIndex() for field in TIME_FIELDS}
+        entries: Dict[str, List[Tuple[float, str]]] = {field: [] for field in TIME_FIELDS}
+        for task in manager.tasks:
+            for field in TIME_FIELDS:
+                key = epoch_key(getattr(task, '_' + field))
+                if key is not None:
+                    entries[field].append((key, task.id))
+        # Construction initiale par tri plutôt que par insertions successives
+        for field, pairs in entries.items():
+            pairs.sort()
+            index = self.indexes[field]
+            index._keys = [key for key, _ in pairs]
+            index._ids = [task_id for _, task_id in pairs]
+        manager.subscribe(self)
+
+    def task_added(self, task: Task):
+        for field, index in self.indexes.items():
+            index.add(epoch_key(getattr(task, '_' + field)), task.id)
+
+    def task_removed(self, task: Task):
+        for field, index in self.indexes.items():
+            index.remove(epoch_key(getattr(task, '_' + field)), task.id)
+
+    def task_changed(self, task: Task, field, old, new):
+        index = self.indexes.get(field)
+        if index is not None:
+            index.remove(epoch_key(old), task.id)
+            index.add(epoch_key(new), task.id)
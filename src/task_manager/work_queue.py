@@ -0,0 +1,76 @@
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+from .task import Priority, Status, Task, epoch_key
+
+# Rang de priorité : le plus grand est servi en premier
+PRIORITY_RANK = {Priority.LOW: 0, Priority.MEDIUM: 1, Priority.HIGH: 2, Priority.URGENT: 3}
+
+def ready_key(task: Task) -> Tuple[int, float]:
+    """Ordre de service : priorité décroissante puis ancienneté"""
+    return -PRIORITY_RANK[task.priority], epoch_key(task._created_at)
+
+class ReadyQueue:
+    """File des tâches TODO, par priorité décroissante puis ancienneté
+
+    Tas binaire d'entrées (-rang, created_at, n°, id). Un changement de
+    priorité ajoute une nouvelle entrée en O(log n) ; les entrées devenues
+    obsolètes (tâche supprimée, terminée, repriorisée) sont écartées
+    paresseusement lorsqu'elles arrivent au sommet du tas.
+    """
+    def __init__(self, manager):
+        self._manager = manager
+        self._heap: List[Tuple[int, float, int, str]] = []
+        # id -> n° de l'entrée valide de la tâche
+        self._current: Dict[str, int] = {}
+        self._counter = count()
+        for task in manager.get_tasks_by_status(Status.TODO):
+            self._push(task)
+        manager.subscribe(self)
+
+    def __len__(self):
+        return len(self._current)
+
+    def _push(self, task: Task):
+        seq = next(self._counter)
+        self._current[task.id] = seq
+        heapq.heappush(self._heap, (*ready_key(task), seq, task.id))
+        # Trop d'entrées obsolètes : reconstruction en O(n)
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [entry for entry in self._heap if self._current.get(entry[3]) == entry[2]]
+            heapq.heapify(self._heap)
+
+    def _discard(self, task: Task):
+        self._current.pop(task.id, None)
+
+    def peek(self) -> Optional[Task]:
+        heap = self._heap
+        while heap:
+            _, _, seq, task_id = heap[0]
+            if self._current.get(task_id) == seq:
+                return self._manager.get_task(task_id)
+            heapq.heappop(heap)
+        return None
+
+    def pop(self) -> Optional[Task]:
+        """Retire la tâche la plus prioritaire et la passe IN_PROGRESS"""
+        task = self.peek()
+        if task is not None:
+            task.status = Status.IN_PROGRESS
+        return task
+
+    def task_added(self, task):
+        if task.status == Status.TODO:
+            self._push(task)
+
+    def task_removed(self, task):
+        self._discard(task)
+
+    def task_changed(self, task, field, old, new):
+        if field == 'status':
+            if new == Status.TODO:
+                self._push(task)
+            elif old == Status.TODO:
+                self._discard(task)
+        elif field in ('priority', 'created_at') and task.status == Status.TODO:
+            self._push(task)
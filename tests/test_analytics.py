@@ -0,0 +1,57 @@
+import pytest # type: ignore
+from datetime import datetime, timedelta
+from src.task_manager import analytics
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from src.task_manager.task import Priority
+
+@pytest.mark.unit
+class TestColumnarSnapshot:
+    """Tests des agrégations vectorisées (numpy)"""
+    def setup_method(self):
+        pytest.importorskip("numpy")
+        self.manager = TaskManager("test_tasks.json")
+        self.day = datetime(2024, 3, 4, 9, 0)
+        for i, priority in enumerate([Priority.LOW, Priority.HIGH, Priority.HIGH, Priority.URGENT]):
+            task = self.manager.get_task(self.manager.add_task(f"Tâche {i}", "", priority))
+            task.created_at = self.day + timedelta(hours=i)
+            task.assign_to_project("alpha" if i % 2 else "beta")
+        first, second = self.manager.tasks[:2]
+        first.mark_completed()
+        first.completed_at = first.created_at + timedelta(hours=2)
+        second.mark_completed()
+        second.completed_at = second.created_at + timedelta(hours=4)
+        self.snapshot = self.manager.columnar_snapshot()
+
+    def test_statistics_match_manager(self):
+        assert self.snapshot.statistics() == self.manager.get_statistics()
+
+    def test_counts(self):
+        assert self.snapshot.counts_by_status()['DONE'] == 2
+        assert self.snapshot.counts_by_priority() == {'LOW': 1, 'MEDIUM': 0, 'HIGH': 2, 'URGENT': 1}
+
+    def test_completion_rates(self):
+        assert self.snapshot.completion_rate() == 0.5
+        assert self.snapshot.completion_rate(by='project') == {'beta': 0.5, 'alpha': 0.5}
+        assert self.snapshot.completion_rate(by='priority') == {'LOW': 1.0, 'HIGH': 0.5, 'URGENT': 0.0}
+        with pytest.raises(ValueError):
+            self.snapshot.completion_rate(by='title')
+
+    def test_lead_time_percentiles(self):
+        assert self.snapshot.lead_time_percentiles((0, 50, 100)) == {0: 7200.0, 50: 10800.0, 100: 14400.0}
+
+    def test_daily_report_matches_service(self):
+        expected = ReportService().generate_daily_report(self.manager, self.day)
+        assert self.snapshot.daily_report(self.day.date()) == expected
+
+    def test_empty_manager(self):
+        snapshot = TaskManager("test_tasks.json").columnar_snapshot()
+        assert len(snapshot) == 0
+        assert snapshot.completion_rate() == 0.0
+        assert snapshot.lead_time_percentiles((50,)) == {50: None}
+
+@pytest.mark.unit
+def test_snapshot_requires_numpy(monkeypatch):
+    monkeypatch.setattr(analytics, 'np', None)
+    with pytest.raises(ImportError):
+        TaskManager("test_tasks.json").columnar_snapshot()
@@ -0,0 +1,262 @@
+import pytest # type: ignore
+import random
+import threading
+import time
+from src.task_manager.concurrency import ConcurrentTaskManager, ReadWriteLock
+from src.task_manager.manager import TaskManager
+from src.task_manager.storage import JsonLinesStorage, SqliteStorage
+from src.task_manager.task import Priority, Status
+
+@pytest.mark.unit
+class TestReadWriteLock:
+    """Tests du verrou lecteurs/rédacteur"""
+    def test_readers_run_concurrently(self):
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.reading():
+                barrier.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def read():
+            with lock.reading():
+                entered.set()
+
+        with lock.writing():
+            thread = threading.Thread(target=read)
+            thread.start()
+            assert not entered.wait(0.1)
+            with lock.writing(), lock.reading():
+                pass
+        thread.join()
+        assert entered.is_set()
+
+    def test_waiting_readers_pass_before_next_writer(self):
+        lock = ReadWriteLock()
+        order = []
+        reading = threading.Event()
+
+        def read():
+            with lock.reading():
+                order.append('lecture')
+                reading.set()
+                time.sleep(0.05)
+
+        def write():
+            with lock.writing():
+                order.append('écriture')
+
+        with lock.writing():
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.05)
+            assert lock._waiting_writers == 1 and lock._waiting_readers == 1
+        reader.join()
+        writer.join()
+        assert order == ['lecture', 'écriture']
+
+    def test_upgrade_is_refused(self):
+        lock = ReadWriteLock()
+        with lock.reading():
+            with pytest.raises(RuntimeError):
+                with lock.writing():
+                    pass
+
+@pytest.mark.unit
+class TestConcurrentTaskManager:
+    """Tests du gestionnaire partagé entre threads"""
+    def test_lazy_storage_is_rejected(self, tmp_path):
+        with pytest.raises(TypeError):
+            ConcurrentTaskManager(storage=SqliteStorage(str(tmp_path / "tasks.db")))
+
+    def test_task_setters_take_write_lock(self):
+        manager = ConcurrentTaskManager("test_tasks.json")
+        task = manager.get_task(manager.add_task("A"))
+        done = threading.Event()
+
+        def complete():
+            task.mark_completed()
+            done.set()
+
+        with manager._lock.reading():
+            thread = threading.Thread(target=complete)
+            thread.start()
+            assert not done.wait(0.1)
+            assert task.status == Status.TODO
+        thread.join()
+        assert manager.get_statistics()['completed_tasks'] == 1
+
+    def test_readers_are_not_starved_by_steady_writes(self):
+        manager = ConcurrentTaskManager("test_tasks.json")
+        stop = threading.Event()
+        latencies = []
+
+        def write():
+            while not stop.is_set():
+                manager.add_task("T")
+
+        def read():
+            deadline = time.perf_counter() + 1.0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                manager.get_statistics()
+                latencies.append(time.perf_counter() - start)
+
+        writers = [threading.Thread(target=write) for _ in range(2)]
+        reader = threading.Thread(target=read)
+        for thread in writers + [reader]:
+            thread.start()
+        # Lecteur affamé : les rédacteurs sont arrêtés au bout de 5 s au plus
+        reader.join(5)
+        stop.set()
+        for thread in writers + [reader]:
+            thread.join()
+        assert len(latencies) > 10
+        assert max(latencies) < 0.25
+
+    def test_json_lines_save_during_writes(self, tmp_path):
+        path = str(tmp_path / "tasks.jsonl")
+        manager = ConcurrentTaskManager(storage=JsonLinesStorage(path))
+        manager.add_tasks(f"Tâche {i}" for i in range(5000))
+        errors = []
+        stop = threading.Event()
+
+        def write():
+            try:
+                i = 0
+                while not stop.is_set() or i < 200:
+                    task = manager.get_task(manager.add_task(f"Nouvelle {i}"))
+                    task.update_priority(Priority.HIGH)
+                    i += 1
+            except Exception as e:
+                errors.append(e)
+
+        writers = [threading.Thread(target=write) for _ in range(2)]
+        for thread in writers:
+            thread.start()
+        for _ in range(5):
+            manager.save_to_file()
+        stop.set()
+        for thread in writers:
+            thread.join()
+        assert errors == []
+        manager.close()
+        reloaded = TaskManager(storage=JsonLinesStorage(path))
+        reloaded.load_from_file()
+        assert reloaded.get_statistics() == manager.get_statistics()
+
+    def test_sync_from_concurrent_source_during_writes(self):
+        source = ConcurrentTaskManager("test_tasks.json")
+        source.journal.max_entries = 50
+        replica = TaskManager("replica.json")
+        stop = threading.Event()
+        errors = []
+
+        def write():
+            rng = random.Random(1)
+            try:
+                while not stop.is_set():
+                    task = source.get_task(source.add_task("T", priority=rng.choice(list(Priority))))
+                    task.assign_to_project(f"p{rng.randrange(3)}")
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(200):
+                replica.sync_from(source)
+        finally:
+            stop.set()
+            writer.join()
+        replica.sync_from(source)
+        assert errors == []
+        assert [t.to_dict() for t in replica.tasks] == [t.to_dict() for t in source.tasks]
+        assert replica.applied_seq == source.journal.seq
+
+    def test_sync_from_reads_source_under_its_lock(self):
+        source = ConcurrentTaskManager("test_tasks.json")
+        source.add_task("A")
+        replica = TaskManager("replica.json")
+        for _ in range(2):  # copie complète, puis changements incrémentaux
+            done = threading.Event()
+            thread = threading.Thread(target=lambda: (replica.sync_from(source), done.set()))
+            with source._lock.writing():
+                source.add_task("B")
+                thread.start()
+                assert not done.wait(0.1)
+            thread.join()
+            assert [t.id for t in replica.tasks] == [t.id for t in source.tasks]
+
+    def test_save_uses_detached_copies(self, tmp_path):
+        manager = ConcurrentTaskManager(str(tmp_path / "tasks.json"))
+        manager.add_task("A")
+        copies = manager._tasks_to_save()
+        assert copies[0] is not manager.tasks[0]
+        assert copies[0]._manager is None
+        assert copies[0].to_dict() == manager.tasks[0].to_dict()
+
+    def test_stress_mixed_readers_and_writers(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        manager = ConcurrentTaskManager(path)
+        manager.add_tasks(f"Tâche {i}" for i in range(200))
+        manager.search("tâche")
+        errors = []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for i in range(300):
+                    action = rng.random()
+                    if action < 0.2:
+                        manager.add_task(f"T{seed}-{i}", priority=rng.choice(list(Priority)))
+                    elif action < 0.3:
+                        tasks = manager.tasks
+                        if tasks:
+                            manager.delete_task(rng.choice(tasks).id)
+                    elif action < 0.5:
+                        tasks = manager.tasks
+                        if tasks:
+                            task = rng.choice(tasks)
+                            task.update_priority(rng.choice(list(Priority)))
+                            task.assign_to_project(f"p{rng.randrange(5)}")
+                            task.status = rng.choice(list(Status))
+                    elif action < 0.8:
+                        stats = manager.get_statistics()
+                        assert sum(stats['tasks_by_status'].values()) == stats['total_tasks']
+                        assert sum(stats['tasks_by_priority'].values()) == stats['total_tasks']
+                    elif action < 0.9:
+                        manager.get_tasks_by_status(Status.TODO)
+                        manager.search("tâche", limit=5)
+                    else:
+                        manager.save_to_file(background=True)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert manager.check_consistency()
+        manager.save_to_file()
+        manager.wait_for_save()
+        manager.close()
+        reloaded = TaskManager(path)
+        reloaded.load_from_file()
+        assert reloaded.get_statistics() == manager.get_statistics()
@@ -0,0 +1,89 @@
+import pytest # type: ignore
+import json
+from src.task_manager.journal import Change
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority, Status
+
+def snapshot(manager):
+    return [task.to_dict() for task in manager.tasks]
+
+@pytest.mark.unit
+class TestChangeJournal:
+    """Tests du journal des changements"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.existing = self.manager.add_task("Déjà là")
+        self.journal = self.manager.journal
+
+    def test_records_each_change_with_sequence(self):
+        task_id = self.manager.add_task("Rapport", priority=Priority.HIGH)
+        task = self.manager.get_task(task_id)
+        task.update_priority(Priority.URGENT)
+        task.assign_to_project("p1")
+        task.status = Status.IN_PROGRESS
+        self.manager.delete_task(self.existing)
+        changes = self.manager.changes_since(0)
+        assert [c.seq for c in changes] == [1, 2, 3, 4, 5]
+        assert [(c.op, c.field, c.value) for c in changes[1:]] == [
+            ('update', 'priority', 'URGENT'),
+            ('update', 'project_id', 'p1'),
+            ('update', 'status', 'IN_PROGRESS'),
+            ('delete', None, None),
+        ]
+        assert changes[0].value['title'] == "Rapport"
+        assert changes[0].value['priority'] == 'HIGH'
+        assert self.manager.changes_since(4) == [Change(5, 'delete', self.existing)]
+
+    def test_changes_are_json_serializable(self):
+        self.manager.get_task(self.existing).mark_completed()
+        json.dumps([c._asdict() for c in self.manager.changes_since(0)])
+
+    def test_checkpoint_bounds_journal(self):
+        self.journal.max_entries = 10
+        for i in range(25):
+            self.manager.add_task(f"T{i}")
+        assert len(self.journal) <= 10
+        assert self.journal.seq == 25
+        assert [c.seq for c in self.manager.changes_since(self.journal.checkpoint_seq)][-1] == 25
+        with pytest.raises(ValueError):
+            self.manager.changes_since(0)
+        assert self.journal.checkpoint() == 25
+        assert len(self.journal) == 0
+
+@pytest.mark.unit
+class TestReplication:
+    """Tests de la synchronisation incrémentale d'un réplica"""
+    def setup_method(self):
+        self.primary = TaskManager("test_tasks.json")
+        self.primary.add_task("A", priority=Priority.LOW)
+        self.replica = TaskManager("replica.json")
+        self.replica.sync_from(self.primary)
+
+    def test_first_sync_copies_everything(self):
+        assert snapshot(self.replica) == snapshot(self.primary)
+        assert self.replica.applied_seq == 0
+
+    def test_incremental_sync(self):
+        task_id = self.primary.add_task("B")
+        self.primary.get_task(task_id).mark_completed()
+        self.primary.get_task(task_id).assign_to_project("p1")
+        self.primary.delete_task(self.primary.tasks[0].id)
+        assert self.replica.sync_from(self.primary) == self.primary.journal.seq
+        assert snapshot(self.replica) == snapshot(self.primary)
+        assert self.replica.get_statistics() == self.primary.get_statistics()
+        assert self.replica.check_consistency()
+
+    def test_out_of_order_changes_are_rejected(self):
+        self.primary.add_task("B")
+        self.primary.add_task("C")
+        with pytest.raises(ValueError):
+            self.replica.apply_changes(self.primary.changes_since(1))
+
+    def test_replica_behind_checkpoint_is_fully_resynced(self):
+        self.primary.journal.max_entries = 4
+        for i in range(10):
+            self.primary.add_task(f"T{i}")
+        assert self.primary.journal.checkpoint_seq > 0
+        self.replica.sync_from(self.primary)
+        assert snapshot(self.replica) == snapshot(self.primary)
+        assert self.replica.applied_seq == self.primary.journal.seq
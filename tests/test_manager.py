@@ -1,7 +1,10 @@
 import pytest # type: ignore
-from unittest.mock import patch, mock_open
+from unittest.mock import patch, mock_open, Mock
 import json
+import os
+import pickle
 from src.task_manager.manager import TaskManager
+from src.task_manager.storage import atomic_write
 from src.task_manager.task import Task, Priority, Status
 from datetime import datetime
 
@@ -26,6 +29,52 @@ class TestTaskManagerBasics:
     def test_get_task_nonexistent_returns_none(self):
         assert self.manager.get_task("bidon") is None
 
+    def test_delete_task_removes_from_index(self):
+        id1 = self.manager.add_task("Tâche 1")
+        id2 = self.manager.add_task("Tâche 2")
+        assert self.manager.delete_task(id1) is True
+        assert self.manager.get_task(id1) is None
+        assert self.manager.delete_task(id1) is False
+        assert [t.id for t in self.manager.tasks] == [id2]
+
+    def test_tasks_keep_insertion_order(self):
+        ids = [self.manager.add_task(f"Tâche {i}") for i in range(5)]
+        self.manager.delete_task(ids[2])
+        assert [t.id for t in self.manager.tasks] == ids[:2] + ids[3:]
+
+    def test_tasks_copy_is_read_only(self):
+        self.manager.add_task("A")
+        tasks = self.manager.tasks
+        assert tasks == [self.manager.get_task(tasks[0].id)]
+        for mutate in (lambda: tasks.append(Task("B")), lambda: tasks.remove(tasks[0]),
+                       lambda: tasks.__delitem__(0), lambda: tasks.__setitem__(0, Task("B"))):
+            with pytest.raises(TypeError):
+                mutate()
+        with pytest.raises(TypeError):
+            self.manager.tasks += [Task("B")]
+        assert len(self.manager) == 1
+        assert len(list(tasks) + [Task("B")]) == 2
+
+    def test_managed_task_id_cannot_change(self):
+        task_id = self.manager.add_task("A")
+        with pytest.raises(ValueError):
+            self.manager.get_task(task_id).id = "autre"
+        assert self.manager.delete_task(task_id)
+        assert self.manager.get_task(task_id) is None
+
+    def test_load_many_adds_records(self):
+        records = [Task("A", priority=Priority.LOW).to_dict(), Task("B").to_dict()]
+        ids = self.manager.load_many(records)
+        assert ids == [r["id"] for r in records]
+        assert self.manager.get_task(ids[0]).priority == Priority.LOW
+        assert self.manager.check_consistency()
+
+    def test_assigning_tasks_rebuilds_index(self):
+        task = Task("Externe")
+        self.manager.tasks = [task]
+        assert self.manager.get_task(task.id) is task
+        assert len(self.manager) == 1
+
 @pytest.mark.unit
 class TestTaskManagerFiltering:
     """Tests de filtrage des tâches"""
@@ -47,6 +96,81 @@ class TestTaskManagerFiltering:
         assert all(t.priority == Priority.HIGH for t in highs)
         assert len(highs) == 2
 
+    def test_indexes_follow_task_changes(self):
+        task = self.manager.get_tasks_by_priority(Priority.LOW)[0]
+        task.mark_completed()
+        task.update_priority(Priority.URGENT)
+        task.assign_to_project("p1")
+        assert task in self.manager.get_tasks_by_status(Status.DONE)
+        assert task not in self.manager.get_tasks_by_status(Status.TODO)
+        assert self.manager.get_tasks_by_priority(Priority.URGENT) == [task]
+        assert self.manager.get_tasks_by_priority(Priority.LOW) == []
+        assert self.manager.get_tasks_by_project("p1") == [task]
+
+    def test_deleted_task_leaves_indexes(self):
+        task = self.manager.get_tasks_by_priority(Priority.LOW)[0]
+        self.manager.delete_task(task.id)
+        task.update_priority(Priority.HIGH)
+        assert task not in self.manager.get_tasks_by_priority(Priority.HIGH)
+        assert len(self.manager.get_tasks_by_status(Status.TODO)) == 1
+
+    def test_task_cannot_belong_to_two_managers(self):
+        task = self.manager.tasks[0]
+        with pytest.raises(ValueError):
+            TaskManager().tasks = [task]
+
+@pytest.mark.unit
+class TestTaskManagerBatch:
+    """Tests des opérations en lot"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+
+    def test_add_tasks_returns_per_item_results(self):
+        results = self.manager.add_tasks([
+            "Titre seul",
+            ("Tuple", "desc", Priority.HIGH),
+            {"title": "Dict", "priority": Priority.LOW},
+            {"title": ""}
+        ])
+        assert [r.ok for r in results] == [True, True, True, False]
+        assert results[3].task_id is None and results[3].error
+        assert self.manager.get_task(results[1].task_id).priority == Priority.HIGH
+        assert len(self.manager) == 3
+        assert self.manager.check_consistency()
+
+    def test_delete_tasks(self):
+        ids = [r.task_id for r in self.manager.add_tasks(["A", "B", "C"])]
+        results = self.manager.delete_tasks([ids[0], "bidon", ids[2]])
+        assert [r.ok for r in results] == [True, False, True]
+        assert [t.id for t in self.manager.tasks] == [ids[1]]
+        assert self.manager.check_consistency()
+
+    def test_update_tasks(self):
+        ids = [r.task_id for r in self.manager.add_tasks(["A", "B", "C"])]
+        results = self.manager.update_tasks(ids[:2] + ["bidon"], status=Status.DONE,
+                                            priority=Priority.URGENT, project_id="p1")
+        assert [r.ok for r in results] == [True, True, False]
+        done = self.manager.get_tasks_by_status(Status.DONE)
+        assert {t.id for t in done} == set(ids[:2])
+        assert all(t.completed_at is not None for t in done)
+        assert len(self.manager.get_tasks_by_project("p1")) == 2
+        self.manager.update_tasks(ids[:1], project_id=None)
+        assert self.manager.get_task(ids[0]).project_id is None
+        assert self.manager.check_consistency()
+
+    def test_update_tasks_rejects_invalid_values(self):
+        with pytest.raises(ValueError):
+            self.manager.update_tasks([], priority="HIGH")
+
+    def test_batch_writes_storage_once(self):
+        storage = Mock(lazy=False, path="x", supports_background=False)
+        storage.needs_compaction.return_value = False
+        manager = TaskManager(storage=storage)
+        ids = [r.task_id for r in manager.add_tasks(["A", "B"])]
+        manager.update_tasks(ids, priority=Priority.HIGH)
+        manager.delete_tasks(ids)
+        assert storage.append.call_count == 3
+
 @pytest.mark.unit
 class TestTaskManagerPersistence:
     """Tests de sauvegarde/chargement avec mocks"""
@@ -55,12 +179,17 @@ class TestTaskManagerPersistence:
         self.manager.add_task("Persist 1")
         self.manager.add_task("Persist 2", priority=Priority.URGENT)
 
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('os.replace')
+    @patch('os.fsync')
     @patch('json.dump')
-    def test_save_to_file_success(self, mock_json_dump, mock_file):
+    def test_save_to_file_success(self, mock_json_dump, mock_fsync, mock_replace):
         self.manager.save_to_file()
-        mock_file.assert_called_with("test_tasks.json", 'w', encoding='utf-8')
         assert mock_json_dump.called
+        assert mock_fsync.called
+        tmp, target = mock_replace.call_args[0]
+        os.remove(tmp)
+        assert target == "test_tasks.json"
+        assert os.path.basename(tmp).startswith("test_tasks.json.") and tmp.endswith(".tmp")
 
     @patch('os.path.exists', return_value=True)
     @patch(
@@ -85,6 +214,7 @@ class TestTaskManagerPersistence:
         self.manager.load_from_file()
         assert len(self.manager.tasks) == 1
         assert self.manager.tasks[0].title == "T1"
+        assert self.manager.get_task("1").title == "T1"
 
     @patch('builtins.open', side_effect=FileNotFoundError)
     def test_load_from_nonexistent_file(self, mock_file):
@@ -112,6 +242,64 @@ class TestTaskManagerPersistence:
         with pytest.raises(IOError):
             self.manager.save_to_file()
 
+    def test_failed_save_keeps_previous_file(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        manager = TaskManager(path)
+        manager.add_task("Avant")
+        manager.save_to_file()
+        manager.add_task("Après")
+        with patch('json.dump', side_effect=IOError("Disque plein")):
+            with pytest.raises(IOError):
+                manager.save_to_file()
+        reloaded = TaskManager(path)
+        reloaded.load_from_file()
+        assert [t.title for t in reloaded.tasks] == ["Avant"]
+        assert os.listdir(tmp_path) == ["tasks.json"]
+
+    def test_save_keeps_file_permissions(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        manager = TaskManager(path)
+        manager.add_task("A")
+        manager.save_to_file()
+        umask = os.umask(0)
+        os.umask(umask)
+        assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+        os.chmod(path, 0o600)
+        manager.save_to_file()
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_concurrent_saves_use_distinct_temp_files(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        with atomic_write(path) as first:
+            first.write("premier")
+            with atomic_write(path) as second:
+                second.write("second")
+            assert open(path, encoding='utf-8').read() == "second"
+        assert open(path, encoding='utf-8').read() == "premier"
+        assert os.listdir(tmp_path) == ["tasks.json"]
+
+    def test_background_save_coalesces_requests(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        manager = TaskManager(path)
+        manager.save_delay = 0.2
+        for i in range(20):
+            manager.add_task(f"T{i}")
+            manager.save_to_file(background=True)
+        manager.wait_for_save(timeout=5)
+        assert manager._saver.requests == 20
+        assert manager._saver.writes < 20
+        reloaded = TaskManager(path)
+        reloaded.load_from_file()
+        assert len(reloaded.tasks) == 20
+        manager.close()
+
+    def test_background_save_reports_errors(self, tmp_path):
+        manager = TaskManager(str(tmp_path / "absent" / "tasks.json"))
+        manager.save_to_file(background=True)
+        with pytest.raises(IOError):
+            manager.wait_for_save(timeout=5)
+        manager.close()
+
     @patch('os.path.exists', return_value=True)
     @patch('builtins.open', new_callable=mock_open)
     @patch('json.load', side_effect=FileNotFoundError)
@@ -149,6 +337,157 @@ class TestTaskManagerPersistence:
         assert stats['tasks_by_priority']['LOW'] == 1
         assert stats['tasks_by_priority']['HIGH'] == 2
         assert stats['tasks_by_status']['DONE'] == 1
+        assert manager.check_consistency()
+
+    def test_get_statistics_follow_transitions(self):
+        manager = TaskManager()
+        ids = [manager.add_task(f"T{i}", priority=Priority.LOW) for i in range(4)]
+        manager.get_task(ids[0]).mark_completed()
+        manager.get_task(ids[1]).update_priority(Priority.URGENT)
+        manager.get_task(ids[2]).assign_to_project("p1")
+        manager.get_task(ids[3]).assign_to_project("p1")
+        manager.delete_task(ids[3])
+        stats = manager.get_statistics()
+        assert stats['total_tasks'] == 3
+        assert stats['completed_tasks'] == 1
+        assert stats['tasks_by_priority']['LOW'] == 2
+        assert stats['tasks_by_priority']['URGENT'] == 1
+        assert stats['tasks_by_status']['TODO'] == 2
+        assert stats['tasks_by_project'] == {"p1": 1}
+        assert manager.check_consistency()
+
+    def test_check_consistency_detects_corruption(self):
+        manager = TaskManager()
+        task = manager.get_task(manager.add_task("A"))
+        task._status = Status.DONE
+        with pytest.raises(RuntimeError):
+            manager.check_consistency()
+
+@pytest.mark.unit
+class TestReadyQueue:
+    """Tests de la file des tâches prêtes"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.low = self.manager.add_task("Basse", priority=Priority.LOW)
+        self.high_old = self.manager.add_task("Haute ancienne", priority=Priority.HIGH)
+        self.high_new = self.manager.add_task("Haute récente", priority=Priority.HIGH)
+        self.manager.get_task(self.high_old).created_at = datetime(2025, 1, 1)
+
+    def test_peek_orders_by_priority_then_age(self):
+        assert self.manager.peek_next().id == self.high_old
+        assert self.manager.peek_next().id == self.high_old
+
+    def test_pop_next_moves_task_in_progress(self):
+        order = [self.manager.pop_next() for _ in range(3)]
+        assert [t.id for t in order] == [self.high_old, self.high_new, self.low]
+        assert all(t.status == Status.IN_PROGRESS for t in order)
+        assert self.manager.pop_next() is None
+
+    def test_reprioritization_and_lazy_removal(self):
+        self.manager.peek_next()
+        self.manager.get_task(self.low).update_priority(Priority.URGENT)
+        assert self.manager.peek_next().id == self.low
+        self.manager.delete_task(self.low)
+        self.manager.get_task(self.high_old).mark_completed()
+        assert self.manager.peek_next().id == self.high_new
+        assert len(self.manager.ready_queue) == 1
+
+    def test_task_back_to_todo_is_queued_again(self):
+        task = self.manager.pop_next()
+        task.status = Status.TODO
+        assert self.manager.peek_next() is task
+
+    def test_new_tasks_are_queued(self):
+        self.manager.peek_next()
+        urgent = self.manager.add_task("Urgente", priority=Priority.URGENT)
+        assert self.manager.pop_next().id == urgent
+
+    def test_stale_entries_are_compacted(self):
+        self.manager.peek_next()
+        task = self.manager.get_task(self.low)
+        for i in range(200):
+            task.update_priority(Priority.HIGH if i % 2 else Priority.MEDIUM)
+        assert len(self.manager.ready_queue._heap) <= 2 * len(self.manager.ready_queue) + 65
+
+@pytest.mark.unit
+class TestTimeRangeQueries:
+    """Tests des index triés sur created_at / completed_at"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.ids = [self.manager.add_task(f"T{i}") for i in range(5)]
+        for day, task_id in zip((5, 1, 3, 2, 4), self.ids):
+            self.manager.get_task(task_id).created_at = datetime(2025, 3, day, 12)
+
+    def ids_between(self, field, start=None, end=None):
+        return [t.id for t in self.manager.get_tasks_between(field, start, end)]
+
+    def test_created_between_is_sorted_and_half_open(self):
+        result = self.ids_between('created_at', datetime(2025, 3, 2), datetime(2025, 3, 4, 12))
+        assert result == [self.ids[3], self.ids[2]]
+        assert self.ids_between('created_at', end=datetime(2025, 3, 2)) == [self.ids[1]]
+
+    def test_dates_are_accepted(self):
+        from datetime import date
+        assert self.ids_between('created_at', date(2025, 3, 5), date(2025, 3, 6)) == [self.ids[0]]
+
+    def test_index_follows_changes(self):
+        self.manager.get_tasks_between('created_at')
+        self.manager.get_task(self.ids[0]).created_at = datetime(2025, 2, 1)
+        self.manager.delete_task(self.ids[1])
+        self.manager.get_task(self.ids[2]).mark_completed()
+        assert self.ids_between('created_at', end=datetime(2025, 3, 3))[0] == self.ids[0]
+        assert self.ids[1] not in self.ids_between('created_at')
+        assert self.ids_between('completed_at', datetime(2000, 1, 1)) == [self.ids[2]]
+
+    def test_unknown_field_raises(self):
+        with pytest.raises(ValueError):
+            self.manager.get_tasks_between('due_date')
+
+@pytest.mark.unit
+class TestTaskManagerShards:
+    """Tests du chargement/sauvegarde par fragments"""
+    def make_manager(self):
+        manager = TaskManager()
+        results = manager.add_tasks(["A", "B", "C", "D"])
+        ids = [r.task_id for r in results]
+        manager.get_task(ids[0]).assign_to_project("équipe/1")
+        manager.get_task(ids[1]).assign_to_project("équipe/1")
+        manager.get_task(ids[2]).assign_to_project("p2")
+        manager.get_task(ids[2]).mark_completed()
+        return manager
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_save_and_load_shards(self, tmp_path, workers):
+        manager = self.make_manager()
+        paths = manager.save_shards(str(tmp_path), workers=workers)
+        assert set(paths) == {"équipe/1", "p2", None}
+        assert all(os.path.dirname(p) == str(tmp_path) for p in paths.values())
+        reloaded = TaskManager()
+        reloaded.load_shards(paths.values(), workers=workers)
+        assert sorted(t.to_dict()['id'] for t in reloaded.tasks) == sorted(t.id for t in manager.tasks)
+        assert reloaded.get_statistics() == manager.get_statistics()
+        assert reloaded.check_consistency()
+
+    def test_shard_names_do_not_collide(self, tmp_path):
+        manager = TaskManager()
+        for project_id in ("a/b", "a_b", "_sans_projet", None):
+            manager.get_task(manager.add_task("T")).assign_to_project(project_id)
+        paths = manager.save_shards(str(tmp_path), workers=1)
+        assert len(set(paths.values())) == 4
+        reloaded = TaskManager()
+        reloaded.load_shards(paths.values(), workers=1)
+        assert len(reloaded) == 4
+
+    def test_load_shards_missing_file_raises_ioerror(self, tmp_path):
+        with pytest.raises(IOError):
+            TaskManager().load_shards([str(tmp_path / "absent.json")], workers=1)
+
+    def test_task_pickle_drops_manager(self):
+        manager = self.make_manager()
+        task = manager.tasks[2]
+        clone = pickle.loads(pickle.dumps(task))
+        assert clone.to_dict() == task.to_dict()
+        assert clone._manager is None
 
 @pytest.mark.integration
 def test_manager_integration_flow():
@@ -0,0 +1,92 @@
+import pytest # type: ignore
+import io
+import json
+from datetime import date
+from src.task_manager.manager import TaskManager
+from src.task_manager.metrics import LatencyHistogram, Metrics, instrumented, metrics
+from src.task_manager.services import ReportService
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Tests de l'histogramme de latences"""
+    def test_summary(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.001, 0.002, 0.003, 0.1):
+            histogram.record(seconds)
+        data = histogram.to_dict()
+        assert data['count'] == 4
+        assert data['min'] == 0.001 and data['max'] == 0.1
+        assert data['mean'] == pytest.approx(0.0265)
+        assert sum(data['buckets'].values()) == 4
+        # Borne supérieure de la classe : au plus deux fois la valeur réelle
+        assert 0.002 <= histogram.percentile(50) <= 0.004
+        assert histogram.percentile(100) == 0.1
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(50) is None
+
+@pytest.mark.unit
+class TestMetrics:
+    """Tests de l'instrumentation opt-in"""
+    def test_disabled_by_default(self):
+        registry = Metrics()
+        assert not registry.is_enabled('TaskManager.save_to_file')
+        assert registry.to_dict() == {'latencies': {}, 'counters': {}}
+
+    def test_selected_operations_only(self, enabled_metrics):
+        enabled_metrics.disable()
+        enabled_metrics.enable(['TaskManager.get_statistics'])
+        manager = TaskManager("test_tasks.json")
+        manager.get_statistics()
+        manager.load_from_file("absent.json")
+        assert list(enabled_metrics.to_dict()['latencies']) == ['TaskManager.get_statistics']
+
+    def test_hot_paths_are_recorded(self, enabled_metrics, tmp_path):
+        manager = TaskManager(str(tmp_path / "tasks.json"))
+        manager.add_task("A")
+        manager.save_to_file()
+        manager.load_from_file()
+        manager.get_statistics()
+        reports = ReportService()
+        reports.generate_daily_report(manager, date.today())
+        reports.export_tasks_csv(manager.tasks, io.StringIO())
+        data = json.loads(enabled_metrics.to_json())
+        assert set(data['latencies']) == {
+            'TaskManager.save_to_file', 'TaskManager.load_from_file', 'TaskManager.get_statistics',
+            'ReportService.generate_daily_report', 'ReportService.export_tasks_csv'
+        }
+        assert data['counters']['TaskManager.save_to_file.calls'] == 1
+
+    def test_errors_are_counted(self, enabled_metrics, tmp_path):
+        manager = TaskManager(str(tmp_path / "absent" / "tasks.json"))
+        with pytest.raises(IOError):
+            manager.save_to_file()
+        assert enabled_metrics.counters['TaskManager.save_to_file.errors'] == 1
+        assert enabled_metrics.histograms['TaskManager.save_to_file'].count == 1
+
+    def test_custom_operation_name(self, enabled_metrics):
+        @instrumented('calcul')
+        def compute(x):
+            return x * 2
+
+        assert compute(21) == 42
+        enabled_metrics.increment('calcul.items', 5)
+        assert enabled_metrics.counters == {'calcul.calls': 1, 'calcul.items': 5}
+
+@pytest.mark.integration
+def test_benchmark_suite_smoke():
+    from benchmarks.suite import OPERATIONS, compare, run_suite
+    results = run_suite(sizes=(200,), repeat=1)
+    assert set(results['results']['200']) == set(OPERATIONS)
+    rows = compare(results, results)
+    assert len(rows) == len(OPERATIONS)
+    assert not any(regression for *_, regression in rows)
+    assert not metrics.is_enabled('TaskManager.save_to_file')
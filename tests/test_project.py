@@ -0,0 +1,84 @@
+import pytest # type: ignore
+from src.task_manager.manager import TaskManager
+from src.task_manager.project import Project
+from src.task_manager.task import Status
+
+@pytest.mark.unit
+class TestProject:
+    """Tests de l'entité Project"""
+    def test_create_project(self):
+        project = Project("Site web", "Refonte")
+        assert project.name == "Site web"
+        assert isinstance(project.id, str)
+
+    def test_empty_name_raises_error(self):
+        with pytest.raises(ValueError):
+            Project("")
+
+    def test_to_dict_roundtrip(self):
+        project = Project("Site web")
+        clone = Project.from_dict(project.to_dict())
+        assert clone.to_dict() == project.to_dict()
+
+@pytest.mark.unit
+class TestProjectRegistry:
+    """Tests du registre de projets et de ses partitions"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.ids = [r.task_id for r in self.manager.add_tasks(["A", "B", "C", "D"])]
+        self.web = self.manager.projects.create("Site web")
+        self.app = self.manager.projects.create("Application")
+        self.manager.projects.reassign(self.ids[:3], self.web.id)
+
+    def expected_progress(self, project_id):
+        tasks = [t for t in self.manager.tasks if t.project_id == project_id]
+        return sum(1 for t in tasks if t.status == Status.DONE), len(tasks)
+
+    def test_count_and_tasks(self):
+        assert self.manager.projects.count(self.web.id) == 3
+        assert [t.id for t in self.manager.projects.tasks(self.web.id)] == self.ids[:3]
+        assert self.manager.projects.count(self.app.id) == 0
+
+    def test_progress_follows_changes(self):
+        self.manager.get_task(self.ids[0]).mark_completed()
+        self.manager.projects.reassign([self.ids[1]], self.app.id)
+        self.manager.delete_task(self.ids[2])
+        progress = self.manager.projects.progress(self.web.id)
+        assert (progress['completed_tasks'], progress['total_tasks']) == self.expected_progress(self.web.id)
+        assert progress['completion_rate'] == 1.0
+        assert self.manager.projects.progress(self.app.id)['tasks_by_status']['TODO'] == 1
+
+    def test_registry_created_after_tasks_sees_existing_assignments(self):
+        manager = TaskManager()
+        task_id = manager.add_task("A")
+        manager.get_task(task_id).assign_to_project("p1")
+        manager.get_task(task_id).mark_completed()
+        assert manager.projects.progress("p1")['completed_tasks'] == 1
+
+    def test_project_ids_of_loaded_tasks_are_known(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        self.manager.save_to_file(path)
+        manager = TaskManager(path)
+        manager.load_from_file()
+        assert self.web.id in manager.projects
+        assert manager.projects.reassign([self.ids[3]], self.web.id)[0].ok
+        assert manager.projects.count(self.web.id) == 4
+        manager.projects.get(self.web.id)
+        manager.load_from_file()
+        assert manager.projects.count(self.web.id) == 3
+
+    def test_reassign_to_unknown_project_raises(self):
+        with pytest.raises(ValueError):
+            self.manager.projects.reassign(self.ids, "inconnu")
+
+    def test_delete_project_unassigns_tasks(self):
+        assert self.manager.projects.delete(self.web.id) is True
+        assert self.web.id not in self.manager.projects
+        assert all(t.project_id is None for t in self.manager.tasks)
+        assert self.manager.projects.progress(self.web.id)['total_tasks'] == 0
+        assert self.manager.projects.delete(self.web.id) is False
+
+    def test_delete_project_with_tasks(self):
+        self.manager.projects.delete(self.web.id, delete_tasks=True)
+        assert [t.id for t in self.manager.tasks] == [self.ids[3]]
+        assert self.manager.check_consistency()
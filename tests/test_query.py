@@ -0,0 +1,114 @@
+import pytest # type: ignore
+import random
+from datetime import datetime, timedelta
+from src.task_manager.concurrency import ConcurrentTaskManager
+from src.task_manager.manager import TaskManager
+from src.task_manager.query import Q
+from src.task_manager.storage import SqliteStorage
+from src.task_manager.task import Priority, Status
+
+START = datetime(2024, 1, 1)
+
+def populate(manager, n=300, seed=3):
+    rng = random.Random(seed)
+    for i in range(n):
+        task = manager.get_task(manager.add_task(f"Tâche {i}", priority=rng.choice(list(Priority))))
+        task.created_at = START + timedelta(hours=rng.randrange(2000))
+        task.assign_to_project(f"p{rng.randrange(5)}")
+        if rng.random() < 0.3:
+            task.mark_completed()
+    return manager
+
+def by_age(tasks, reverse=False):
+    return [t.id for t in sorted(tasks, key=lambda t: (t.created_at, t.id), reverse=reverse)]
+
+def ids(tasks):
+    return [t.id for t in tasks]
+
+@pytest.mark.unit
+class TestQuery:
+    """Tests du moteur de requêtes"""
+    def setup_method(self):
+        self.manager = populate(TaskManager("test_tasks.json"))
+        self.after = START + timedelta(days=30)
+
+    def expected(self):
+        return by_age(t for t in self.manager.tasks
+                      if t.priority in (Priority.HIGH, Priority.URGENT) and t.status != Status.DONE
+                      and t.project_id == "p1" and t.created_at >= self.after)
+
+    def query(self):
+        return self.manager.query(~Q.status(Status.DONE), priority=[Priority.HIGH, Priority.URGENT],
+                                  project_id="p1", created_after=self.after)
+
+    def test_combined_filters(self):
+        assert ids(self.query()) == self.expected()
+        assert self.query().count() == len(self.expected())
+
+    def test_cursor_pagination(self):
+        pages = list(self.query().pages(4))
+        assert [t.id for page in pages for t in page.items] == self.expected()
+        assert all(len(page.items) == 4 for page in pages[:-1])
+        assert pages[-1].next_cursor is None
+
+    def test_cursor_is_stable_when_tasks_are_added(self):
+        first = self.manager.query().page(10)
+        self.manager.get_task(self.manager.add_task("Nouvelle")).created_at = START - timedelta(days=1)
+        second = self.manager.query().page(10, first.next_cursor)
+        assert ids(first.items) + ids(second.items) == by_age(self.manager.tasks)[1:21]
+
+    def test_descending_and_other_orders(self):
+        assert ids(self.manager.query(order_by='-created_at').page(15).items) == by_age(self.manager.tasks, True)[:15]
+        pages = self.manager.query(status=Status.DONE, order_by='-priority').pages(7)
+        expected = sorted((t for t in self.manager.tasks if t.status == Status.DONE),
+                          key=lambda t: (list(Priority).index(t.priority), t.id), reverse=True)
+        assert [t.id for page in pages for t in page.items] == ids(expected)
+
+    def test_completed_range_sorted_by_completion(self):
+        query = self.manager.query(Q.completed(START), order_by='completed_at')
+        expected = sorted((t for t in self.manager.tasks if t.completed_at),
+                          key=lambda t: (t.completed_at, t.id))
+        assert [t.id for page in query.pages(9) for t in page.items] == ids(expected)
+
+    def test_or_and_where(self):
+        query = self.manager.query(Q.project("p0") | Q.status(Status.DONE), Q.where(lambda t: t.title.endswith("7")))
+        expected = by_age(t for t in self.manager.tasks
+                          if (t.project_id == "p0" or t.status == Status.DONE) and t.title.endswith("7"))
+        assert ids(query) == expected
+
+    def test_access_path_selection(self):
+        assert self.manager.query(project_id="p1").explain().startswith("index project_id")
+        assert "index status" in self.manager.query(~Q.status(Status.DONE), order_by='title').explain()
+        # Une page triée par date se lit dans l'index trié, sans tout filtrer
+        assert "index trié created_at" in self.manager.query(priority=Priority.LOW).explain(limit=5)
+        assert "parcours complet" in self.manager.query(Q.where(bool), order_by='title').explain()
+
+    def test_lazy_iteration_stops_early(self):
+        iterator = iter(self.manager.query())
+        assert next(iterator).id == by_age(self.manager.tasks)[0]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            self.manager.query(order_by='description')
+        with pytest.raises(ValueError):
+            self.manager.query(couleur="rouge")
+        with pytest.raises(ValueError):
+            self.manager.query().page(5, cursor="pas-un-curseur")
+        cursor = self.manager.query().page(5).next_cursor
+        with pytest.raises(ValueError):
+            self.manager.query(order_by='priority').page(5, cursor)
+
+@pytest.mark.unit
+class TestQueryBackends:
+    """Tests des requêtes sur les autres gestionnaires"""
+    def test_concurrent_manager_iterates_by_pages(self):
+        manager = populate(ConcurrentTaskManager("test_tasks.json"), n=450)
+        assert ids(manager.query(status=Status.TODO)) == by_age(t for t in manager.tasks if t.status == Status.TODO)
+        assert manager.query().count() == 450
+
+    def test_lazy_storage_scans(self, tmp_path):
+        manager = TaskManager(storage=SqliteStorage(str(tmp_path / "tasks.db")))
+        high = manager.add_task("A", priority=Priority.HIGH)
+        manager.add_task("B")
+        assert ids(manager.query(priority=Priority.HIGH)) == [high]
+        assert "parcours complet" in manager.query(priority=Priority.HIGH).explain()
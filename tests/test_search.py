@@ -0,0 +1,69 @@
+import pytest # type: ignore
+from src.task_manager.manager import TaskManager
+from src.task_manager.search import normalize, tokenize
+from src.task_manager.task import Priority, Status
+
+@pytest.mark.unit
+class TestTokenization:
+    """Tests de la normalisation du texte"""
+    def test_normalize_removes_accents(self):
+        assert normalize("Préparer l'ÉTÉ") == "preparer l'ete"
+
+    def test_tokenize_skips_stop_words(self):
+        assert tokenize("Préparer le rapport de l'équipe") == ["preparer", "rapport", "equipe"]
+
+    def test_tokenize_none(self):
+        assert tokenize(None) == []
+
+@pytest.mark.unit
+class TestSearch:
+    """Tests de la recherche plein texte"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.rapport = self.manager.add_task("Préparer le rapport", "Rédiger le rapport final", Priority.HIGH)
+        self.email = self.manager.add_task("Envoyer l'email", "Notifier l'équipe du rapport", Priority.LOW)
+        self.bureau = self.manager.add_task("Nettoyer le bureau", "Avant la réunion")
+
+    def ids(self, results):
+        return [t.id for t in results]
+
+    def test_accent_insensitive_search(self):
+        assert self.ids(self.manager.search("preparer")) == [self.rapport]
+        assert self.ids(self.manager.search("RÉUNION")) == [self.bureau]
+
+    def test_title_matches_rank_first(self):
+        assert self.ids(self.manager.search("rapport")) == [self.rapport, self.email]
+
+    def test_prefix_matching(self):
+        assert self.ids(self.manager.search("rapp")) == [self.rapport, self.email]
+        assert self.ids(self.manager.search("net bur")) == [self.bureau]
+
+    def test_all_terms_required(self):
+        assert self.ids(self.manager.search("rapport équipe")) == [self.email]
+        assert self.manager.search("rapport inexistant") == []
+        assert self.manager.search("le") == []
+
+    def test_filters_and_limit(self):
+        assert self.ids(self.manager.search("rapport", priority=Priority.LOW)) == [self.email]
+        self.manager.get_task(self.rapport).mark_completed()
+        assert self.ids(self.manager.search("rapport", status=Status.TODO)) == [self.email]
+        assert len(self.manager.search("rapport", limit=1)) == 1
+
+    def test_index_follows_changes(self):
+        self.manager.search("rapport")
+        self.manager.get_task(self.bureau).title = "Ranger les archives"
+        self.manager.delete_task(self.email)
+        new_id = self.manager.add_task("Rapport trimestriel")
+        assert self.ids(self.manager.search("archi")) == [self.bureau]
+        assert self.manager.search("nettoyer") == []
+        assert set(self.ids(self.manager.search("rapport"))) == {self.rapport, new_id}
+
+    def test_vocabulary_sorted_after_build_and_updates(self):
+        for code in ("zz-91", "aa-07", "mm-33"):
+            self.manager.add_task(f"Ticket {code}")
+        self.manager.search("ticket")
+        index = self.manager._search_index
+        assert index._vocabulary == sorted(index._postings)
+        self.manager.add_task("Ticket bb-12")
+        assert index._vocabulary == sorted(index._postings)
+        assert len(self.manager.search("tick bb")) == 1
@@ -1,8 +1,13 @@
 import pytest # type: ignore
 from unittest.mock import patch, Mock, mock_open
-from src.task_manager.services import EmailService, ReportService
+from src.task_manager.services import EmailService, ReportService, SmtpTransport
+from src.task_manager.manager import TaskManager
 from src.task_manager.task import Task, Priority, Status
 from datetime import datetime, timedelta
+import asyncio
+import csv
+import gzip
+import io
 
 @pytest.mark.unit
 class TestEmailService:
@@ -28,6 +33,87 @@ class TestEmailService:
         with pytest.raises(ValueError):
             self.email_service.send_completion_notification("invalid", "Tâche")
 
+class FakeTransport:
+    """Transport factice : enregistre les envois, échoue sur demande"""
+    instances = []
+
+    def __init__(self, failures=0):
+        self.sent = []
+        self.failures = failures
+        self.closed = False
+        FakeTransport.instances.append(self)
+
+    def send(self, email, subject, body):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Serveur indisponible")
+        self.sent.append((email, subject))
+
+    def close(self):
+        self.closed = True
+
+class AsyncFakeTransport:
+    active = 0
+    peak = 0
+
+    async def send(self, email, subject, body):
+        AsyncFakeTransport.active += 1
+        AsyncFakeTransport.peak = max(AsyncFakeTransport.peak, AsyncFakeTransport.active)
+        await asyncio.sleep(0.001)
+        AsyncFakeTransport.active -= 1
+
+@pytest.mark.unit
+class TestBatchReminders:
+    """Tests de l'envoi de rappels en lot"""
+    def setup_method(self):
+        FakeTransport.instances = []
+
+    def test_send_reminders_reuses_one_transport_per_worker(self):
+        service = EmailService(transport_factory=FakeTransport)
+        batch = [(f"user{i}@mail.com", f"Tâche {i}", "2025-01-01") for i in range(20)]
+        results = service.send_reminders(batch, concurrency=3)
+        assert all(r.ok and r.attempts == 1 for r in results)
+        assert [r.email for r in results] == [b[0] for b in batch]
+        assert len(FakeTransport.instances) == 3
+        assert sum(len(t.sent) for t in FakeTransport.instances) == 20
+        assert all(t.closed for t in FakeTransport.instances)
+
+    def test_send_reminders_invalid_email_not_sent(self):
+        service = EmailService(transport_factory=FakeTransport)
+        results = service.send_reminders([("invalid", "T", "2025-01-01"), ("a@b.c", "T", "2025-01-01")])
+        assert results[0] == ("invalid", False, 0, "Email invalide")
+        assert results[1].ok
+
+    def test_send_reminders_retries_with_backoff(self):
+        service = EmailService(transport_factory=lambda: FakeTransport(failures=2))
+        results = service.send_reminders([("a@b.c", "T", "2025-01-01")], retries=3, backoff=0.001)
+        assert results[0].ok and results[0].attempts == 3
+
+    def test_send_reminders_gives_up_after_retries(self):
+        service = EmailService(transport_factory=lambda: FakeTransport(failures=10))
+        results = service.send_reminders([("a@b.c", "T", "2025-01-01")], retries=2, backoff=0.001)
+        assert not results[0].ok
+        assert results[0].attempts == 3
+        assert "indisponible" in results[0].error
+
+    def test_send_reminders_bounds_concurrency(self):
+        AsyncFakeTransport.peak = 0
+        service = EmailService(transport_factory=AsyncFakeTransport)
+        batch = [(f"u{i}@mail.com", "T", "2025-01-01") for i in range(50)]
+        results = service.send_reminders(batch, concurrency=5)
+        assert all(r.ok for r in results)
+        assert AsyncFakeTransport.peak == 5
+
+    @patch('src.task_manager.services.smtplib.SMTP')
+    def test_smtp_transport_reuses_connection(self, mock_smtp):
+        transport = SmtpTransport("localhost", 2525, use_tls=False)
+        transport.send("a@b.c", "Sujet", "Corps")
+        transport.send("d@e.f", "Sujet", "Corps")
+        transport.close()
+        assert mock_smtp.call_count == 1
+        assert mock_smtp.return_value.send_message.call_count == 2
+        assert mock_smtp.return_value.quit.called
+
 @pytest.mark.unit
 class TestReportService:
     """Tests du service de rapports"""
@@ -65,6 +151,24 @@ class TestReportService:
         with pytest.raises(IOError):
             self.report_service.export_tasks_csv(self.tasks, "export.csv")
 
+    def test_export_tasks_csv_to_stream_matches_dict_rows(self):
+        buffer = io.StringIO()
+        count = self.report_service.export_tasks_csv((t for t in self.tasks), buffer, chunk_size=2)
+        assert count == 3
+        rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+        expected = [{k: "" if v is None else v for k, v in t.to_dict().items()} for t in self.tasks]
+        assert rows == expected
+
+    def test_export_tasks_csv_gzip(self, tmp_path):
+        path = str(tmp_path / "export.csv.gz")
+        self.report_service.export_tasks_csv(self.tasks, filename=path, compress=True)
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [r['id'] for r in rows] == [t.id for t in self.tasks]
+        stream = io.BytesIO()
+        self.report_service.export_tasks_csv(self.tasks, stream, compress=True)
+        assert gzip.decompress(stream.getvalue()).decode('utf-8').splitlines()[0].startswith("id,title")
+
     def test_generate_daily_report_invalid_data(self):
         # Passe une tâche sans attribut created_at
         class Dummy:
@@ -72,6 +176,56 @@ class TestReportService:
         with pytest.raises(AttributeError):
             self.report_service.generate_daily_report([Dummy()])
 
+@pytest.mark.unit
+class TestIncrementalReports:
+    """Tests du moteur de rapports incrémental"""
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.today = datetime(2025, 3, 10, 9, 0)
+        self.ids = [self.manager.add_task(f"T{i}", priority=Priority.LOW) for i in range(4)]
+        for offset, task_id in enumerate(self.ids):
+            self.manager.get_task(task_id).created_at = self.today - timedelta(days=offset)
+        self.report_service = ReportService(self.manager)
+
+    def test_daily_report_from_engine(self):
+        report = self.report_service.generate_daily_report(date=self.today)
+        assert report['date'] == str(self.today.date())
+        assert report['total_tasks'] == 1
+        assert report['tasks_by_priority']['LOW'] == 1
+
+    def test_engine_follows_manager_changes(self):
+        task = self.manager.get_task(self.ids[0])
+        task.mark_completed()
+        task.update_priority(Priority.HIGH)
+        self.manager.add_task("Nouvelle")
+        self.manager.delete_task(self.ids[1])
+        report = self.report_service.generate_daily_report(date=self.today)
+        expected = self.report_service.generate_daily_report(self.manager.tasks, date=self.today)
+        assert report == expected
+        assert report['completed_tasks'] == 1
+        assert report['tasks_by_priority']['HIGH'] == 1
+        yesterday = self.report_service.generate_daily_report(date=self.today - timedelta(days=1))
+        assert yesterday['total_tasks'] == 0
+
+    def test_range_report(self):
+        self.manager.get_task(self.ids[2]).mark_completed()
+        report = self.report_service.generate_range_report(self.today - timedelta(days=2), self.today)
+        assert report['total_tasks'] == 3
+        assert report['completed_tasks'] == 1
+        assert len(report['days']) == 3
+        direct = ReportService().generate_range_report(self.today - timedelta(days=2), self.today,
+                                                       tasks=self.manager.tasks)
+        assert direct == report
+
+    def test_daily_report_from_manager_uses_time_index(self):
+        report = ReportService().generate_daily_report(self.manager, date=self.today - timedelta(days=1))
+        assert report['total_tasks'] == 1
+        assert self.manager._time_index is not None
+
+    def test_range_report_without_source_raises(self):
+        with pytest.raises(ValueError):
+            ReportService().generate_range_report(self.today, self.today)
+
 @pytest.mark.integration
 def test_services_integration_flow():
     now = datetime.now()
@@ -0,0 +1,296 @@
+import pytest # type: ignore
+import json
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from datetime import datetime, timedelta, timezone
+from src.task_manager.storage import (BinarySnapshotStorage, JsonLinesStorage, JsonStorage, SqliteStorage,
+                                      json_to_snapshot, snapshot_to_json)
+from src.task_manager.task import Priority, Status
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+@pytest.mark.unit
+class TestJsonLinesStorage:
+    """Tests du stockage JSON Lines en ajout seul"""
+    def make_manager(self, tmp_path, **kwargs):
+        self.path = str(tmp_path / "tasks.jsonl")
+        return TaskManager(storage=JsonLinesStorage(self.path, **kwargs))
+
+    def test_each_change_appends_one_record(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        task_id = manager.add_task("Préparer le rapport", priority=Priority.HIGH)
+        manager.get_task(task_id).update_priority(Priority.URGENT)
+        manager.get_task(task_id).mark_completed()
+        manager.delete_task(task_id)
+        records = read_lines(self.path)
+        assert len(records) == 4
+        assert records[0]['priority'] == 'HIGH'
+        assert records[1]['priority'] == 'URGENT'
+        assert (records[2]['status'], records[2]['completed_at'] is not None) == ('DONE', True)
+        assert records[3] == {'id': task_id, 'deleted': True}
+
+    def test_load_replays_last_record_per_task(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("A")
+        id2 = manager.add_task("B")
+        manager.get_task(id1).mark_completed()
+        manager.delete_task(id2)
+        manager.storage.close()
+        reloaded = TaskManager(storage=JsonLinesStorage(self.path))
+        reloaded.load_from_file()
+        assert [t.id for t in reloaded.tasks] == [id1]
+        task = reloaded.get_task(id1)
+        assert task.status == Status.DONE
+        assert task.completed_at is not None
+        assert reloaded.check_consistency()
+
+    def test_torn_last_line_is_ignored(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("A")
+        manager.storage.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"id": "coupé", "title": "B')
+        reloaded = TaskManager(storage=JsonLinesStorage(self.path))
+        reloaded.load_from_file()
+        assert [t.id for t in reloaded.tasks] == [id1]
+        id2 = reloaded.add_task("C")
+        reloaded.storage.close()
+        again = TaskManager(storage=JsonLinesStorage(self.path))
+        again.load_from_file()
+        assert [t.id for t in again.tasks] == [id1, id2]
+
+    def test_complete_last_line_without_newline_is_kept(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.add_task("A")
+        manager.storage.close()
+        with open(self.path, 'rb+') as f:
+            f.truncate(len(f.read()) - 1)
+        reloaded = TaskManager(storage=JsonLinesStorage(self.path))
+        reloaded.load_from_file()
+        reloaded.add_task("B")
+        reloaded.storage.close()
+        assert [r['title'] for r in read_lines(self.path)] == ["A", "B"]
+
+    def test_corrupted_line_in_the_middle_raises(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.add_task("A")
+        manager.storage.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('pas du json\n')
+        manager.add_task("B")
+        manager.storage.close()
+        with pytest.raises(IOError):
+            TaskManager(storage=JsonLinesStorage(self.path)).load_from_file()
+
+    def test_compaction_keeps_only_live_tasks(self, tmp_path):
+        manager = self.make_manager(tmp_path, compact_ratio=1.5, min_records=4)
+        ids = [manager.add_task(f"T{i}") for i in range(3)]
+        for task_id in ids[:2]:
+            manager.get_task(task_id).update_priority(Priority.LOW)
+        records = read_lines(self.path)
+        assert len(records) <= 4
+        assert {r['id'] for r in records} == set(ids)
+
+    def test_save_to_file_compacts(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        task_id = manager.add_task("A")
+        manager.get_task(task_id).update_priority(Priority.LOW)
+        manager.save_to_file()
+        assert read_lines(self.path) == [manager.get_task(task_id).to_dict()]
+
+    def test_load_missing_file_gives_empty_manager(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.load_from_file()
+        assert manager.tasks == []
+
+@pytest.mark.unit
+class TestSqliteStorage:
+    """Tests du stockage SQLite paresseux"""
+    def make_manager(self, tmp_path, **kwargs):
+        self.path = str(tmp_path / "tasks.db")
+        return TaskManager(storage=SqliteStorage(self.path, **kwargs))
+
+    def test_default_storage_is_json(self):
+        manager = TaskManager("x.json")
+        assert isinstance(manager.storage, JsonStorage)
+        assert manager.storage_file == "x.json"
+
+    def test_queries_run_against_database(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("A", priority=Priority.HIGH)
+        manager.add_task("B", priority=Priority.LOW)
+        manager.get_task(id1).mark_completed()
+        manager.get_task(id1).assign_to_project("p1")
+        assert [t.id for t in manager.get_tasks_by_status(Status.DONE)] == [id1]
+        assert [t.title for t in manager.get_tasks_by_priority(Priority.LOW)] == ["B"]
+        assert [t.id for t in manager.get_tasks_by_project("p1")] == [id1]
+        stats = manager.get_statistics()
+        assert stats['total_tasks'] == 2
+        assert stats['completed_tasks'] == 1
+        assert stats['tasks_by_priority']['HIGH'] == 1
+        assert stats['tasks_by_project'] == {"p1": 1}
+        assert len(manager) == 2
+        assert manager.check_consistency()
+
+    def test_tasks_are_loaded_lazily(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = [manager.add_task(f"T{i}") for i in range(3)]
+        manager.save_to_file()
+        manager.storage.close()
+        reopened = TaskManager(storage=SqliteStorage(self.path))
+        reopened.load_from_file()
+        assert len(reopened._tasks) == 0
+        task = reopened.get_task(ids[1])
+        assert task.title == "T1"
+        assert reopened.get_task(ids[1]) is task
+        assert reopened.delete_task(ids[0]) is True
+        assert [t.id for t in reopened.tasks] == ids[1:]
+
+    def test_writes_are_batched(self, tmp_path):
+        manager = self.make_manager(tmp_path, batch_size=10)
+        for i in range(5):
+            manager.add_task(f"T{i}")
+        assert len(manager.storage._pending) == 5
+        manager.save_to_file()
+        assert manager.storage._pending == {}
+
+    def test_eager_mode_loads_everything(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        task_id = manager.add_task("A", priority=Priority.URGENT)
+        manager.storage.close()
+        eager = TaskManager(storage=SqliteStorage(self.path, lazy=False))
+        eager.load_from_file()
+        assert [t.id for t in eager._tasks.values()] == [task_id]
+        assert eager.get_tasks_by_priority(Priority.URGENT)[0].id == task_id
+
+@pytest.mark.unit
+class TestBinarySnapshotStorage:
+    """Tests de l'instantané binaire projeté en mémoire"""
+    def make_snapshot(self, tmp_path):
+        self.path = str(tmp_path / "tasks.snap")
+        manager = TaskManager(storage=BinarySnapshotStorage(self.path))
+        self.ids = [manager.add_task(f"Tâche {i}", f"Détail {i}", priority) for i, priority in
+                    enumerate([Priority.HIGH, Priority.LOW, Priority.HIGH])]
+        manager.get_task(self.ids[0]).mark_completed()
+        manager.get_task(self.ids[2]).assign_to_project("p1")
+        manager.close()
+        return TaskManager(storage=BinarySnapshotStorage(self.path))
+
+    def test_records_are_read_lazily(self, tmp_path):
+        manager = self.make_snapshot(tmp_path)
+        assert len(manager) == 3
+        assert len(manager._tasks) == 0
+        task = manager.get_task(self.ids[1])
+        assert (task.title, task.description, task.priority) == ("Tâche 1", "Détail 1", Priority.LOW)
+        assert manager.get_task(self.ids[1]) is task
+        assert manager.get_task("inconnu") is None
+        assert [t.id for t in manager.tasks] == self.ids
+
+    def test_filters_and_statistics(self, tmp_path):
+        manager = self.make_snapshot(tmp_path)
+        assert [t.id for t in manager.get_tasks_by_priority(Priority.HIGH)] == [self.ids[0], self.ids[2]]
+        assert [t.id for t in manager.get_tasks_by_status(Status.DONE)] == [self.ids[0]]
+        assert [t.id for t in manager.get_tasks_by_project("p1")] == [self.ids[2]]
+        assert manager.get_tasks_by_project("p2") == []
+        assert manager.get_statistics() == manager._compute_statistics()
+        assert manager.get_statistics()['tasks_by_project'] == {"p1": 1}
+
+    def test_changes_are_kept_until_flush(self, tmp_path):
+        manager = self.make_snapshot(tmp_path)
+        manager.get_task(self.ids[1]).assign_to_project("p1")
+        manager.delete_task(self.ids[0])
+        new_id = manager.add_task("Nouvelle")
+        assert [t.id for t in manager.get_tasks_by_project("p1")] == [self.ids[1], self.ids[2]]
+        assert manager.get_task(self.ids[0]) is None
+        assert manager.get_statistics() == manager._compute_statistics()
+        assert len(manager) == 3
+        manager.save_to_file()
+        reopened = TaskManager(storage=BinarySnapshotStorage(self.path))
+        assert [t.id for t in reopened.tasks] == [self.ids[1], self.ids[2], new_id]
+        assert reopened.get_task(self.ids[1]).project_id == "p1"
+
+    def test_round_trip_with_json(self, tmp_path):
+        source = TaskManager(str(tmp_path / "tasks.json"))
+        task_id = source.add_task("Préparer l'été", None, Priority.URGENT)
+        task = source.get_task(task_id)
+        task.created_at = datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+        task.mark_completed()
+        source.add_task("Autre")
+        source.save_to_file()
+        snapshot = str(tmp_path / "tasks.snap")
+        assert json_to_snapshot(source.storage_file, snapshot) == 2
+        assert snapshot_to_json(snapshot, str(tmp_path / "copie.json")) == 2
+        with open(source.storage_file, encoding='utf-8') as f:
+            original = json.load(f)
+        with open(tmp_path / "copie.json", encoding='utf-8') as f:
+            assert json.load(f) == original
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "tasks.snap"
+        path.write_bytes(b"pas un instantane")
+        with pytest.raises(ValueError):
+            BinarySnapshotStorage(str(path))
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", [SqliteStorage, BinarySnapshotStorage])
+class TestLazyStorageFeatures:
+    """Fonctions à index annexe, servies par parcours du stockage paresseux"""
+    def make_manager(self, tmp_path, backend):
+        manager = TaskManager(storage=backend(str(tmp_path / "tasks.store")))
+        self.day = datetime(2025, 3, 4)
+        self.ids = [manager.add_task(title, description, priority) for title, description, priority in [
+            ("Préparer la démo", "salle et projecteur", Priority.LOW),
+            ("Corriger le bug", "", Priority.URGENT),
+            ("Préparer le budget", "", Priority.URGENT),
+        ]]
+        for hours, task_id in zip((30, 2, 1), self.ids):
+            manager.get_task(task_id).created_at = self.day + timedelta(hours=hours)
+        return manager
+
+    def test_time_ranges_and_daily_report(self, tmp_path, backend):
+        manager = self.make_manager(tmp_path, backend)
+        assert [t.id for t in manager.get_tasks_between('created_at', self.day, self.day + timedelta(days=1))] == \
+            [self.ids[2], self.ids[1]]
+        assert manager.get_tasks_between('completed_at') == []
+        report = ReportService().generate_daily_report(manager, self.day)
+        assert report['total_tasks'] == 2
+        assert report['tasks_by_priority']['URGENT'] == 2
+
+    def test_search(self, tmp_path, backend):
+        manager = self.make_manager(tmp_path, backend)
+        assert {t.id for t in manager.search("prepar")} == {self.ids[0], self.ids[2]}
+        assert [t.id for t in manager.search("prepar", priority=Priority.URGENT)] == [self.ids[2]]
+        manager.get_task(self.ids[1]).title = "Préparer le correctif"
+        assert len(manager.search("préparer")) == 3
+
+    def test_work_queue(self, tmp_path, backend):
+        manager = self.make_manager(tmp_path, backend)
+        assert manager.peek_next().id == self.ids[2]
+        assert manager.pop_next().id == self.ids[2]
+        assert manager.get_task(self.ids[2]).status == Status.IN_PROGRESS
+        assert [manager.pop_next().id for _ in range(2)] == [self.ids[1], self.ids[0]]
+        assert manager.pop_next() is None
+
+    def test_projects(self, tmp_path, backend):
+        manager = self.make_manager(tmp_path, backend)
+        manager.get_task(self.ids[0]).assign_to_project("p1")
+        manager.get_task(self.ids[0]).mark_completed()
+        assert "p1" in manager.projects
+        other = manager.projects.create("Autre")
+        manager.projects.reassign([self.ids[1], self.ids[2]], "p1")
+        assert manager.projects.count("p1") == 3
+        assert manager.projects.progress("p1")['completed_tasks'] == 1
+        assert manager.projects.delete("p1")
+        assert manager.get_task(self.ids[0]).project_id is None
+        assert [p.id for p in manager.projects] == [other.id]
+
+    def test_subscriptions_are_rejected(self, tmp_path, backend):
+        manager = self.make_manager(tmp_path, backend)
+        with pytest.raises(TypeError):
+            ReportService(manager)
+        with pytest.raises(TypeError):
+            manager.journal
+        with pytest.raises(TypeError):
+            manager.load_shards([])
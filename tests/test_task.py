@@ -1,6 +1,6 @@
 import pytest # type: ignore
 from datetime import datetime
-from src.task_manager.task import Task, Priority, Status
+from src.task_manager.task import Task, Priority, Status, to_epoch, from_epoch
 
 @pytest.mark.unit
 class TestTaskCreation:
@@ -80,6 +80,30 @@ class TestTaskSerialization:
         assert t2.project_id == self.task.project_id
         assert t2.completed_at == self.task.completed_at
 
+@pytest.mark.unit
+class TestTaskBulkDeserialization:
+    """Tests de Task.from_dicts"""
+    def test_from_dicts_matches_from_dict(self):
+        tasks = [Task("A", "d", Priority.HIGH), Task("B")]
+        tasks[1].assign_to_project("p1")
+        tasks[1].mark_completed()
+        records = [t.to_dict() for t in tasks]
+        assert [t.to_dict() for t in Task.from_dicts(records)] == records
+
+    def test_from_dicts_reports_invalid_record(self):
+        records = [Task("A").to_dict(), {"title": "", "priority": "LOW"}]
+        with pytest.raises(ValueError, match="enregistrement 1"):
+            Task.from_dicts(records)
+
+    def test_from_dicts_trusted_skips_validation(self):
+        tasks = Task.from_dicts([{"id": "x", "title": ""}], trusted=True)
+        assert tasks[0].id == "x"
+        assert tasks[0].status == Status.TODO
+
+    def test_from_dicts_unknown_priority_raises(self):
+        with pytest.raises(KeyError):
+            Task.from_dicts([{"title": "A", "priority": "CRITIQUE"}])
+
 @pytest.mark.unit
 class TestTaskEdgeCases:
     def test_to_dict_with_minimal_task(self):
@@ -100,6 +124,42 @@ class TestTaskEdgeCases:
         assert t.priority == Priority.MEDIUM
         assert t.status == Status.TODO
 
+@pytest.mark.unit
+class TestTaskCompactRepresentation:
+    """Tests de la représentation compacte (__slots__, ids, horodatages)"""
+    def test_task_has_no_instance_dict(self):
+        task = Task("Compacte")
+        assert not hasattr(task, '__dict__')
+        with pytest.raises(AttributeError):
+            task.inconnu = 1
+
+    @pytest.mark.parametrize("id_format, stored_type", [("int", int), ("bytes", bytes)])
+    def test_compact_id_roundtrip(self, monkeypatch, id_format, stored_type):
+        monkeypatch.setattr(Task, 'id_format', id_format)
+        task = Task("Id compact")
+        assert isinstance(task._id, stored_type)
+        assert isinstance(task.id, str)
+        assert Task.from_dict(task.to_dict()).id == task.id
+
+    def test_non_uuid_id_kept_as_string(self, monkeypatch):
+        monkeypatch.setattr(Task, 'id_format', 'int')
+        task = Task("Id libre")
+        task.id = "1"
+        assert task._id == "1"
+        assert task.id == "1"
+
+    def test_timestamps_stored_as_epoch_seconds(self):
+        task = Task("Horodatage")
+        task.mark_completed()
+        assert isinstance(task._created_at, float)
+        assert isinstance(task._completed_at, float)
+        assert task.to_dict()["completed_at"] == task.completed_at.isoformat()
+
+    def test_epoch_conversion_is_exact(self):
+        value = datetime(2025, 7, 11, 10, 49, 15, 522538)
+        assert from_epoch(to_epoch(value)) == value
+        assert to_epoch(None) is None
+
 @pytest.mark.integration
 def test_task_integration_flow():
     t = Task("Intégration", "desc", Priority.HIGH)